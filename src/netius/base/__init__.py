@@ -34,15 +34,20 @@ from . import config
 from . import conn
 from . import container
 from . import errors
+from . import idle
 from . import legacy
 from . import log
+from . import metrics
 from . import mixin
 from . import observer
 from . import poll
+from . import profiler
 from . import protocol
 from . import request
+from . import scheduler
 from . import server
 from . import service
+from . import splice
 from . import stream
 from . import tls
 from . import transport
@@ -124,7 +129,15 @@ from .config import (
     conf_ctx,
     conf_override,
 )
-from .conn import OPEN, CLOSED, PENDING, CHUNK_SIZE, Connection
+from .conn import (
+    OPEN,
+    CLOSED,
+    PENDING,
+    CHUNK_SIZE,
+    Connection,
+    FileRegion,
+    PendingBuffer,
+)
 from .container import Container, ContainerServer
 from .errors import (
     NetiusError,
@@ -132,6 +145,7 @@ from .errors import (
     StopError,
     PauseError,
     WakeupError,
+    ForkError,
     DataError,
     ParserError,
     GeneratorError,
@@ -139,6 +153,7 @@ from .errors import (
     NotImplemented,
     AssertionError,
 )
+from .idle import IdleBuckets
 from .log import (
     SILENT,
     TRACE,
@@ -150,13 +165,17 @@ from .log import (
     rotating_handler,
     smtp_handler,
 )
+from .metrics import SharedMetrics, Histogram
 from .mixin import ConnectionCompat
 from .observer import Observable
 from .poll import Poll, EpollPoll, KqueuePoll, PollPoll, SelectPoll
+from .profiler import SamplingProfiler
 from .protocol import Protocol, DatagramProtocol, StreamProtocol
 from .request import Request, Response
+from .scheduler import Scheduler, HeapScheduler, WheelScheduler
 from .server import Server, DatagramServer, StreamServer
 from .service import Service
+from .splice import Splice, SpliceChannel
 from .stream import Stream
 from .tls import (
     fingerprint,
@@ -166,4 +185,4 @@ from .tls import (
     dump_certificate,
 )
 from .transport import Transport, TransportDatagram, TransportStream, ServerTransport
-from .util import camel_to_underscore, verify
+from .util import camel_to_underscore, verify, callable_name
@@ -100,6 +100,9 @@ class Agent(observer.Observable):
     def ticks(self):
         pass
 
+    def get_poll_timeout(self, current=None):
+        return -1
+
     def on_start(self):
         pass
 
@@ -223,12 +223,15 @@ class Task(Future):
 
 class Handle(object):
 
-    def __init__(self, callable_t=None):
+    def __init__(self, callable_t=None, loop=None):
         self._callable_t = callable_t
+        self._loop = loop
 
     def cancel(self):
         if not self._callable_t:
             return
+        if hasattr(self._loop, "undelay"):
+            return self._loop.undelay(self._callable_t)
         options = self._callable_t[4]
         options[0] = False
 
@@ -861,11 +861,24 @@ class StreamClient(Client):
             if self._pending(connection):
                 return
 
+            # in case the connection is part of a zero-copy tunnel the data
+            # is moved by the kernel into the peer (no data is read here)
+            if connection.spliced:
+                connection.spliced.read(connection)
+                return
+
             # iterates continuously trying to read as much data as possible
             # when there's a failure to read more data it should raise an
-            # exception that should be handled properly
+            # exception that should be handled properly, note that in case
+            # the read into mode is enabled the data is received into the
+            # reusable buffer of the loop and provided as a memory view
+            view = self.get_read_view() if not connection.datagram else None
+            count, size = 0, 0
             while True:
-                data = connection.recv(CHUNK_SIZE)
+                if view:
+                    data = connection.recv_into(view)
+                else:
+                    data = connection.recv(CHUNK_SIZE)
                 if data:
                     self.on_data(connection, data)
                 else:
@@ -877,6 +890,14 @@ class StreamClient(Client):
                     break
                 if not connection.socket == _socket:
                     break
+
+                # updates the read budget counters and in case it has been
+                # exhausted yields the loop to the other connections, the
+                # socket is re-queued for the next iteration (if needed)
+                count, size = count + 1, size + len(data)
+                if self.is_read_exhausted(count, size):
+                    self.requeue_read(_socket, force=bool(connection.ssl))
+                    break
         except ssl.SSLError as error:
             error_v = error.args[0] if error.args else None
             error_m = (
@@ -42,12 +42,12 @@ __license__ = "Apache License, Version 2.0"
 import os
 import copy
 import json
-import heapq
 import signal
 import logging
 import hashlib
 import tempfile
 import traceback
+import collections
 
 import netius.pool
 import netius.adapters
@@ -55,12 +55,15 @@ import netius.adapters
 from . import log
 from . import util
 from . import compat
+from . import metrics
+from . import profiler
 from . import asynchronous
 
 from .. import middleware
 
 from .conn import *  # @UnusedWildImport pylint: disable=W0614
 from .poll import *  # @UnusedWildImport pylint: disable=W0614
+from .scheduler import *  # @UnusedWildImport pylint: disable=W0614
 from .service import *  # @UnusedWildImport pylint: disable=W0614
 from .asynchronous import *  # @UnusedWildImport pylint: disable=W0614
 
@@ -142,6 +145,12 @@ selected from the fastest to the slowest, in case no explicit
 poll method is defined for a base service they are selected
 based on this list testing them for acceptance first """
 
+SCHEDULER_ORDER = (HeapScheduler, WheelScheduler)
+""" The order from which the scheduler back-ends for the
+delayed calls are going to be selected, in case no explicit
+scheduler is defined the first one accepted is used, as the
+heap is the historical (and exact) back-end it comes first """
+
 SILENT_ERRORS = (
     errno.ECONNABORTED,
     errno.ECONNRESET,
@@ -301,6 +310,51 @@ KEEPALIVE_COUNT = 3
 """ The amount of times the "ping" packet is re-sent until the
 connection is considered to be offline and is dropped """
 
+READ_BUDGET = 1048576
+""" The maximum amount of bytes that are going to be read from a
+single connection for each readiness event, after which the connection
+yields the loop to the other connections (avoids starvation) """
+
+READ_ITERATIONS = 0
+""" The maximum number of read operations to be performed for a
+single connection on each readiness event, zero means that only
+the bytes based budget is going to be used for the limitation """
+
+RESPAWN_BACKOFF = 0.5
+""" The initial amount of time (in seconds) to wait before the
+respawning of a child process that has exited unexpectedly, this
+value is doubled for each consecutive failure of the same child """
+
+RESPAWN_BACKOFF_MAX = 30.0
+""" The maximum amount of time (in seconds) to wait before the
+respawning of a child process, a child that has been running for
+longer than this period has its backoff value reset """
+
+DRAIN_TIMEOUT = 30.0
+""" The maximum amount of time (in seconds) that a draining (retiring)
+child process waits for its connections to be closed before stopping,
+allows keep-alive connections to finish their pending requests """
+
+SUPERVISOR_READY = "supervisor:ready"
+""" The prefix of the command sent by a child process to the parent
+one through the pipe once its event loop is ready for operation """
+
+METRICS_INTERVAL = 1.0
+""" The amount of time (in seconds) in between the flushing of the
+local counters of a child process into its slot of the shared memory
+metrics region, also used as reference for the loop lag measurement """
+
+SLOW_CALLBACK = 0.1
+""" The amount of time (in seconds) above which the execution of
+a delayed callable is considered slow and a warning is logged, only
+used when the loop instrumentation is enabled """
+
+HISTOGRAMS = ("iteration", "delays", "poll", "handlers", "callback")
+""" The names of the histograms recorded by the loop instrumentation,
+the iteration (complete loop cycle), delays (ticks and delayed calls),
+poll (blocking wait), handlers (reads, writes and errors) and callback
+(execution of each delayed callable) """
+
 ALLOW_BLOCK = False
 """ The default value for the allow sub-blocking operation, it's
 set as not allowed because this is considered to be a dangerous
@@ -355,11 +409,22 @@ class AbstractBase(observer.Observable):
     should be used to provide compatibility with protocol and
     transports used by the new API """
 
+    _LOCAL = threading.local()
+    """ The thread local storage holding the loop (and its
+    compatibility version) that is considered the main one for
+    the thread, used by the (multiple) loop threads of a server,
+    taking precedence over the global main loop """
+
     _DIAG_INSTANCE = None
     """ Reference to the instance currently holding the diagnostics
     server for the process, ensures only one diag server binds per
     process even when multiple base instances coexist """
 
+    read_view_safe = False
+    """ If the data handlers of the current structure are able to
+    handle (short lived) memory views, only in that case the read into
+    mode is used for its reads, everyone else receives plain bytes """
+
     def __init__(self, name=None, handlers=None, *args, **kwargs):
         observer.Observable.__init__(self, *args, **kwargs)
         cls = self.__class__
@@ -376,25 +441,72 @@ class AbstractBase(observer.Observable):
         self.diag = kwargs.get("diag", False)
         self.middleware = kwargs.get("middleware", [])
         self.children = kwargs.get("children", 0)
+        self.affinity = kwargs.get("affinity", False)
+        self.respawn = kwargs.get("respawn", True)
+        self.drain_timeout = kwargs.get("drain_timeout", DRAIN_TIMEOUT)
+        self.metrics = kwargs.get("metrics", False)
+        self.metrics_interval = kwargs.get("metrics_interval", METRICS_INTERVAL)
+        self.instrument = kwargs.get("instrument", False)
+        self.slow_callback = kwargs.get("slow_callback", SLOW_CALLBACK)
+        self.profile_interval = kwargs.get("profile_interval", profiler.INTERVAL)
+        self.profile_path = kwargs.get("profile_path", None)
+        self.profile_signal = kwargs.get("profile_signal", None)
         self.logger_flush_t = kwargs.get("logger_flush_t", 60.0)
-        self.tid = None
-        self.tname = None
         self.logger = None
         self.logging = None
-        self.npool = None
-        self.tpool = None
-        self.fpool = None
         self.poll_c = kwargs.get("poll", poll)
-        self.poll = self.poll_c()
-        self.poll_name = self.poll.name()
+        self.poll_name = self.poll_c.name()
         self.poll_timeout = kwargs.get("poll_timeout", POLL_TIMEOUT)
+        self.exclusive = kwargs.get("exclusive", False)
+        self.read_into = kwargs.get("read_into", False)
+        self.read_budget = kwargs.get("read_budget", READ_BUDGET)
+        self.read_iterations = kwargs.get("read_iterations", READ_ITERATIONS)
+        self.scheduler_c = cls.test_scheduler(preferred=kwargs.get("scheduler", None))
+        self.scheduler_name = self.scheduler_c.name()
         self.keepalive_timeout = kwargs.get("keepalive_timeout", KEEPALIVE_TIMEOUT)
         self.keepalive_interval = kwargs.get("keepalive_interval", KEEPALIVE_INTERVAL)
         self.keepalive_count = kwargs.get("keepalive_count", KEEPALIVE_COUNT)
         self.allow_block = kwargs.get("allow_block", ALLOW_BLOCK)
+        self.middleware_l = []
+        self._main = kwargs.get("_main", False)
+        self._slave = kwargs.get("_slave", False)
+        self._concrete = False
+        self._logging = False
+        self._child_index = None
+        self._generation = 0
+        self._pipe_send = None
+        self._metrics_base = (0, 0, 0)
+        self._metrics_target = None
+        self.init_state()
+        self._ssl_init()
+        self.set_state(STATE_STOP)
+
+    def init_state(self):
+        """
+        Initializes the runtime state that is specific to the event loop
+        running the current structure (poll, scheduler, connections,
+        counters, etc.), as opposed to its configuration.
+
+        Called on construction and for each of the loops built from the
+        structure (loop threads mode), so that no runtime state is ever
+        shared among loops, sub classes with their own runtime state
+        should extend this method.
+        """
+
+        self.tid = None
+        self.tname = None
+        self.npool = None
+        self.tpool = None
+        self.fpool = None
+        self.poll = self.poll_c()
         self.poll_owner = True
         self.diag_app = None
-        self.middleware_l = []
+        self.budget_c = 0
+        self.requeues_c = 0
+        self.requests_c = 0
+        self.bytes_in_c = 0
+        self.bytes_out_c = 0
+        self.slow_c = 0
         self.connections = []
         self.connections_m = {}
         self.callbacks_m = {}
@@ -402,27 +514,29 @@ class AbstractBase(observer.Observable):
         self._compat = compat.CompatLoop(self)
         self._lid = 0
         self._did = 0
-        self._main = kwargs.get("_main", False)
-        self._slave = kwargs.get("_slave", False)
         self._running = False
         self._pausing = False
+        self._draining = False
         self._loaded = False
         self._forked = False
         self._child = False
-        self._concrete = False
-        self._logging = False
         self._services = {}
         self._childs = []
+        self._child_m = {}
+        self._backoff_m = {}
+        self._metrics = None
+        self._metrics_slot = None
+        self._histograms = dict((name, metrics.Histogram()) for name in HISTOGRAMS)
+        self._profiler = None
+        self._profile_handlers = dict()
         self._events = {}
         self._notified = []
-        self._delayed = []
-        self._delayed_o = []
-        self._delayed_n = []
-        self._delayed_l = threading.RLock()
+        self._delayed = self.scheduler_c()
+        self._delayed_n = collections.deque()
+        self._delayed_w = False
+        self._read_v = None
         self._extra_handlers = []
         self._expanded = []
-        self._ssl_init()
-        self.set_state(STATE_STOP)
 
     @classmethod
     def test_poll(cls, preferred=None):
@@ -457,6 +571,38 @@ class AbstractBase(observer.Observable):
         # as expected by the current method
         return selected
 
+    @classmethod
+    def test_scheduler(cls, preferred=None):
+        # sets the initial selected variable with the unselected
+        # (invalid) value so that at lease one selection must be
+        # done in order for this method to succeed
+        selected = None
+
+        # iterates over all the scheduler classes ordered by preference
+        # and tries to find the one that matches the preferred name, falling
+        # back to the first valid one in case there's no such match
+        for scheduler in SCHEDULER_ORDER:
+            if not scheduler.test():
+                continue
+            if not selected:
+                selected = scheduler
+            if not preferred:
+                break
+            name = scheduler.name()
+            if not name == preferred:
+                continue
+            selected = scheduler
+            break
+
+        # in case no scheduler was selected must raise an exception
+        # indicating that no valid scheduler is available
+        if not selected:
+            raise errors.NetiusError("No valid scheduler available")
+
+        # returns the selected scheduler class to the caller method
+        # as expected by the current method
+        return selected
+
     @classmethod
     def get_loop(cls, compat=False, asyncio=False):
         loop = cls.get_asyncio() if asyncio else None
@@ -465,6 +611,9 @@ class AbstractBase(observer.Observable):
 
     @classmethod
     def get_main(cls, compat=False):
+        local = getattr(cls._LOCAL, "main", None)
+        if local:
+            return local[1] if compat else local[0]
         return cls._MAIN_C if compat else cls._MAIN
 
     @classmethod
@@ -522,6 +671,25 @@ class AbstractBase(observer.Observable):
     def unset_main(cls, set_compat=True):
         cls.set_main(None, set_compat=set_compat)
 
+    @classmethod
+    def set_local(cls, instance):
+        """
+        Sets the provided instance as the main loop for the current
+        thread only, so that the operations that retrieve the main
+        loop (eg: `get_loop()`) from the thread get it instead of the
+        global one, required when running multiple loops per process.
+
+        :type instance: Base
+        :param instance: The loop instance to be set as the main one
+        for the current thread, or an invalid value to unset it.
+        """
+
+        cls._LOCAL.main = (instance, compat_loop(instance)) if instance else None
+
+    @classmethod
+    def unset_local(cls):
+        cls.set_local(None)
+
     @classmethod
     def patch_asyncio(cls):
         asyncio = asynchronous.get_asyncio()
@@ -635,10 +803,11 @@ class AbstractBase(observer.Observable):
         on the next tick or after an optional timeout period.
 
         This is the primary mechanism to insert deferred operations into the
-        event loop. The callable is pushed into a heap-based priority queue
-        ordered by target execution time. When the safe flag is set and the
-        current thread is not the main one, the operation is delegated to
-        the thread-safe version (`delay_s()`) instead.
+        event loop. The callable is pushed into the scheduler (by default a
+        heap-based priority queue) ordered by target execution time. When
+        the safe flag is set and the current thread is not the main one,
+        the operation is delegated to the thread-safe version (`delay_s()`)
+        instead.
 
         :type callable: Function
         :param callable: The callable to be inserted into the delayed
@@ -681,18 +850,15 @@ class AbstractBase(observer.Observable):
 
         # creates the original target value with a zero value (forced
         # execution in next tick) in case the timeout value is set the
-        # value is incremented to the current time, then created the
-        # callable original tuple with the target (time) and the callable
+        # value is incremented to the current time
         target = -1 if immediately else 0
         if timeout:
             target = time.time() + timeout
-        callable_o = (target, callable)
-        callable_o = legacy.orderable(callable_o)
 
         # in case the verify flag is set, must verify if the callable
         # is already inserted in the list of delayed operations in
         # case it does returns immediately to avoid duplicated values
-        is_duplicate = verify and callable_o in self._delayed_o
+        is_duplicate = verify and self._delayed.contains(target, callable)
         if is_duplicate:
             return
 
@@ -701,12 +867,11 @@ class AbstractBase(observer.Observable):
         options = [True]
 
         # creates the "final" callable tuple with the target time, the
-        # callable and the loop id (lid) then inserts both the delayed
-        # (original) callable tuple and the callable tuple in the lists
+        # callable and the loop id (lid) then pushes it into the scheduler
+        # that is responsible for the ordering of the delayed operations
         callable_t = (target, self._did, callable, self._lid, options)
         callable_t = legacy.orderable(callable_t)
-        heapq.heappush(self._delayed, callable_t)
-        heapq.heappush(self._delayed_o, callable_o)
+        self._delayed.push(callable_t)
 
         # increments the "delay" identifier by one, this identifier is
         # used to correctly identify a delayed object so that for the
@@ -722,11 +887,16 @@ class AbstractBase(observer.Observable):
     ):
         """
         Safe version of the delay operation to be used to insert a callable
-        from a different thread (implies lock mechanisms).
+        from a different thread (multiple producers are allowed).
 
-        This method should only be used from different threads as there's
-        a huge performance impact created from using this method instead of
-        the local event loop one (`delay()`).
+        The callable is appended to a queue (atomic operation) that is
+        drained in bulk by the event loop on its next tick, and the event
+        loop is only awaken when the queue goes from empty to non empty,
+        so that a burst of submissions results in a single notification.
+
+        This method should only be used from different threads (or from
+        signal handlers) as there's a performance impact created from using
+        this method instead of the local event loop one (`delay()`).
 
         :type callable: Function
         :param callable: The callable that should be called on the next tick
@@ -750,21 +920,23 @@ class AbstractBase(observer.Observable):
         # to the definition provided to the method
         next = (callable, timeout, immediately, verify)
 
-        # acquires the lock that controls the access to the delayed for next
-        # tick list and then adds the callable to such list, please note that
-        # the delayed (next) list is only going to be joined/merged with delay
+        # adds the callable to the delayed for next tick queue, the append
+        # operation is atomic so no lock is required, please note that the
+        # delayed (next) queue is only going to be joined/merged with delay
         # operations and list on the next tick (through the merge operation)
-        self._delayed_l.acquire()
-        try:
-            self._delayed_n.append(next)
-        finally:
-            self._delayed_l.release()
-
-        # in case the wakeup flag is set this delay operation should have
-        # been called from a different thread and the event loop should
-        # awaken as soon as possible to handle the event
-        if wakeup:
-            self.wakeup()
+        self._delayed_n.append(next)
+
+        # in case the wakeup flag is set the event loop should awaken as soon
+        # as possible to handle the event, note that the notification is
+        # coalesced, meaning that only the first submission after the queue
+        # has been drained triggers it (the flag is unset by the merge operation
+        # before draining the queue), the notify pool is used directly (even
+        # from the main thread) as a submission from a signal handler is done
+        # while the loop may be blocked in the poll operation, and the flag is
+        # only set when the notification has effectively been sent
+        if wakeup and not self._delayed_w and self.npool:
+            self._delayed_w = True
+            self.npool.notify()
 
     def interval_s(
         self, callable, timeout=None, immediately=True, verify=False, wakeup=True
@@ -789,27 +961,51 @@ class AbstractBase(observer.Observable):
 
     def delay_m(self):
         """
-        Runs the merge operation so that the delay next list (used by the delay
+        Runs the merge operation so that the delay next queue (used by the delay
         safe operation) is merged with the delayed and the delayed ordered
         structures, making the events (effectively) ready to be executed by delays.
+
+        Only the elements present at the start of the merge are drained, the
+        ones added meanwhile (by other threads) are left for the next tick.
         """
 
-        # verifies if the delay next list is not valid or empty and if that's
-        # the case returns immediately as there's nothing to be merged
+        # verifies if the delay next queue is empty and if that's the case
+        # returns immediately as there's nothing to be merged
         if not self._delayed_n:
             return
 
-        # iterates over the complete set of next elements in the delay next list
-        # and schedules them as delay for the next tick execution
-        for next in self._delayed_n:
-            callable, timeout, immediately, verify = next
+        # unsets the wakeup pending flag before draining the queue so that
+        # any submission from this point on notifies the event loop again
+        # (no submission is left behind without a wakeup)
+        self._delayed_w = False
+
+        # pops the complete set of next elements currently in the delay next
+        # queue (in bulk) and schedules them as delay for the next tick
+        # execution, the pop operation is atomic and safe against producers
+        pop = self._delayed_n.popleft
+        for _index in range(len(self._delayed_n)):
+            callable, timeout, immediately, verify = pop()
             self.delay(
                 callable, timeout=timeout, immediately=immediately, verify=verify
             )
 
-        # deletes the complete set of elements present in the delay next list, this
-        # is considered to be equivalent to the empty operation
-        del self._delayed_n[:]
+    def undelay(self, callable_t):
+        """
+        Cancels a previously delayed operation, identified by the callable
+        tuple returned by the `delay()` method, so that it's no longer run.
+
+        Depending on the scheduler in use the callable tuple is either
+        removed immediately (eg: timing wheel) or just marked as not meant
+        to be run and discarded once it's reached (eg: heap).
+
+        :type callable_t: Tuple
+        :param callable_t: The callable tuple (as returned by `delay()`)
+        that identifies the delayed operation to be canceled.
+        """
+
+        if not callable_t:
+            return
+        self._delayed.cancel(callable_t)
 
     def ensure(
         self, coroutine, args=[], kwargs={}, thread=None, future=None, immediately=True
@@ -1278,6 +1474,12 @@ class AbstractBase(observer.Observable):
         # event is triggered allowing reload of the configuration
         self.bind_config()
 
+        # in case a profile signal has been configured binds it so that
+        # the sampling profiler may be toggled from outside of the process,
+        # this is an opt-in as the signal may be used by other profilers
+        if self.profile_signal:
+            self.bind_profile()
+
         # sets the private loading flag ensuring that no extra load operations
         # will be done after this first call to the loading (no duplicates)
         self._loaded = True
@@ -1312,6 +1514,10 @@ class AbstractBase(observer.Observable):
         # the configuration event from producing any more actions
         self.unbind_config()
 
+        # unbinds the profile signal (restoring the original handler) so
+        # that the profiler is no longer able to be toggled from outside
+        self.unbind_profile()
+
         # runs the unbind operation for the signals so that no side effects
         # occur while the unloading is going to take place
         self.unbind_signals()
@@ -1703,8 +1909,12 @@ class AbstractBase(observer.Observable):
             ),  # @UndefinedVariable pylint: disable=E1101
         ),
     ):
+        # the poll operation is resumed after the signal handler (it may
+        # block indefinitely) so the notify pool is used to awake it
         def base_handler(signum=None, frame=None):
             self.delay(lambda: self.on_config(), immediately=True)
+            if self.npool:
+                self.npool.notify()
 
         for signum in signals:
             if signum == None:
@@ -1724,6 +1934,66 @@ class AbstractBase(observer.Observable):
     ):
         self.bind_signals(signals=signals, handler=signal.SIG_IGN)
 
+    def bind_drain(
+        self,
+        signals=(
+            (
+                signal.SIGUSR2 if hasattr(signal, "SIGUSR2") else None
+            ),  # @UndefinedVariable pylint: disable=E1101
+        ),
+    ):
+        # the poll operation is resumed after the signal handler (it may
+        # block indefinitely) so the notify pool is used to awake it
+        def base_handler(signum=None, frame=None):
+            self.delay_s(self.drain, immediately=True, wakeup=False)
+            if self.npool:
+                self.npool.notify()
+
+        for signum in signals:
+            if signum == None:
+                continue
+            try:
+                signal.signal(signum, base_handler)
+            except Exception:
+                self.debug("Failed to register %d handler", signum)
+
+    def bind_profile(self, signals=None):
+        # in case no signals are provided the configured profile signal
+        # is used, this may be either a signal name or number
+        if signals == None:
+            signals = (self._profile_signum(),)
+
+        # the profiler is toggled directly from the signal handler (not
+        # delayed) so that a stalled event loop may still be profiled, the
+        # poll operation is resumed after the handler so the notify pool
+        # is used to awake it for the (delayed) dump of the stacks
+        def base_handler(signum=None, frame=None):
+            self.toggle_profile()
+            if self.npool:
+                self.npool.notify()
+
+        # registers the handler for each of the signals saving the previous
+        # handler so that it's restored when the profile is unbound
+        for signum in signals:
+            if signum == None:
+                continue
+            try:
+                previous = signal.signal(signum, base_handler)
+            except Exception:
+                self.debug("Failed to register %d handler", signum)
+                continue
+            self._profile_handlers.setdefault(signum, previous)
+
+    def unbind_profile(self):
+        for signum, previous in legacy.items(self._profile_handlers):
+            if previous == None:
+                previous = signal.SIG_DFL
+            try:
+                signal.signal(signum, previous)
+            except Exception:
+                self.debug("Failed to restore %d handler", signum)
+        self._profile_handlers.clear()
+
     def bind_env(self):
         """
         Binds the current environment values to the current instance.
@@ -1735,6 +2005,24 @@ class AbstractBase(observer.Observable):
         self.middleware = self.get_env("MIDDLEWARE", self.middleware, cast=list)
         self.children = self.get_env("CHILD", self.children, cast=int)
         self.children = self.get_env("CHILDREN", self.children, cast=int)
+        self.affinity = self.get_env("AFFINITY", self.affinity, cast=bool)
+        self.respawn = self.get_env("RESPAWN", self.respawn, cast=bool)
+        self.drain_timeout = self.get_env(
+            "DRAIN_TIMEOUT", self.drain_timeout, cast=float
+        )
+        self.metrics = self.get_env("METRICS", self.metrics, cast=bool)
+        self.metrics_interval = self.get_env(
+            "METRICS_INTERVAL", self.metrics_interval, cast=float
+        )
+        self.instrument = self.get_env("INSTRUMENT", self.instrument, cast=bool)
+        self.slow_callback = self.get_env(
+            "SLOW_CALLBACK", self.slow_callback, cast=float
+        )
+        self.profile_interval = self.get_env(
+            "PROFILE_INTERVAL", self.profile_interval, cast=float
+        )
+        self.profile_path = self.get_env("PROFILE_PATH", self.profile_path)
+        self.profile_signal = self.get_env("PROFILE_SIGNAL", self.profile_signal)
         self.logger_flush_t = self.get_env(
             "LOGGER_FLUSH_T", self.logger_flush_t, cast=float
         )
@@ -1743,6 +2031,13 @@ class AbstractBase(observer.Observable):
         )
         self.logging = self.get_env("LOGGING", self.logging)
         self.poll_name = self.get_env("POLL", self.poll_name)
+        self.exclusive = self.get_env("EXCLUSIVE", self.exclusive, cast=bool)
+        self.scheduler_name = self.get_env("SCHEDULER", self.scheduler_name)
+        self.read_into = self.get_env("READ_INTO", self.read_into, cast=bool)
+        self.read_budget = self.get_env("READ_BUDGET", self.read_budget, cast=int)
+        self.read_iterations = self.get_env(
+            "READ_ITERATIONS", self.read_iterations, cast=int
+        )
 
     def forever(self, env=True):
         if env:
@@ -1774,6 +2069,11 @@ class AbstractBase(observer.Observable):
         # mechanism in the middle of the loading process
         self.poll = self.build_poll()
 
+        # re-builds the scheduler of the delayed calls in case its name
+        # has changed meanwhile (eg: environment), moving any pending
+        # delayed call into the newly created scheduler
+        self._delayed = self.build_scheduler()
+
         # retrieves the name of the polling mechanism that is
         # going to be used in the main loop of the current
         # base service, this is going to be used for diagnostics
@@ -1810,6 +2110,7 @@ class AbstractBase(observer.Observable):
         )
         self.debug("Using thread '%s' with TID '%d'", self.tname, self.tid)
         self.debug("Using '%s' as polling mechanism", poll_name)
+        self.debug("Using '%s' as scheduler", self.get_scheduler_name())
 
         # calls the main method to be able to start the main event
         # loop properly as defined by specification
@@ -1830,6 +2131,11 @@ class AbstractBase(observer.Observable):
         else:
             self._running = False
 
+        # wakes up the event loop (in case this is called from a different
+        # thread) so that a possible blocking poll operation returns and the
+        # running flag is verified as soon as possible
+        self.wakeup()
+
         # in case the current process is the parent in a pre-fork
         # environment raises the stop error to wakeup the process
         # from its current infinite loop for stop handling
@@ -1910,6 +2216,9 @@ class AbstractBase(observer.Observable):
     def is_running(self):
         return self._running
 
+    def is_draining(self):
+        return self._draining
+
     def is_started(self):
         return self.get_state() == STATE_START
 
@@ -1940,6 +2249,9 @@ class AbstractBase(observer.Observable):
     def unsub_all(self, socket):
         return self.poll.unsub_all(socket)
 
+    def sub_service(self, socket):
+        return self.poll.sub_service(socket, owner=self, exclusive=self.exclusive)
+
     def sub_read(self, socket):
         return self.poll.sub_read(socket, owner=self)
 
@@ -1976,9 +2288,9 @@ class AbstractBase(observer.Observable):
         # destroys the current information on the delays that are is longer
         # going to be executed as the poll/system is closing, this is required
         # in order to avoid any possible memory leak with clojures/cycles
-        del self._delayed[:]
-        del self._delayed_o[:]
-        del self._delayed_n[:]
+        self._delayed.clear()
+        self._delayed_n.clear()
+        self._delayed_w = False
 
         # runs the expand destroy operation so that the complete set of expanded
         # values get their (temporary) files removed (garbage collection)
@@ -2050,10 +2362,18 @@ class AbstractBase(observer.Observable):
         # iterates continuously while the running flag is set, once
         # it becomes unset the loop breaks at the next execution cycle
         while True:
+            # determines if the instrumentation of the loop is enabled, the
+            # value is cached locally so that when disabled the only cost is
+            # a (local) boolean verification in each of the stages, note
+            # that it's read on each iteration so it may be toggled at runtime
+            instrument = self.instrument
+
             # calls the base tick int handler indicating that a new
             # tick loop iteration is going to be started, all the
             # "in between loop" operation should be performed in this
             # callback as this is the "space" they have for execution
+            if instrument:
+                start = time.time()
             self.ticks()
 
             # in case running flag is disabled it's time to break the
@@ -2068,8 +2388,14 @@ class AbstractBase(observer.Observable):
 
             # runs the main selection operation on the current set
             # of connection for each of the three operations returning
-            # the resulting active sets for the callbacks
-            reads, writes, errors = self.poll.poll()
+            # the resulting active sets for the callbacks, the operation
+            # blocks up until the deadline of the next delayed execution
+            timeout = self.get_poll_timeout()
+            if instrument:
+                poll_start = time.time()
+            reads, writes, errors = self.poll.poll(timeout=timeout)
+            if instrument:
+                poll_end = time.time()
 
             # calls the various callbacks with the selections lists,
             # these are the main entry points for the logic to be executed
@@ -2080,6 +2406,11 @@ class AbstractBase(observer.Observable):
             self.writes(writes)
             self.errors(errors)
 
+            # records the durations of the multiple stages of the current
+            # iteration in the histograms (instrumentation only)
+            if instrument:
+                self._instrument_loop(start, poll_start, poll_end)
+
     def block(self):
         """
         Runs the sub-blocking operation, by "forking" the current loop
@@ -2159,33 +2490,33 @@ class AbstractBase(observer.Observable):
         # operation is soon going to be performed
         self.on_fork()
 
+        # stores the pipe based send function so that it may be used
+        # for the (re-)spawning of children after the initial fork
+        self._pipe_send = pipe_send
+
+        # creates the shared memory metrics region (if enabled) before
+        # the forking so that the anonymous mapping is shared by all the
+        # processes, two slots per child allow a rolling reload (where
+        # both generations are running at the same time)
+        if self.metrics and not self._metrics:
+            self._metrics = metrics.SharedMetrics(self.children * 2)
+
         # iterates of the requested (number of children) to run
-        # the concrete fork operation and fork the logic
-        for _index in range(self.children):
-            pid = os.fork()  # @UndefinedVariable pylint: disable=E1101
-            self._child = pid == 0
-            if self._child:
-                self.on_child(pipe=pipe_send)
-            if self._child:
-                break
-            self._childs.append(pid)
+        # the concrete fork operation and fork the logic, notice that
+        # the child process leaves the loop through the fork error
+        try:
+            for index in range(self.children):
+                self._spawn(index)
+        except errors.ForkError:
+            return True
 
         # sets the forked flag, meaning that the current process
         # has been already forked (avoid duplicated operations)
         self._forked = True
 
-        # in case the current process is a child one an immediate
-        # valid value should be returned (force logic continuation)
-        if self._child:
-            return True
-
         # prints a debug operation the finished forking operation
         self.debug("Finished forking children")
 
-        # opens a file object for the input pipe so that it's easier
-        # to read it as a stream (read a complete line)
-        pipein_fd = os.fdopen(pipein)
-
         # registers for some of the common signals to be able to start
         # the process of stopping and joining with the child processes
         # in case there's a request to do so
@@ -2194,11 +2525,30 @@ class AbstractBase(observer.Observable):
 
         self.bind_signals(handler=handler)
 
+        # creates the buffer that is going to hold the partial (not yet
+        # complete) command line received from the child processes
+        buffer = []
+
         def callback():
-            # reads a line from the input pipe considering it to be a
-            # command and then calls the callbacks for command
-            command = pipein_fd.readline()[:-1]
-            self.on_command(command)
+            # reads the complete set of data currently available in the
+            # input pipe (multiple signals may be coalesced into one) and
+            # then splits it into lines considering each one a command
+            while select.select([pipein], [], [], 0)[0]:
+                data = os.read(pipein, 4096)
+                if not data:
+                    break
+                buffer.append(data)
+            data = b"".join(buffer)
+            del buffer[:]
+            lines = data.split(b"\n")
+            if lines[-1]:
+                buffer.append(lines[-1])
+            for line in lines[:-1]:
+                command = legacy.str(line)
+                if command.startswith(SUPERVISOR_READY + ":"):
+                    self._ready(int(command.rsplit(":", 1)[1]))
+                else:
+                    self.on_command(command)
 
         # creates the pipe signal handler that is responsible for the
         # reading of the pipe information from the child process to
@@ -2219,29 +2569,68 @@ class AbstractBase(observer.Observable):
                 self._awaken = True
                 raise errors.WakeupError()
 
+        # creates the supervision signal handler that schedules the
+        # provided method for execution (as soon as possible) waking
+        # up the parent loop from its (possibly) blocking statement
+        def supervise_handler(method):
+            def _handler(signum=None, frame=None):
+                if not self._running:
+                    return
+                self.delay_s(method, immediately=True)
+                if hasattr(self, "_awaken") and not self._awaken:
+                    self._awaken = True
+                    raise errors.WakeupError()
+
+            return _handler
+
         # in case the user signal is defined registers for it so that it's
         # possible to establish a communication between child and parent
         if hasattr(signal, "SIGUSR1"):
             signal.signal(signal.SIGUSR1, pipe_handler)  # @UndefinedVariable
 
+        # registers the supervision handlers, the child one is going to reap
+        # the exited children (respawning them if required) and the hang up
+        # one is going to trigger the rolling reload of the children
+        if hasattr(signal, "SIGCHLD"):
+            signal.signal(
+                signal.SIGCHLD, supervise_handler(self._reap)
+            )  # @UndefinedVariable
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(
+                signal.SIGHUP, supervise_handler(self.reload)
+            )  # @UndefinedVariable
+
+        # schedules an initial reaping operation so that children that
+        # exited before the registration of the handler are handled
+        self.delay(self._reap, immediately=True)
+
         # prints a debug operation the finished forking operation
         self.debug("Entering wait forever loop")
 
         # sleeps forever, waiting for an interruption of the current
         # process that triggers the children to quit, so that it's
-        # able to "join" all of them into the current process
+        # able to "join" all of them into the current process, note
+        # that a child (re-)spawned under this loop leaves it through
+        # the fork error and continues as a regular child process
         try:
             self._wait_forever()
+        except errors.ForkError:
+            return True
         except (KeyboardInterrupt, SystemExit, errors.StopError):
             pass
 
         # register for the unbind of the signals, so that no more signals
-        # are handled while this operation is performed
+        # are handled while this operation is performed, the supervision
+        # ones are restored to the default behaviour (no more respawns)
         self.unbind_signals()
+        if hasattr(signal, "SIGCHLD"):
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)  # @UndefinedVariable
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)  # @UndefinedVariable
 
-        # closes both the file based pipe for input and the pipe used
+        # closes both the pipe used for the input and the pipe used
         # for the output of information (as expected)
-        pipein_fd.close()
+        os.close(pipein)
         os.close(pipeout)
 
         # prints a debug information about the sending of the term
@@ -2312,6 +2701,63 @@ class AbstractBase(observer.Observable):
         # continue, as this is the master process (coordinator)
         return False
 
+    def reload(self):
+        """
+        Runs the rolling reload of the child processes, starting a new
+        generation of children and retiring (draining) the previous one
+        once the new children are ready, avoiding any downtime.
+
+        The configuration event is triggered (in the parent process)
+        before the new generation is forked so that any configuration
+        reloaded in it is inherited by the new children.
+
+        This method should only be called in the parent process, it's
+        triggered by the hang up signal (SIGHUP) by default.
+        """
+
+        # in case the current process is not the parent one there's
+        # nothing to be done as only the parent controls the children
+        if not self.is_parent:
+            return
+
+        # increments the generation counter and triggers both the config
+        # and reload events so that the new generation inherits them
+        self._generation += 1
+        self.info("Reloading children into generation '%d' ...", self._generation)
+        self.on_config()
+        self.on_reload()
+
+        # forks the new generation of child processes, the previous one
+        # is only retired once the new children notify their readiness
+        for index in range(self.children):
+            self._spawn(index)
+
+    def drain(self, timeout=None):
+        """
+        Gracefully stops the current event loop, closing the service
+        sockets (no more connections accepted) and then waiting for the
+        existing connections to be closed (up to the provided timeout).
+
+        :type timeout: float
+        :param timeout: The maximum amount of time (in seconds) to wait
+        for the connections to be closed, defaults to the drain timeout.
+        """
+
+        timeout = self.drain_timeout if timeout == None else timeout
+        target = time.time() + timeout
+
+        self.info("Draining '%d' connections ...", len(self.connections))
+        self._draining = True
+        self.on_drain()
+
+        def check():
+            if self.connections and time.time() < target:
+                self.delay(check, timeout=0.5)
+                return
+            self.stop()
+
+        check()
+
     def finalize(self):
         # verifies a series of conditions and raises a proper error in case
         # any of them is verified under the current state
@@ -2504,8 +2950,12 @@ class AbstractBase(observer.Observable):
 
             # adds the socket to all of the pool lists so that it's ready to read
             # write and handle error, this is the expected behavior of a service
-            # socket so that it can handle all of the expected operations
-            self.sub_all(_socket)
+            # socket so that it can handle all of the expected operations, note
+            # that listening sockets may use the exclusive (wakeup) mode
+            if type == TCP_TYPE:
+                self.sub_service(_socket)
+            else:
+                self.sub_all(_socket)
 
             # calls the on serve callback handler so that underlying services may be
             # able to respond to the fact that the service is starting and some of
@@ -2973,6 +3423,10 @@ class AbstractBase(observer.Observable):
         self.fensure()
         return self.fpool.read(*args, **kwargs)
 
+    def fpread(self, *args, **kwargs):
+        self.fensure()
+        return self.fpool.pread(*args, **kwargs)
+
     def fwrite(self, *args, **kwargs):
         self.fensure()
         return self.fpool.write(*args, **kwargs)
@@ -3095,9 +3549,49 @@ class AbstractBase(observer.Observable):
         self.bind_signals(handler=signal.SIG_IGN)
         self.bind_signals(signals=(signal.SIGTERM,))
 
+        # stores the pipe send function (for later usage) and schedules
+        # the notification of the parent process about the readiness of
+        # the current child, sent once its event loop starts ticking
+        self._pipe_send = pipe
+        if pipe:
+            self.delay(
+                lambda: pipe("%s:%d" % (SUPERVISOR_READY, os.getpid())),
+                immediately=True,
+            )
+
+        # registers the drain signal handler that gracefully stops the
+        # current child, used by the parent on the rolling reload
+        self.bind_drain()
+
+        # in case the affinity mode is enabled pins the current child
+        # process to a single CPU (selected from its index) so that
+        # each of the children keeps its caches warm (no migration)
+        if self.affinity:
+            self.set_affinity(self._child_index or 0)
+
+        # in case the shared memory metrics region is available binds
+        # the current child to its slot, starting the periodic flush
+        if self._metrics:
+            self.bind_metrics()
+
     def on_command(self, command):
         self.trigger("command", self, command)
 
+    def on_reload(self):
+        self.trigger("reload", self)
+
+    def on_drain(self):
+        # triggers the drain event notifying any listener that the
+        # current event loop is no longer accepting new connections
+        self.trigger("drain", self)
+
+        # closes the complete set of service (listening) sockets so
+        # that no more connections are accepted by the current process
+        for _socket in list(self._services.keys()):
+            self.unsub_all(_socket)
+            _socket.close()
+            del self._services[_socket]
+
     def on_diag(self):
         self.trigger("diag", self)
 
@@ -3152,11 +3646,24 @@ class AbstractBase(observer.Observable):
             if self._pending(connection):
                 return
 
+            # in case the connection is part of a zero-copy tunnel the data
+            # is moved by the kernel into the peer (no data is read here)
+            if connection.spliced:
+                connection.spliced.read(connection)
+                return
+
             # iterates continuously trying to read as much data as possible
             # when there's a failure to read more data it should raise an
-            # exception that should be handled properly
+            # exception that should be handled properly, note that in case
+            # the read into mode is enabled the data is received into the
+            # reusable buffer of the loop and provided as a memory view
+            view = self.get_read_view() if not connection.datagram else None
+            count, size = 0, 0
             while True:
-                data = connection.recv(CHUNK_SIZE)
+                if view:
+                    data = connection.recv_into(view)
+                else:
+                    data = connection.recv(CHUNK_SIZE)
                 if data:
                     self.on_data_base(connection, data)
                 else:
@@ -3168,6 +3675,14 @@ class AbstractBase(observer.Observable):
                     break
                 if not connection.socket == _socket:
                     break
+
+                # updates the read budget counters and in case it has been
+                # exhausted yields the loop to the other connections, the
+                # socket is re-queued for the next iteration (if needed)
+                count, size = count + 1, size + len(data)
+                if self.is_read_exhausted(count, size):
+                    self.requeue_read(_socket, force=bool(connection.ssl))
+                    break
         except ssl.SSLError as error:
             error_v = error.args[0] if error.args else None
             error_m = (
@@ -3368,7 +3883,17 @@ class AbstractBase(observer.Observable):
             connections=len(self.connections),
             state=self.get_state_s(),
             poll=self.get_poll_name(),
+            scheduler=self.get_scheduler_name(),
+            budget_c=self.budget_c,
+            requeues_c=self.requeues_c,
+            requests_c=self.requests_c,
+            bytes_in_c=self.bytes_in_c,
+            bytes_out_c=self.bytes_out_c,
         )
+        if self._metrics:
+            info.update(cluster=self.cluster_dict())
+        if self.instrument:
+            info.update(instrument=self.instrument_dict())
         if full:
             info.update(name=self.name, _lid=self._lid)
         return info
@@ -3387,6 +3912,42 @@ class AbstractBase(observer.Observable):
         )
         return info_s
 
+    def cluster_dict(self):
+        # in case there's no shared metrics region (no children) the
+        # cluster view is built from the local counters of the loop
+        if not self._metrics:
+            return dict(
+                requests=self.requests_c,
+                bytes_in=self.bytes_in_c,
+                bytes_out=self.bytes_out_c,
+                connections=len(self.connections),
+                lag=0.0,
+                workers=[],
+            )
+        return self._metrics.aggregate()
+
+    def instrument_dict(self):
+        info = dict(
+            (name, histogram.to_dict())
+            for name, histogram in legacy.iteritems(self._histograms)
+        )
+        info.update(
+            enabled=self.instrument,
+            slow_callback=self.slow_callback,
+            slow_c=self.slow_c,
+        )
+        return info
+
+    def profile_dict(self):
+        if not self._profiler:
+            return dict(running=False, samples=0)
+        return self._profiler.to_dict()
+
+    def reset_instrument(self):
+        for histogram in legacy.itervalues(self._histograms):
+            histogram.reset()
+        self.slow_c = 0
+
     def connections_dict(self, full=False):
         connections = []
         for connection in self.connections:
@@ -3803,6 +4364,31 @@ class AbstractBase(observer.Observable):
         self.poll = self.poll_c()
         return self.poll
 
+    def build_scheduler(self):
+        # retrieves the reference to the parent class associated with
+        # the current instance, it's going t be used for class methods
+        cls = self.__class__
+
+        # runs the testing of the scheduler again and verifies if the
+        # scheduler class has changed in case it did not returns the
+        # current scheduler instance (nothing to be changed)
+        scheduler_c = cls.test_scheduler(preferred=self.scheduler_name)
+        if scheduler_c == self.scheduler_c:
+            return self._delayed
+
+        # creates the new scheduler instance and moves the complete set
+        # of currently pending delayed calls into it, so that none of
+        # them is lost in the transition between schedulers
+        scheduler = scheduler_c()
+        for callable_t in self._delayed.items():
+            scheduler.push(callable_t)
+        self._delayed.clear()
+
+        # updates the scheduler class with the new value and returns
+        # the newly created scheduler to the caller method
+        self.scheduler_c = scheduler_c
+        return scheduler
+
     def build_future(self, compat=True, asyncio=True):
         """
         Creates a future object that is bound to the current event
@@ -3839,6 +4425,301 @@ class AbstractBase(observer.Observable):
         name = poll.name()
         return name
 
+    def get_poll_timeout(self, current=None):
+        """
+        Computes the amount of time (in seconds) that the next poll
+        operation may block for, based on the deadline of the nearest
+        delayed execution.
+
+        In case there's a notify pool available (cross thread wakeups
+        are possible) the poll blocks until the next deadline or even
+        indefinitely, otherwise the value is capped by the poll timeout
+        so that the loop periodically wakes up.
+
+        In case there are callables ready to be executed (or pending
+        notifications) the returned value is zero so that the poll
+        operation returns immediately.
+
+        :type current: float
+        :param current: The current timestamp to be used as reference,
+        if not provided the current system time is used.
+        :rtype: float
+        :return: The timeout for the next poll operation, a negative
+        value implies blocking until an event is received.
+        """
+
+        # in case there are pending cross thread delayed calls or
+        # notifications they should be handled on the next tick so
+        # the poll operation must not block at all
+        if self._delayed_n or self._notified:
+            return 0.0
+
+        # determines if the blocking period should be capped by the poll
+        # timeout, this is only required when there's no notify pool as
+        # otherwise other threads are able to wakeup the loop on demand
+        is_capped = not self.npool and self.poll_timeout >= 0
+
+        # retrieves the target of the nearest delayed execution and in
+        # case there's none either blocks indefinitely or uses the poll
+        # timeout as the upper bound of the blocking period (periodic wakeup)
+        deadline = self._delayed.deadline()
+        if deadline == None:
+            return self.poll_timeout if is_capped else -1
+        if deadline <= 0:
+            return 0.0
+
+        # calculates the amount of time until the deadline is reached
+        # and caps it by the poll timeout (in case it's required)
+        current = current or time.time()
+        timeout = max(deadline - current, 0.0)
+        if not is_capped:
+            return timeout
+        return min(timeout, self.poll_timeout)
+
+    def get_read_view(self, size=CHUNK_SIZE):
+        """
+        Retrieves the memory view over the reusable (per loop) buffer
+        that is going to be used for the read into operations, in case
+        the read into mode is not enabled (or the data handlers are not
+        able to handle memory views) an invalid value is returned.
+
+        The data received into this buffer is only valid until the next
+        read operation in the loop, so consumers that keep it must copy.
+
+        Under Python 2 the read into mode is not supported (most of the
+        byte operations are not compatible with memory views) and an
+        invalid value is always returned.
+
+        :type size: int
+        :param size: The size in bytes of the buffer to be created.
+        :rtype: memoryview
+        :return: The memory view over the reusable read buffer.
+        """
+
+        if not self.read_into:
+            return None
+        if not self.read_view_safe:
+            return None
+        if not legacy.PYTHON_3:
+            return None
+        if self._read_v == None:
+            self._read_v = memoryview(bytearray(size))
+        return self._read_v
+
+    def set_affinity(self, index):
+        """
+        Pins the current process to a single CPU, selected from the
+        set of CPUs currently available to the process using the
+        provided index (eg: the index of the child process).
+
+        This operation is only available on systems that support
+        the changing of the affinity of a process (eg: Linux).
+
+        :type index: int
+        :param index: The index that is going to be used to select
+        the CPU (in a round robin fashion) to pin the process to.
+        :rtype: bool
+        :return: If the affinity of the process has been changed.
+        """
+
+        if not hasattr(os, "sched_setaffinity"):
+            self.warning("No support for CPU affinity is available")
+            return False
+        cpus = sorted(os.sched_getaffinity(0))  # pylint: disable=E1101
+        cpu = cpus[index % len(cpus)]
+        os.sched_setaffinity(0, (cpu,))  # pylint: disable=E1101
+        self.debug("Pinned process '%d' to CPU '%d'", os.getpid(), cpu)
+        return True
+
+    def start_profile(self, interval=None):
+        """
+        Starts the sampling profiler for the thread running the event
+        loop, the stacks are sampled from a helper thread so that the
+        overhead on the event loop is kept to a minimum.
+
+        :type interval: float
+        :param interval: The amount of time (in seconds) in between each
+        of the samples, defaults to the profile interval of the loop.
+        :rtype: bool
+        :return: If the profiler has been started, false in case it was
+        already running (no new profiler is created).
+        """
+
+        if self._profiler and self._profiler.running:
+            return False
+        interval = interval or self.profile_interval
+        tid = self.tid or threading.current_thread().ident
+        self._profiler = profiler.SamplingProfiler(tid, interval=interval)
+        self._profiler.start()
+        self.info("Started sampling profiler (%.2fms interval) ...", interval * 1000.0)
+        return True
+
+    def stop_profile(self):
+        """
+        Stops the currently running sampling profiler (if any) and
+        returns the collapsed stacks (flamegraph ready) of the samples.
+
+        :rtype: String
+        :return: The collapsed stacks for the samples of the last
+        profiler, or an invalid value in case there's no profiler.
+        """
+
+        if not self._profiler:
+            return None
+        self._profiler.stop()
+        self.info("Stopped sampling profiler (%d samples)", self._profiler.samples)
+        return self._profiler.collapsed()
+
+    def toggle_profile(self):
+        """
+        Toggles the sampling profiler, starting it in case it's not
+        running and otherwise stopping it and dumping its collapsed
+        stacks to a file, to be used from a signal handler.
+
+        The dump of the stacks (file I/O) is delayed to the event loop
+        so that it's not performed inside of the signal handler.
+
+        :rtype: bool
+        :return: If the profiler has been started, false in case it
+        has been stopped (and the dump of its stacks scheduled).
+        """
+
+        if self._profiler and self._profiler.running:
+            collapsed = self.stop_profile()
+            self.delay_s(lambda: self.dump_profile(collapsed))
+            return False
+        self.start_profile()
+        return True
+
+    def _profile_signum(self):
+        signum = self.profile_signal
+        if not signum:
+            return None
+        if legacy.is_string(signum) and signum.isdigit():
+            signum = int(signum)
+        if not legacy.is_string(signum):
+            return signum
+        signum = signum.upper()
+        if not signum.startswith("SIG"):
+            signum = "SIG" + signum
+        return getattr(signal, signum, None)
+
+    def dump_profile(self, collapsed, path=None):
+        base = self.profile_path or tempfile.gettempdir()
+        name = "netius-%d-%d.collapsed" % (os.getpid(), int(time.time()))
+        path = path or os.path.join(base, name)
+        file = open(path, "w")
+        try:
+            file.write(collapsed)
+        finally:
+            file.close()
+        self.info("Dumped profile collapsed stacks into '%s'", path)
+        return path
+
+    def bind_metrics(self):
+        """
+        Binds the current (child) process to its slot of the shared
+        memory metrics region, taking the values already in the slot
+        (from a previous child with the same index) as the base of the
+        counters, and schedules the periodic flush of the counters.
+        """
+
+        self._metrics_slot = self._get_metrics_slot(
+            self._child_index or 0, self._generation
+        )
+        if self._metrics_slot == None:
+            self.warning("No shared metrics slot available for child")
+            return
+        values = self._metrics.read(self._metrics_slot) or dict(
+            requests=0, bytes_in=0, bytes_out=0
+        )
+        self._metrics_base = (
+            values["requests"],
+            values["bytes_in"],
+            values["bytes_out"],
+        )
+        self._metrics_target = time.time() + self.metrics_interval
+        self.delay(self.flush_metrics, timeout=self.metrics_interval)
+
+    def flush_metrics(self):
+        """
+        Flushes the local counters of the current process into its slot
+        of the shared memory metrics region, this is a single (lock free)
+        write per interval so that the hot path only has to update plain
+        integer attributes of the event loop.
+
+        The loop lag is measured as the delay between the expected and
+        the effective execution of this (periodic) operation.
+        """
+
+        current = time.time()
+        lag = max(current - self._metrics_target, 0.0)
+        requests, bytes_in, bytes_out = self._metrics_base
+        self._metrics.write(
+            self._metrics_slot,
+            os.getpid(),
+            requests=requests + self.requests_c,
+            bytes_in=bytes_in + self.bytes_in_c,
+            bytes_out=bytes_out + self.bytes_out_c,
+            connections=len(self.connections),
+            lag=lag,
+        )
+        self._metrics_target = current + self.metrics_interval
+        self.delay(self.flush_metrics, timeout=self.metrics_interval)
+
+    def is_read_exhausted(self, count, size):
+        """
+        Verifies if the read budget for a single readiness event of a
+        connection has been exhausted, taking into account both the
+        number of read operations and the amount of bytes read.
+
+        :type count: int
+        :param count: The number of read operations performed so far.
+        :type size: int
+        :param size: The amount of bytes read so far.
+        :rtype: bool
+        :return: If the read budget has been exhausted and the reading
+        of the connection should yield to the other connections.
+        """
+
+        if self.read_iterations and count >= self.read_iterations:
+            return True
+        if self.read_budget and size >= self.read_budget:
+            return True
+        return False
+
+    def requeue_read(self, _socket, force=False):
+        """
+        Handles the exhaustion of the read budget for the provided
+        socket, re-queuing its reading for the next loop iteration in
+        case no new readiness event is going to be raised for it.
+
+        Under an edge triggered poll (or with data buffered in user
+        space, eg: SSL) the socket would not be reported again, so a
+        read operation is scheduled for the next tick, for the level
+        triggered case the poll operation reports it again by itself.
+
+        :type _socket: Socket
+        :param _socket: The socket that has exhausted its read budget.
+        :type force: bool
+        :param force: If the re-queue should be performed even for a
+        level triggered poll (eg: data buffered in the SSL layer).
+        """
+
+        self.budget_c += 1
+        if not self.is_edge() and not force:
+            return
+        self.requeues_c += 1
+        self.delay(lambda: self.reads((_socket,), state=False), immediately=True)
+
+    def get_scheduler(self):
+        return self._delayed
+
+    def get_scheduler_name(self):
+        scheduler = self.get_scheduler()
+        name = scheduler.name()
+        return name
+
     def get_state(self):
         return self._state
 
@@ -4127,11 +5008,14 @@ class AbstractBase(observer.Observable):
         # comparisons against the target timestamps of the callables
         current = time.time()
 
-        # creates the lists that will hold all the values that are not
+        # determines if the execution time of each of the callables
+        # should be measured (instrumentation), cached locally
+        instrument = self.instrument
+
+        # creates the list that will hold all the values that are not
         # yet ready to be called in this iteration, the value in this
-        # list will be added back to the heap at the end of the iteration
+        # list will be added back to the scheduler at the end of the iteration
         pendings = []
-        pendings_o = []
 
         # iterates over all the delayed callable tuples to try to find
         # (and call) the ones that are meant to be executed in the past
@@ -4144,32 +5028,17 @@ class AbstractBase(observer.Observable):
             if self._notifies():
                 continue
 
-            # "pops" the current item from the delayed list to be used
-            # in the execution of the current iteration cycle
-            callable_t = heapq.heappop(self._delayed)
-            callable_o = heapq.heappop(self._delayed_o)
+            # "pops" the next item ready to be executed from the scheduler,
+            # in case there's none (every remaining item has a target in the
+            # future) the loop is broken as there's nothing more to be done
+            callable_t = self._delayed.pop(current)
+            if not callable_t:
+                break
 
             # unpacks the current callable tuple in iteration into a
-            # target (timestamp value) and a method to be called in
-            # case the target timestamp is valid (in the past)
+            # target (timestamp value) and a method to be called
             target, _did, method, lid, options = callable_t
 
-            # defines the proper target value that is going to be used
-            # for the comparison against the current time reference
-            # this is performed by defaulting the value against negative
-            # ensuring immediate execution of the associated callable
-            if target == None:
-                target = -1
-
-            # tests if the current target is valid (less than or
-            # equals to the current time value) and in case it's
-            # not restores the value to the heap and breaks the loop
-            is_valid = target <= current
-            if not is_valid:
-                pendings.append(callable_t)
-                pendings_o.append(callable_o)
-                break
-
             # in case the loop id present in the delayed call tuple is
             # the same as the current iteration identifier then the
             # call must be done in the next iteration cycle, this
@@ -4178,7 +5047,6 @@ class AbstractBase(observer.Observable):
             # calls to be executed immediately (on next loop)
             if target == 0 and self._lid == lid:
                 pendings.append(callable_t)
-                pendings_o.append(callable_o)
                 continue
 
             # unpacks the multiple options so that it's possible to determine
@@ -4196,20 +5064,23 @@ class AbstractBase(observer.Observable):
             # must be implemented with the proper precautions, note that
             # proper exception is set so that proper top level handling
             # is defined and logging is performed
+            if instrument:
+                start = time.time()
             try:
                 method()
-            except (KeyboardInterrupt, SystemExit, errors.StopError):
+            except (KeyboardInterrupt, SystemExit, errors.StopError, errors.ForkError):
                 raise
             except BaseException as exception:
                 self.error(exception, stack=True)
                 self.log_stack(method=self.warning)
+            if instrument:
+                self._instrument_callback(method, time.time() - start)
 
         # iterates over all the pending callable tuple values and adds
-        # them back to the delayed heap list so that they are called
-        # latter on (not ready to be called now)
-        for pending, pending_o in zip(pendings, pendings_o):
-            heapq.heappush(self._delayed, pending)
-            heapq.heappush(self._delayed_o, pending_o)
+        # them back to the scheduler so that they are called latter
+        # on (not ready to be called now)
+        for pending in pendings:
+            self._delayed.push(pending)
 
         # in case the delayed list is empty resets the delay id so that
         # it never gets into a very large number, would break performance
@@ -5090,6 +5961,182 @@ class AbstractBase(observer.Observable):
         delta_s += "%ds" % seconds
         return delta_s.strip()
 
+    def _spawn(self, index):
+        """
+        Forks a new child process for the provided index, registering
+        it under the current generation of children.
+
+        In the child process this method never returns normally, the
+        fork error is raised instead so that the control flow leaves the
+        supervision logic of the parent (eg: the wait forever loop).
+
+        :type index: int
+        :param index: The index of the child process to be forked.
+        :rtype: int
+        :return: The PID of the newly forked child process.
+        """
+
+        pid = os.fork()  # @UndefinedVariable pylint: disable=E1101
+        if pid == 0:
+            # in case this is a (re-)spawn of a child by the supervision
+            # logic the parent's state is discarded (delays and signals)
+            if self._forked:
+                self._delayed.clear()
+                self._delayed_n.clear()
+                self._delayed_w = False
+                if hasattr(signal, "SIGCHLD"):
+                    signal.signal(signal.SIGCHLD, signal.SIG_DFL)  # @UndefinedVariable
+                if hasattr(signal, "SIGUSR1"):
+                    signal.signal(signal.SIGUSR1, signal.SIG_DFL)  # @UndefinedVariable
+                self.bind_config()
+            self._child = True
+            self._forked = True
+            self._running = False
+            self._child_index = index
+            self._childs = []
+            self._child_m = {}
+            self.on_child(pipe=self._pipe_send)
+            raise errors.ForkError()
+
+        self._childs.append(pid)
+        self._child_m[pid] = dict(
+            index=index,
+            generation=self._generation,
+            started=time.time(),
+            ready=False,
+            retiring=False,
+        )
+        return pid
+
+    def _reap(self):
+        """
+        Reaps the complete set of child processes that have exited,
+        scheduling the respawning (with backoff) of the ones that have
+        exited unexpectedly (not retired by a rolling reload).
+        """
+
+        while True:
+            try:
+                pid, status = os.waitpid(
+                    -1, os.WNOHANG
+                )  # @UndefinedVariable pylint: disable=E1101
+            except OSError as error:
+                if error.errno == errno.EINTR:
+                    continue
+                if error.errno == errno.ECHILD:
+                    break
+                raise
+            if not pid:
+                break
+
+            # removes the child from the internal structures and in case
+            # it's not a known one or it has been retired continues
+            info = self._child_m.pop(pid, None)
+            if pid in self._childs:
+                self._childs.remove(pid)
+            if not info:
+                continue
+            # releases the metrics slot of the child (if any) so that its
+            # live values are no longer accounted in the cluster view
+            slot = (
+                self._get_metrics_slot(info["index"], info["generation"])
+                if self._metrics
+                else None
+            )
+            if not slot == None:
+                self._metrics.release(slot)
+
+            if info["retiring"]:
+                self.debug("Retired child process '%d' has exited", pid)
+                continue
+
+            self.warning("Child process '%d' exited with status '%d'", pid, status)
+            if not self.respawn or not self._running:
+                continue
+
+            # calculates the backoff value for the child index, doubling
+            # the previous one for consecutive failures and resetting it
+            # in case the child has been running for long enough
+            index = info["index"]
+            lifetime = time.time() - info["started"]
+            backoff = self._backoff_m.get(index, 0.0)
+            if not backoff or lifetime > RESPAWN_BACKOFF_MAX:
+                backoff = RESPAWN_BACKOFF
+            else:
+                backoff = min(backoff * 2.0, RESPAWN_BACKOFF_MAX)
+            self._backoff_m[index] = backoff
+
+            self.info("Respawning child '%d' in %.2f seconds ...", index, backoff)
+            self.delay(lambda index=index: self._respawn(index), timeout=backoff)
+
+    def _respawn(self, index):
+        # in case the parent is no longer running or the index has
+        # already a child for the current generation (eg: created
+        # by a rolling reload meanwhile) there's nothing to be done
+        if not self._running:
+            return
+        for info in self._child_m.values():
+            if not info["index"] == index:
+                continue
+            if not info["generation"] == self._generation:
+                continue
+            if info["retiring"]:
+                continue
+            return
+        self._spawn(index)
+
+    def _ready(self, pid):
+        # marks the child as ready and verifies if the complete set of
+        # children of the current generation is ready, if that's the
+        # case the children of the previous generations are retired
+        info = self._child_m.get(pid, None)
+        if not info:
+            return
+        info["ready"] = True
+        ready = [
+            info
+            for info in self._child_m.values()
+            if info["generation"] == self._generation and info["ready"]
+        ]
+        if len(ready) < self.children:
+            return
+        for pid, info in self._child_m.items():
+            if info["generation"] == self._generation:
+                continue
+            if info["retiring"]:
+                continue
+            self.debug("Retiring child process '%d' ...", pid)
+            info["retiring"] = True
+            os.kill(pid, signal.SIGUSR2)  # @UndefinedVariable
+
+    def _instrument_loop(self, start, poll_start, poll_end):
+        end = time.time()
+        self._histograms["iteration"].add(end - start)
+        self._histograms["delays"].add(poll_start - start)
+        self._histograms["poll"].add(poll_end - poll_start)
+        self._histograms["handlers"].add(end - poll_end)
+
+    def _instrument_callback(self, method, elapsed):
+        self._histograms["callback"].add(elapsed)
+        if elapsed < self.slow_callback:
+            return
+        self.slow_c += 1
+        self.warning(
+            "Slow callback '%s' took %.2fms",
+            util.callable_name(method),
+            elapsed * 1000.0,
+        )
+
+    def _get_metrics_slot(self, index, generation):
+        # alternates the slots between consecutive generations so that
+        # on a rolling reload the old and new children never share a slot,
+        # the number of children may have been changed by a reload so the
+        # slot is only returned in case it fits the (fixed size) region
+        slot = index + (generation % 2) * self.children
+        if slot >= self._metrics.slots:
+            return None
+        return slot
+
     def _wait_forever(self, sleep=60):
         """
         Runs a simple event loop that sleeps for a certain amount
@@ -5122,7 +6169,16 @@ class AbstractBase(observer.Observable):
                         self._delays()
                     finally:
                         self._awaken = False
-                    time.sleep(sleep)
+
+                    # bounds the sleep period by the deadline of the nearest
+                    # delayed execution so that timed operations (eg: the
+                    # respawn of children with backoff) run on schedule
+                    deadline = self._delayed.deadline()
+                    if not deadline == None:
+                        sleep_t = max(min(deadline - time.time(), sleep), 0.0)
+                    else:
+                        sleep_t = sleep
+                    time.sleep(sleep_t)
                 except errors.WakeupError:
                     continue
                 except (
@@ -5130,6 +6186,7 @@ class AbstractBase(observer.Observable):
                     SystemExit,
                     errors.StopError,
                     errors.PauseError,
+                    errors.ForkError,
                 ):
                     raise
                 except BaseException as exception:
@@ -394,7 +394,7 @@ class CompatLoop(BaseLoop):
 
         # creates the handle to control the operation and then returns the
         # object to the caller method, allowing operation cancellation
-        handle = asynchronous.Handle(callable_t=callable_t)
+        handle = asynchronous.Handle(callable_t=callable_t, loop=self._loop)
         return handle
 
     def _sleep(self, timeout, future=None):
@@ -38,6 +38,7 @@ __copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import os
 import ssl
 import time
 import uuid
@@ -49,7 +50,9 @@ import collections
 
 from . import tls
 from . import config
+from . import errors
 from . import legacy
+from . import splice
 from . import observer
 
 OPEN = 1
@@ -68,6 +71,216 @@ CHUNK_SIZE = 16384
 """ The size of the chunk to be used while received
 data from the service socket """
 
+VECTOR_SIZE = 64
+""" The maximum number of pending buffers that are going
+to be flushed in a single vectored (scatter-gather) send
+operation, should be kept bellow the system's iov limit """
+
+
+class FileRegion(object):
+    """
+    Region (offset and size) of a file that is pending to be sent
+    through a connection, to be used as an entry of the pending buffer
+    so that the data is sent directly from the file descriptor into
+    the socket (using sendfile) without crossing into Python.
+
+    Only valid for plain (no SSL) stream connections, the file is not
+    closed by the region (the owner of the file is responsible for it).
+    """
+
+    __slots__ = ("file", "offset", "count")
+
+    def __init__(self, file, offset, count):
+        self.file = file
+        self.offset = offset
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def fileno(self):
+        file = self.file
+        return file if isinstance(file, int) else file.fileno()
+
+    def advance(self, count):
+        """
+        Retrieves a new region that represents the remaining part of
+        the current one after the provided number of bytes.
+
+        :type count: int
+        :param count: The number of bytes (from the start) to skip.
+        :rtype: FileRegion
+        :return: The region with the remaining part of the current one.
+        """
+
+        return FileRegion(self.file, self.offset + count, self.count - count)
+
+    def send(self, socket):
+        """
+        Sends as much as possible of the region through the provided
+        socket using the sendfile system call, returning the number
+        of bytes that have been sent.
+
+        The would block situation is raised as the underlying error
+        and the premature end of file (eg: truncated file) is raised
+        as a data error, as the region would never be completely sent.
+
+        :type socket: Socket
+        :param socket: The (plain) socket to send the region through.
+        :rtype: int
+        :return: The number of bytes of the region that have been sent.
+        """
+
+        if not self.count:
+            return 0
+        count = os.sendfile(socket.fileno(), self.fileno(), self.offset, self.count)
+        if count == 0:
+            raise errors.DataError("Premature end of file in region")
+        return count
+
+
+class PendingBuffer(object):
+    """
+    Queue like structure that holds the buffers that are pending
+    to be sent (or received) by a connection, in order (FIFO).
+
+    Each entry keeps the original data buffer together with the
+    offset of the part that has already been consumed, so that
+    partial operations only move the offset (no copy of the
+    remaining bytes is created) and the original buffer is only
+    released once it has been completely consumed.
+
+    The underlying queue is only created when the first entry is
+    pushed and released once drained, so that idle connections
+    hold no queue at all (just an empty tuple).
+    """
+
+    __slots__ = ("_entries",)
+
+    def __init__(self):
+        self._entries = ()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __bool__(self):
+        return len(self._entries) > 0
+
+    def __nonzero__(self):
+        return self.__bool__()
+
+    def push(self, data, address=None, callback=None, back=True):
+        entry = [data, 0, address, callback]
+        if not self._entries:
+            self._entries = collections.deque()
+        if back:
+            self._entries.append(entry)
+        else:
+            self._entries.appendleft(entry)
+
+    def peek(self):
+        """
+        Retrieves the (remaining) data, address and callback of the
+        entry at the head of the queue without removing it, the data
+        is returned as a memory view in case it's been partially consumed.
+
+        :rtype: Tuple
+        :return: The tuple containing the remaining data, the address
+        and the callback of the entry at the head of the queue.
+        """
+
+        data, offset, address, callback = self._entries[0]
+        if offset:
+            if type(data) == FileRegion:
+                data = data.advance(offset)
+            else:
+                data = memoryview(data)[offset:]
+        return data, address, callback
+
+    def pop(self):
+        data, address, callback = self.peek()
+        self._entries.popleft()
+        if not self._entries:
+            self._entries = ()
+        return data, address, callback
+
+    def views(self, limit):
+        """
+        Retrieves the sequence of (remaining) data buffers at the head
+        of the queue that are eligible for a vectored send operation,
+        stopping at the first entry that has no data, that has an
+        address associated (eg: close request or datagram) or that is
+        a file region (sent using its own system call).
+
+        :type limit: int
+        :param limit: The maximum number of buffers to be retrieved.
+        :rtype: List
+        :return: The list of data buffers (or memory views for the
+        partially consumed ones) in the order they should be sent.
+        """
+
+        views = []
+        for data, offset, address, _callback in self._entries:
+            if not data or address or type(data) == FileRegion:
+                break
+            views.append(memoryview(data)[offset:] if offset else data)
+            if len(views) == limit:
+                break
+        return views
+
+    def consume(self, count):
+        """
+        Consumes the provided number of bytes from the head of the
+        queue, removing the completely consumed entries and moving
+        the offset of the partially consumed one.
+
+        :type count: int
+        :param count: The number of bytes that have been consumed.
+        :rtype: List
+        :return: The callbacks of the entries that have been completely
+        consumed, in order (invalid values included).
+        """
+
+        callbacks = []
+        while count and self._entries:
+            entry = self._entries[0]
+            remaining = len(entry[0]) - entry[1]
+            if count < remaining:
+                entry[1] += count
+                break
+            self._entries.popleft()
+            callbacks.append(entry[3])
+            count -= remaining
+        if not self._entries:
+            self._entries = ()
+        return callbacks
+
+    def read(self, size):
+        """
+        Reads up to the provided number of bytes from the entry at the
+        head of the queue, removing it in case it's completely read.
+
+        :type size: int
+        :param size: The maximum number of bytes to be read.
+        :rtype: String
+        :return: The buffer with the bytes that have been read.
+        """
+
+        if not self._entries:
+            return b""
+        entry = self._entries[0]
+        data, offset = entry[0], entry[1]
+        if size < len(data) - offset:
+            entry[1] += size
+            return data[offset : offset + size]
+        self._entries.popleft()
+        if not self._entries:
+            self._entries = ()
+        return data[offset:] if offset else data
+
+    def clear(self):
+        self._entries = ()
+
 
 class BaseConnection(observer.Observable):
     """
@@ -81,6 +294,64 @@ class BaseConnection(observer.Observable):
     appropriate operations.
     """
 
+    __slots__ = (
+        "status",
+        "id",
+        "connecting",
+        "upgrading",
+        "owner",
+        "socket",
+        "address",
+        "datagram",
+        "ssl",
+        "max_pending",
+        "min_pending",
+        "renable",
+        "wready",
+        "vectored",
+        "pending_s",
+        "restored_s",
+        "starters",
+        "pending",
+        "restored",
+        "pending_lock",
+        "restored_lock",
+        "idle_t",
+        "idle_s",
+        "idle_b",
+        "wpaused",
+        "linked",
+        "_starter",
+    )
+    """ The set of attributes that every connection holds, stored
+    in slots so that an idle connection does not carry a complete
+    dictionary, other (rarely used) attributes are still settable """
+
+    ssl_host = None
+    """ The host name to be used in the SNI and certificate host
+    verification of the connection, rarely used so it's only set
+    (in the instance) for the connections that require it """
+
+    ssl_fingerprint = None
+    """ The fingerprint of the certificate that is expected to be
+    provided by the peer, set only for connections that require it """
+
+    ssl_handshake = False
+    """ If the SSL handshake of the connection has already been
+    completed, set in the instance once the handshake is done """
+
+    ssl_connecting = False
+    """ If the connection is currently under the SSL handshake
+    process, only set for SSL based connections """
+
+    ssl_dump = False
+    """ If the certificate of the peer should be dumped to the file
+    system once the handshake is complete (debugging purposes) """
+
+    spliced = None
+    """ The zero-copy (splice) tunnel the connection is part of, set
+    only for the (tunnel) connections that are spliced to a peer """
+
     def __init__(
         self,
         owner=None,
@@ -101,22 +372,23 @@ class BaseConnection(observer.Observable):
         self.address = address
         self.datagram = datagram
         self.ssl = ssl
-        self.ssl_host = None
-        self.ssl_fingerprint = None
-        self.ssl_handshake = False
-        self.ssl_connecting = False
-        self.ssl_dump = False
         self.max_pending = max_pending
         self.min_pending = min_pending
         self.renable = True
         self.wready = False
+        self.vectored = is_vectored
         self.pending_s = 0
         self.restored_s = 0
-        self.starters = collections.deque()
-        self.pending = collections.deque()
-        self.restored = collections.deque()
+        self.starters = ()
+        self.pending = PendingBuffer()
+        self.restored = PendingBuffer()
         self.pending_lock = threading.RLock()
         self.restored_lock = threading.RLock()
+        self.idle_t = 0
+        self.idle_s = 0
+        self.idle_b = None
+        self.wpaused = False
+        self.linked = ()
         self._starter = None
 
     def destroy(self):
@@ -213,6 +485,18 @@ class BaseConnection(observer.Observable):
         self.restored_s = 0
         self.restored.clear()
 
+        # unlinks the connection from all of its peers, re-enabling the
+        # reading on the ones that have been paused by the write buffer
+        # of this connection, and then resets the watermark state
+        for peer in self.linked:
+            self.unlink(peer)
+        self.wpaused = False
+
+        # in case the connection is part of a zero-copy tunnel closes it
+        # (releasing its pipes) so that the peer returns to the regular mode
+        if self.spliced:
+            self.spliced.close()
+
         # retrieves the reference to the owner object from the
         # current instance to be used to remove the socket from the
         # proper pooling mechanisms (at least for reading)
@@ -429,6 +713,124 @@ class BaseConnection(observer.Observable):
         self.renable = False
         self.owner.unsub_read(self.socket)
 
+    def set_watermarks(self, high, low=None):
+        """
+        Sets the write buffer watermarks of the connection, these are
+        the number of pending (to be sent) bytes above which the linked
+        peers stop being read and below which they are read again.
+
+        The values are stored as the maximum and minimum pending values
+        of the connection so that the exhausted and restored checks
+        remain consistent with the watermarks.
+
+        :type high: int
+        :param high: The number of pending bytes above which the reading
+        of the linked peers is paused (high water mark).
+        :type low: int
+        :param low: The number of pending bytes at or below which the
+        reading of the linked peers is resumed, if not provided a quarter
+        of the high value is used.
+        """
+
+        if low == None:
+            low = high // 4
+        if not high >= low >= 0:
+            raise errors.RuntimeError("High must be larger than low")
+
+        self.max_pending = high
+        self.min_pending = low
+
+    def link(self, peer, mutual=True):
+        """
+        Links the provided peer connection with the current one so that
+        the reading of the peer is paused whenever the write buffer of
+        this connection crosses the high water mark and resumed once it
+        drops to the low water mark.
+
+        This is the typical setup of a proxy (or tunnel) where the data
+        read from one connection is written to the other one, bounding
+        the amount of memory used by each pair of connections.
+
+        :type peer: Connection
+        :param peer: The peer connection (or compatible protocol) that
+        is going to be linked with the current connection.
+        :type mutual: bool
+        :param mutual: If the link should be created in both directions
+        so that the peer's write buffer also controls this connection.
+        """
+
+        peer = self._resolve_peer(peer)
+        if peer == None or peer == self:
+            return
+        if peer in self.linked:
+            return
+
+        self.linked = self.linked + (peer,)
+        if mutual:
+            peer.link(self, mutual=False)
+
+        # in case the connection is already above the high water mark
+        # the newly linked peer must be paused immediately
+        if self.wpaused:
+            peer.disable_read()
+
+    def unlink(self, peer, mutual=True):
+        """
+        Removes the link between the current connection and the provided
+        peer, in case the peer has been paused by the write buffer of this
+        connection its reading is resumed.
+
+        :type peer: Connection
+        :param peer: The peer connection (or compatible protocol) that is
+        going to be unlinked from the current connection.
+        :type mutual: bool
+        :param mutual: If the link in the opposite direction should also
+        be removed (the default behaviour).
+        """
+
+        peer = self._resolve_peer(peer)
+        if not peer in self.linked:
+            return
+
+        self.linked = tuple(value for value in self.linked if not value == peer)
+        if mutual:
+            peer.unlink(self, mutual=False)
+
+        if self.wpaused:
+            self._resume(peer)
+
+    def splice(self, peer, size=splice.CHUNK_SIZE):
+        """
+        Starts a zero-copy tunnel between the current connection and
+        the provided peer, from this moment on the data read from any
+        of the connections is moved by the kernel into the other one
+        and no data events are triggered for them.
+
+        The tunnel is only started in case both connections are plain
+        (no SSL) stream connections and the platform supports splice,
+        otherwise nothing is done and the regular data path is used.
+
+        :type peer: Connection
+        :param peer: The peer connection (or compatible protocol) that
+        is going to be the other end of the tunnel.
+        :type size: int
+        :param size: The maximum number of bytes to be moved by each
+        of the splice operations.
+        :rtype: Splice
+        :return: The zero-copy tunnel that has been started or an
+        invalid value in case the connections can't be spliced.
+        """
+
+        peer = self._resolve_peer(peer)
+        if peer == None or peer == self:
+            return None
+        if not splice.Splice.is_spliceable(self, peer):
+            return None
+
+        tunnel = splice.Splice(self, peer, size=size)
+        tunnel.start()
+        return tunnel
+
     def send(self, data, address=None, delay=True, force=False, callback=None):
         """
         The main send call is to be used by a proxy connection and
@@ -471,11 +873,27 @@ class BaseConnection(observer.Observable):
         to be send is completely sent to the socket.
         """
 
+        # in case the data is a memory view (eg: a slice of the reusable
+        # receive buffer of the loop) its contents are only valid for a
+        # short period, so it's sent directly when possible and only the
+        # remaining part of it is copied into the pending buffer
+        if type(data) == memoryview:
+            data_l = len(data)
+            if not self.status == OPEN and not force:
+                return 0
+            data = self._send_view(data, address=address)
+            if not data:
+                if callback:
+                    callback(self)
+                return data_l
+
         # ensures that the data type of the current data string
         # is the required one for the output operations (binary)
         # in case it's not the required transformation operations
-        # should be performed so that the data format is compatible
-        data = legacy.bytes(data) if data else data
+        # should be performed so that the data format is compatible,
+        # note that file regions are kept as they are (sendfile)
+        if data and not type(data) == FileRegion:
+            data = legacy.bytes(data)
 
         # calculates the size in bytes of the provided data so
         # that it may be used latter for the incrementing of
@@ -532,19 +950,91 @@ class BaseConnection(observer.Observable):
         # that has been submitted to be sent (as soon as possible)
         return data_l
 
+    def send_file(self, file, offset, count, delay=True, callback=None):
+        """
+        Sends the provided region of the file through the connection,
+        the data is sent directly from the file descriptor into the
+        socket (using sendfile) as the socket becomes writable, keeping
+        the order with the remaining data pending in the connection.
+
+        Should only be used for connections for which the sendfile
+        operation is available (see `can_sendfile()`), the file must
+        remain open until the callback is called.
+
+        :type file: File
+        :param file: The file object (or descriptor) to be sent.
+        :type offset: int
+        :param offset: The offset (in bytes) of the region in the file.
+        :type count: int
+        :param count: The size (in bytes) of the region to be sent.
+        :type delay: bool
+        :param delay: If the send operation should be delayed until
+        the next tick operation.
+        :type callback: Function
+        :param callback: Function to be called when the region has
+        been completely sent through the socket.
+        :rtype: int
+        :return: The number of bytes that have been submitted.
+        """
+
+        region = FileRegion(file, offset, count)
+        return self.send(region, delay=delay, callback=callback)
+
+    def can_sendfile(self):
+        """
+        Determines if the sendfile operation (file regions) may be used
+        for the current connection, requiring platform support and a plain
+        (no SSL) stream socket as the data bypasses any user space layer.
+
+        :rtype: bool
+        :return: If file regions may be sent through the connection.
+        """
+
+        if not is_sendfile:
+            return False
+        if self.ssl or self.datagram:
+            return False
+        return hasattr(self.socket, "fileno")
+
     def recv(self, size=CHUNK_SIZE, force=False):
         if not self.status == OPEN and not force:
             return b""
         return self._recv(size=size)
 
+    def recv_into(self, buffer, force=False):
+        """
+        Receives data from the connection into the provided (reusable)
+        buffer, returning a memory view over the received part of it,
+        so that no new buffer is allocated for each receive operation.
+
+        The returned memory view is only valid until the next receive
+        operation using the same buffer, meaning that any consumer that
+        wants to keep the data must copy it (eg: `legacy.bytes()`).
+
+        :type buffer: memoryview
+        :param buffer: The memory view over the (writable) buffer that
+        is going to be used as the target of the receive operation.
+        :type force: bool
+        :param force: If the receive operation should be performed even
+        if the connection is not open.
+        :rtype: memoryview
+        :return: The memory view over the part of the buffer that has
+        been filled with the received data (empty for end of stream).
+        """
+
+        if not self.status == OPEN and not force:
+            return b""
+        count = self._recv_into(buffer)
+        return buffer[:count]
+
     def pend(self, data, back=True):
         # verifies if the provided data is a tuple and if that's
         # the case unpacks the callback value from it, required
         is_tuple = type(data) == tuple
         if is_tuple:
-            data_b, _address, _callback = data
+            data_b, address, callback = data
         else:
-            data_b = data
+            data_b, address, callback = data, None, None
 
         # calculates the size in bytes of the provided data so
         # that it may be used later for the incrementing of
@@ -552,16 +1042,12 @@ class BaseConnection(observer.Observable):
         data_l = len(data_b) if data_b else 0
 
         # acquires the pending lock and then inserts the data into
-        # the list of pending information to sent to the client end
-        # point, notice that it's inserted at the beginning of the list
-        # as the pop operation is performed at the end of the list, meaning
-        # that the FIFO strategy is maintained
+        # the buffer of pending information to sent to the client end
+        # point, notice that it's inserted at the back of the buffer
+        # (unless otherwise requested) so that the FIFO strategy is kept
         self.pending_lock.acquire()
         try:
-            if back:
-                self.pending.appendleft(data)
-            else:
-                self.pending.append(data)
+            self.pending.push(data_b, address=address, callback=callback, back=back)
         finally:
             self.pending_lock.release()
 
@@ -569,6 +1055,13 @@ class BaseConnection(observer.Observable):
         # the size of the inner data buffer to be added (as requested)
         self.pending_s += data_l
 
+        # in case watermarks are enabled for the connection and the
+        # pending data has just crossed the high mark the reading of
+        # the linked peers is paused (bounding the buffered memory)
+        if self.max_pending >= 0 and not self.wpaused:
+            if self.pending_s > self.max_pending:
+                self._high_water()
+
         # sends the pend event indicating that a new set of data has been
         # set as pending in the internal buffers of the connection and
         # some of the flow controlling operation may have to be performed
@@ -598,10 +1091,7 @@ class BaseConnection(observer.Observable):
         # going to be used in the next receive operation
         self.restored_lock.acquire()
         try:
-            if back:
-                self.restored.appendleft(data)
-            else:
-                self.restored.append(data)
+            self.restored.push(data, back=back)
         finally:
             self.restored_lock.release()
 
@@ -653,6 +1143,8 @@ class BaseConnection(observer.Observable):
         self._starter = None
 
     def add_starter(self, starter, back=True):
+        if not self.starters:
+            self.starters = collections.deque()
         if back:
             self.starters.appendleft(starter)
         else:
@@ -675,6 +1167,9 @@ class BaseConnection(observer.Observable):
             wready=self.wready,
             pending_s=self.pending_s,
             restored_s=self.restored_s,
+            wpaused=self.wpaused,
+            linked_count=len(self.linked),
+            spliced=True if self.spliced else False,
             has_starter=self._has_starter,
             starters_count=len(self.starters),
             socket_fileno=self._safe_fileno,
@@ -818,6 +1313,16 @@ class BaseConnection(observer.Observable):
         if self.connecting:
             return
 
+        # determines if the vectored (scatter-gather) send operation
+        # may be used for the current connection, this is only possible
+        # for plain stream sockets that support the send message call
+        vectored = (
+            self.vectored
+            and not self.ssl
+            and not self.datagram
+            and hasattr(self.socket, "sendmsg")
+        )
+
         # acquires the pending lock so that no other access to the
         # the pending structure is made from a different thread
         self.pending_lock.acquire()
@@ -832,15 +1337,19 @@ class BaseConnection(observer.Observable):
                 if not self.pending:
                     break
 
+                # in case the vectored mode is available and there's more
+                # than one buffer pending tries to flush the multiple pending
+                # buffers at once (single system call), falling back to the
+                # single buffer strategy in case that's not possible
+                if vectored and len(self.pending) > 1 and self._send_vector():
+                    continue
+
                 # retrieves the current data chunk to be sent from the
-                # list of pending things and then saves the data chunk
-                # in an "original" object and tries to unpack it in case
-                # the type of it is a tuple
-                data = self.pending.pop()
-                data_o = data
-                data, address, callback = data
+                # head of the pending buffer (without removing it), note
+                # that the data may be a memory view of the remaining part
+                # of a buffer that has already been partially sent
+                data, address, callback = self.pending.peek()
                 is_close = data == None
-                data_l = 0 if is_close else len(data)
 
                 try:
                     # tries to send the data through the socket and
@@ -855,6 +1364,8 @@ class BaseConnection(observer.Observable):
                         count = 0
                     elif address:
                         count = self.socket.sendto(data, address)
+                    elif type(data) == FileRegion:
+                        count = data.send(self.socket)
                     elif data:
                         count = self.socket.send(data)
                     else:
@@ -879,11 +1390,6 @@ class BaseConnection(observer.Observable):
                     # triggered when the connection is ready for more writing
                     self.ensure_write()
 
-                    # in case there's an exception must re-add the data
-                    # object to the list of pending data because the data
-                    # has not been correctly sent
-                    self.pending.append(data_o)
-
                     # re-raises the current to the upper layers so that they
                     # can properly handle what happened here, sometimes this
                     # is going to imply a graceful handling of other times the
@@ -892,43 +1398,189 @@ class BaseConnection(observer.Observable):
                 else:
                     # decrements the size of the pending buffer by the number
                     # of bytes that were correctly sent through the buffer
+                    # and accounts them in the (cheap) counter of the owner
                     self.pending_s -= count
-
-                    # verifies if the data has been correctly (and completely)
-                    # sent through the socket and if that's not the case re-pushes
-                    # the pending data back to the pending stack
-                    is_valid = count == data_l
-                    if not is_valid:
-                        data_o = (data[count:], address, callback)
-                        self.pending.append(data_o)
+                    if self.owner:
+                        self.owner.bytes_out_c += count
+
+                    # consumes the sent bytes from the pending buffer, which
+                    # only moves the offset of the entry in case it's been
+                    # partially sent (no copy), entries without data (eg:
+                    # close request) are removed as they have been handled
+                    if count:
+                        callbacks = self.pending.consume(count)
+                    else:
+                        self.pending.pop()
+                        callbacks = [callback]
 
                     # triggers the unpend event as some of the data has been
                     # removed from the pending buffer and so any listener must
                     # be notified so that flow operations may be performed
                     self.trigger("unpend", self)
 
-                    # in case the is valid flag is set (all of the data for
-                    # the current write operation has been sent) calls the
-                    # the associated callback (in case it exists)
-                    if is_valid and callback:
-                        callback(self)
+                    # in case the connection is paused by the watermarks and
+                    # the pending data is now below the low mark resumes the
+                    # reading of the linked peers (flow is restored)
+                    if self.wpaused and self.pending_s <= self.min_pending:
+                        self._low_water()
+
+                    # in case the data has been completely sent for the current
+                    # write operation calls the associated callback (in case it
+                    # exists), as expected by the callback definition
+                    for callback in callbacks:
+                        if callback:
+                            callback(self)
         finally:
             # releases the pending access lock so that no leaks
             # exists and no access to the pending is prevented
             self.pending_lock.release()
 
+        # in case the connection is the target of a zero-copy tunnel flushes
+        # the data waiting in the (kernel) pipe now that the pending buffer
+        # is empty, waiting for the next write event in case it's not possible
+        if self.spliced and not self.spliced.flush(self):
+            return
+
         # removes the current connection from the set of connections
         # that are monitored for any write event (no longer required)
         self.remove_write()
 
+    def _send_vector(self):
+        """
+        Tries to flush as many of the pending buffers as possible
+        using a single vectored (scatter-gather) send operation, the
+        callbacks of the completely sent buffers are called in order.
+
+        This method should be called with the pending lock acquired
+        and is going to raise the underlying socket exception in case
+        the send operation fails (eg: would block situation).
+
+        :rtype: bool
+        :return: If a vectored send operation has been performed, in
+        case it's not possible (eg: a single buffer is eligible) the
+        caller should fallback to the single buffer strategy.
+        """
+
+        # gathers the sequence of buffers (from the head of the pending
+        # buffer) that are eligible for the vectored send operation, the
+        # gathering stops at the first special element (eg: close request)
+        buffers = self.pending.views(VECTOR_SIZE)
+
+        # in case there's not enough buffers for the vectored operation
+        # returns immediately, the single buffer strategy should be used
+        if len(buffers) < 2:
+            return False
+
+        try:
+            # tries to send the complete set of buffers through the socket
+            # and in case no data has been sent the socket is considered
+            # to be in a would-block situation and such an error is raised
+            count = self.socket.sendmsg(buffers)
+            if count == 0:
+                raise socket.error(errno.EWOULDBLOCK)
+        except:
+            # unsets the write ready flag and ensures that the write event
+            # is going to be triggered for the remaining pending data, then
+            # re-raises the exception to the upper layers for handling, note
+            # that the pending buffers are still in the buffer (not consumed)
+            self.wready = False
+            self.ensure_write()
+            raise
+
+        # decrements the size of the pending buffer by the number of
+        # bytes that were correctly sent through the socket
+        self.pending_s -= count
+        if self.owner:
+            self.owner.bytes_out_c += count
+
+        # removes the completely sent buffers from the pending buffer and
+        # in case the last one has been partially sent moves its offset
+        callbacks = self.pending.consume(count)
+
+        # triggers the unpend event and then calls the callbacks of the
+        # completely sent buffers, this is done after the update of the
+        # pending queue so that changes made by the callbacks are safe
+        self.trigger("unpend", self)
+        if self.wpaused and self.pending_s <= self.min_pending:
+            self._low_water()
+        for callback in callbacks:
+            if callback:
+                callback(self)
+
+        return True
+
+    def _send_view(self, data, address=None):
+        """
+        Tries to send the provided memory view directly through the
+        socket, avoiding any copy of its contents, returning the part
+        of the data that has not been sent (as a new bytes buffer).
+
+        The direct send is only performed when it's safe to do so, that
+        is from the event loop thread, for a write ready plain stream
+        connection that has no data pending to be sent (ordering).
+
+        :type data: memoryview
+        :param data: The memory view containing the data to be sent.
+        :type address: Tuple
+        :param address: The target address of the send operation.
+        :rtype: String
+        :return: The remaining (not sent) part of the data as a bytes
+        buffer, empty in case the data has been completely sent.
+        """
+
+        # retrieves the identifier of the current thread and uses it
+        # together with the state of the connection to determine if
+        # the data may be sent directly through the socket
+        cthread = threading.current_thread()
+        tid = cthread.ident or 0
+        is_direct = (
+            self.owner
+            and tid == self.owner.tid
+            and self.status == OPEN
+            and self.wready
+            and not self.pending
+            and not self.connecting
+            and not self.ssl
+            and not self.datagram
+            and not address
+        )
+
+        # in case the direct send is possible tries to send the data
+        # through the socket, any error is ignored as the data is then
+        # going to be handled by the regular (pending) flush operation
+        if is_direct:
+            try:
+                count = self.socket.send(data)
+            except socket.error:
+                count = 0
+            self.owner.bytes_out_c += count
+            data = data[count:]
+
+        # copies the remaining part of the data (if any) into a new buffer
+        # as the memory view is only valid for the current operation
+        return legacy.bytes(data) if data else b""
+
     def _recv(self, size):
         data = self._recv_restored(size)
         if data:
             return data
         if self.datagram:
             return self.socket.recvfrom(size)
-        else:
-            return self.socket.recv(size)
+        data = self.socket.recv(size)
+        if self.owner:
+            self.owner.bytes_in_c += len(data)
+        return data
+
+    def _recv_into(self, buffer):
+        data = self._recv_restored(len(buffer))
+        if data:
+            count = len(data)
+            buffer[:count] = data
+            return count
+        count = self.socket.recv_into(buffer)
+        if self.owner:
+            self.owner.bytes_in_c += count
+        return count
 
     def _recv_ssl(self, size):
         data = self._recv_restored(size)
@@ -936,19 +1588,22 @@ class BaseConnection(observer.Observable):
             return data
         has_socket = hasattr(self.socket, "_sock")
         if has_socket:
-            return self.socket._sock.recv(size)
+            data = self.socket._sock.recv(size)
         else:
-            return socket.socket.recv(self.socket, size)
+            data = socket.socket.recv(self.socket, size)
+        if self.owner:
+            self.owner.bytes_in_c += len(data)
+        return data
 
     def _recv_restored(self, size):
         if not self.restored_s:
             return b""
-        data = self.restored.pop()
-        data = data[:size]
-        remaining = data[size:]
+        self.restored_lock.acquire()
+        try:
+            data = self.restored.read(size)
+        finally:
+            self.restored_lock.release()
         self.restored_s -= len(data)
-        if remaining:
-            self.restore(remaining, back=False)
         return data
 
     def _shutdown(self, close=False, force=False, ignore=True):
@@ -984,6 +1639,38 @@ class BaseConnection(observer.Observable):
         if close:
             self.close()
 
+    def _high_water(self):
+        self.wpaused = True
+        for peer in self.linked:
+            peer.disable_read()
+        self.trigger("high_water", self)
+
+    def _low_water(self):
+        self.wpaused = False
+        for peer in self.linked:
+            self._resume(peer)
+        self.trigger("low_water", self)
+
+    def _resume(self, peer):
+        # in case the peer is not paused (or it's no longer open) there's
+        # nothing to be done, otherwise re-enables its reading and forces
+        # a read operation as there may be data waiting in the socket that
+        # won't trigger a new read event (edge based polling)
+        if not peer.status == OPEN:
+            return
+        if not peer.renable == False:
+            return
+        peer.enable_read()
+        if peer.owner:
+            peer.owner.reads((peer.socket,), state=False)
+
+    def _resolve_peer(self, peer):
+        # resolves the underlying connection of the peer in case a protocol
+        # (or a transport) has been provided instead of a connection
+        if isinstance(peer, BaseConnection):
+            return peer
+        return getattr(peer, "connection", None)
+
     def _close_callback(self, connection):
         """
         The callback to the delayed (flush-based) close operation
@@ -1040,6 +1727,16 @@ class BaseConnection(observer.Observable):
 
 class DiagConnection(BaseConnection):
 
+    __slots__ = (
+        "creation",
+        "recvs",
+        "sends",
+        "in_bytes",
+        "out_bytes",
+        "last_recv_ts",
+        "last_send_ts",
+    )
+
     def __init__(self, *args, **kwargs):
         BaseConnection.__init__(self, *args, **kwargs)
         self.creation = time.time()
@@ -1057,6 +1754,13 @@ class DiagConnection(BaseConnection):
         self.last_recv_ts = time.time()
         return result
 
+    def recv_into(self, *args, **kwargs):
+        result = BaseConnection.recv_into(self, *args, **kwargs)
+        self.in_bytes += len(result) if result else 0
+        self.recvs += 1
+        self.last_recv_ts = time.time()
+        return result
+
     def send(self, data, *args, **kwargs):
         result = BaseConnection.send(self, data, *args, **kwargs)
         self.out_bytes += result
@@ -1097,6 +1801,8 @@ class DiagConnection(BaseConnection):
 
 
 is_diag = config.conf("DIAG", False, cast=bool)
+is_vectored = config.conf("VECTORED", True, cast=bool)
+is_sendfile = hasattr(os, "sendfile")
 if is_diag:
     Connection = DiagConnection
 else:
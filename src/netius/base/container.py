@@ -111,14 +111,25 @@ class Container(Base):
 
             # runs the "owner" based version of the poll operation
             # so that the poll results are indexed by their owner
-            # reference to be easily routed to the base services
-            result = self.poll.poll_owner()
+            # reference to be easily routed to the base services, the
+            # operation blocks up until the nearest deadline of the bases
+            timeout = self.get_poll_timeout()
+            result = self.poll.poll_owner(timeout=timeout)
             for base, values in legacy.iteritems(result):
                 reads, writes, errors = values
                 base.reads(reads)
                 base.writes(writes)
                 base.errors(errors)
 
+    def get_poll_timeout(self, current=None):
+        current = current or time.time()
+        timeouts = [base.get_poll_timeout(current=current) for base in self.bases]
+        blocking = [timeout for timeout in timeouts if timeout < 0]
+        timeouts = [timeout for timeout in timeouts if timeout >= 0]
+        if not timeouts:
+            return -1 if blocking and self.npool else self.poll_timeout
+        return min(timeouts)
+
     def ticks(self):
         self.set_state(STATE_TICK)
         self._lid = (self._lid + 1) % 2147483647
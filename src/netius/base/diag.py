@@ -24,9 +24,13 @@
 Diagnostics application that exposes the internal state of a running
 Netius system over HTTP. Built as an Appier API app, it offers routes
 to inspect and change the logger level, dump the process environment
-and report system information and live connection details. Includes a
-JSON encoder that safely serializes byte values in the responses.
-Falls back to a mock Appier when the dependency is not installed.
+and report system information, the cluster wide metrics (aggregated
+from the shared memory of the forked workers), the event loop latency
+histograms (instrumentation) and live connection details, plus the
+starting and stopping of a sampling profiler of the event loop that
+returns collapsed (flamegraph ready) stacks. Includes a JSON encoder
+that safely serializes byte values in the responses. Falls back to a
+mock Appier when the dependency is not installed.
 """
 
 __author__ = "João Magalhães <joamag@hive.pt>"
@@ -40,6 +44,7 @@ __license__ = "Apache License, Version 2.0"
 
 import os
 import json
+import time
 import logging
 
 try:
@@ -94,6 +99,50 @@ class DiagApp(appier.APIApp):
         info = self.system.info_dict(full=full)
         return self.json(info, sort_keys=True, cls=DiagEncoder)
 
+    @appier.route("/cluster", "GET")
+    def cluster_info(self):
+        info = self.system.cluster_dict()
+        return self.json(info, sort_keys=True, cls=DiagEncoder)
+
+    @appier.route("/instrument", "GET")
+    def instrument_info(self):
+        info = self.system.instrument_dict()
+        return self.json(info, sort_keys=True, cls=DiagEncoder)
+
+    @appier.route("/instrument/set", ("GET", "POST"))
+    def set_instrument(self):
+        enabled = self.field("enabled", True, cast=bool)
+        reset = self.field("reset", False, cast=bool)
+        self.system.instrument = enabled
+        if reset:
+            self.system.reset_instrument()
+        return self.instrument_info()
+
+    @appier.route("/profile", "GET")
+    def show_profile(self):
+        info = self.system.profile_dict()
+        return self.json(info, sort_keys=True, cls=DiagEncoder)
+
+    @appier.route("/profile/start", ("GET", "POST"))
+    def start_profile(self):
+        interval = self.field("interval", None, cast=float)
+        self.system.start_profile(interval=interval)
+        return self.show_profile()
+
+    @appier.route("/profile/stop", ("GET", "POST"))
+    def stop_profile(self):
+        collapsed = self.system.stop_profile() or ""
+        self.content_type("text/plain")
+        return collapsed
+
+    @appier.route("/profile/sample", ("GET", "POST"))
+    def sample_profile(self):
+        duration = self.field("duration", 5.0, cast=float)
+        interval = self.field("interval", None, cast=float)
+        self.system.start_profile(interval=interval)
+        time.sleep(duration)
+        return self.stop_profile()
+
     @appier.route("/connections", "GET")
     def list_connections(self):
         full = self.field("full", True, cast=bool)
@@ -123,6 +123,18 @@ class WakeupError(RuntimeError):
     pass
 
 
+class ForkError(RuntimeError):
+    """
+    Error used to move the control flow of a newly forked
+    child process out of the supervision logic of the parent.
+
+    This error represent an operation and not a real
+    error and should be used as such.
+    """
+
+    pass
+
+
 class DataError(RuntimeError):
     """
     Error to be used for situations where the
@@ -0,0 +1,172 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+"""netius.base.idle
+
+Coarse grained idle (and keep-alive) timeout management for the
+connections of a server. Instead of a delayed call per connection
+(re-scheduled on each activity) connections are filed into buckets
+of a fixed resolution (eg: one second) and activity only updates an
+integer tick in the connection, the expired connections are then
+swept in bulk, once per tick, re-filing the ones that had activity.
+"""
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import math
+import time
+
+RESOLUTION = 1.0
+""" The default amount of time in seconds covered by each of the
+buckets, connections expire at most two of these periods after
+their timeout (the sweep and the touch are both coarse) """
+
+
+class IdleBuckets(object):
+    """
+    Set of time buckets holding the connections subject to an
+    idle timeout, indexed by the tick (time divided by resolution)
+    at which they are going to be verified for expiration.
+
+    The activity in a connection should be registered by setting
+    its `idle_t` attribute to the current `tick` value (touch),
+    which does not move the connection between buckets, that only
+    happens (lazily) when its bucket is swept.
+    """
+
+    def __init__(self, resolution=RESOLUTION):
+        self.resolution = resolution
+        self.count = 0
+        self.tick = self._tick(time.time())
+        self._cursor = self.tick
+        self._buckets = dict()
+
+    def add(self, connection, timeout):
+        """
+        Adds the provided connection to the buckets with the given
+        timeout, in case the connection is already registered it's
+        moved according to the new timeout (counted from now).
+
+        :type connection: Connection
+        :param connection: The connection to be registered.
+        :type timeout: float
+        :param timeout: The amount of time in seconds of inactivity
+        after which the connection is considered expired.
+        """
+
+        self.remove(connection)
+        span = int(math.ceil(timeout / self.resolution)) + 1
+        connection.idle_t = self.tick
+        connection.idle_s = span
+        self._file(connection, self.tick + span)
+        self.count += 1
+
+    def remove(self, connection):
+        target = connection.idle_b
+        if target == None:
+            return
+        connection.idle_b = None
+        self.count -= 1
+        bucket = self._buckets.get(target, None)
+        if not bucket:
+            return
+        bucket.discard(connection)
+        if bucket:
+            return
+        del self._buckets[target]
+
+    def touch(self, connection):
+        connection.idle_t = self.tick
+
+    def sweep(self, current=None):
+        """
+        Runs the sweep operation over the buckets whose tick has
+        already been reached, returning the connections that have
+        expired and re-filing the ones that had activity meanwhile.
+
+        :type current: float
+        :param current: The current timestamp to be used in the
+        sweep, if not provided the current time is used.
+        :rtype: List
+        :return: The sequence of connections that have expired (and
+        that have been removed from the buckets).
+        """
+
+        current = current or time.time()
+        self.tick = tick = self._tick(current)
+
+        # determines the sequence of ticks to be visited, that is usually
+        # just the last one (or two) except when the loop has been blocked
+        # for a long time or the clock jumped (the existing ones are used)
+        if tick - self._cursor > len(self._buckets):
+            targets = sorted(target for target in self._buckets if target <= tick)
+        else:
+            targets = range(self._cursor, tick + 1)
+        self._cursor = tick + 1
+
+        expired = []
+        for target in targets:
+            bucket = self._buckets.pop(target, None)
+            if not bucket:
+                continue
+            for connection in bucket:
+                deadline = connection.idle_t + connection.idle_s
+                if deadline <= tick:
+                    connection.idle_b = None
+                    expired.append(connection)
+                else:
+                    self._file(connection, deadline)
+
+        self.count -= len(expired)
+        return expired
+
+    def clear(self):
+        for bucket in self._buckets.values():
+            for connection in bucket:
+                connection.idle_b = None
+        self._buckets.clear()
+        self.count = 0
+
+    def info_dict(self):
+        return dict(
+            resolution=self.resolution,
+            tick=self.tick,
+            buckets=len(self._buckets),
+            count=self.count,
+        )
+
+    def _file(self, connection, target):
+        bucket = self._buckets.get(target, None)
+        if bucket == None:
+            bucket = set()
+            self._buckets[target] = bucket
+        bucket.add(connection)
+        connection.idle_b = target
+
+    def _tick(self, current):
+        return int(current / self.resolution)
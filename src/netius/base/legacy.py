@@ -369,6 +369,8 @@ def chri(value):
 
 
 def bytes(value, encoding="latin-1", errors="strict", force=False):
+    if type(value) == memoryview:
+        return value.tobytes()
     if not PYTHON_3 and not force:
         return value
     if value == None:
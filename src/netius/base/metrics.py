@@ -0,0 +1,289 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+"""netius.base.metrics
+
+Shared memory metrics structures for pre-fork (multi process) setups.
+Defines the SharedMetrics region, an anonymous `mmap` created by the
+parent process before forking, split into fixed size slots (one per
+child) where each of the children writes its own counters (requests,
+bytes in and out, active connections and loop lag) without any locking,
+using a sequence number per slot so that readers (the parent or the
+diagnostics of any child) never observe a torn write.
+
+Also defines the Histogram structure, a fixed (logarithmic) bucket
+histogram used by the event loop instrumentation to record durations
+(eg: loop iterations, poll wait and callback execution) cheaply.
+"""
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import time
+import mmap
+import bisect
+import struct
+
+SEQUENCE = struct.Struct("<Q")
+""" The structure of the sequence number placed at the start
+of each slot, odd values mean that a write is in progress """
+
+VALUES = struct.Struct("<QdQQQQd")
+""" The structure of the values of each slot, in the order
+pid, timestamp, requests, bytes in, bytes out, connections
+and loop lag (in seconds) """
+
+SLOT_SIZE = 64
+""" The size in bytes of each of the slots, matches the size
+of a cache line so that writes of different children never
+share the same line (avoids false sharing) """
+
+RETRIES = 16
+""" The maximum number of attempts to read a consistent version
+of a slot, before giving up on it (concurrent writes) """
+
+BUCKETS = tuple(0.00001 * 2**index for index in range(21))
+""" The upper bounds (in seconds) of the buckets of the histogram,
+growing exponentially from 10 microseconds up to ~10 seconds, any
+value above the last bound is stored in an extra (overflow) bucket """
+
+
+class SharedMetrics(object):
+    """
+    Shared memory region with a fixed number of slots, in which
+    each of the (forked) worker processes writes its own metrics
+    so that a cluster wide view may be computed by any process.
+
+    The region must be created before the fork operation so that
+    the anonymous mapping is shared between parent and children,
+    writes are lock free as each slot has a single writer.
+    """
+
+    def __init__(self, slots):
+        self.slots = slots
+        self.mmap = mmap.mmap(-1, slots * SLOT_SIZE)
+
+    def close(self):
+        self.mmap.close()
+
+    def write(
+        self, slot, pid, requests=0, bytes_in=0, bytes_out=0, connections=0, lag=0.0
+    ):
+        """
+        Writes the provided values to the requested slot, marking
+        the slot's sequence as odd while the write is in progress
+        so that concurrent readers are able to retry the read.
+
+        Must only be called by the (single) owner of the slot.
+
+        :type slot: int
+        :param slot: The index of the slot that is going to be written.
+        :type pid: int
+        :param pid: The PID of the process that owns the slot.
+        :type requests: int
+        :param requests: The total number of requests handled.
+        :type bytes_in: int
+        :param bytes_in: The total number of bytes received.
+        :type bytes_out: int
+        :param bytes_out: The total number of bytes sent.
+        :type connections: int
+        :param connections: The number of currently active connections.
+        :type lag: float
+        :param lag: The latest event loop lag measured (in seconds).
+        """
+
+        offset = slot * SLOT_SIZE
+        sequence = SEQUENCE.unpack_from(self.mmap, offset)[0]
+        SEQUENCE.pack_into(self.mmap, offset, sequence + 1)
+        VALUES.pack_into(
+            self.mmap,
+            offset + SEQUENCE.size,
+            pid,
+            time.time(),
+            requests,
+            bytes_in,
+            bytes_out,
+            connections,
+            lag,
+        )
+        SEQUENCE.pack_into(self.mmap, offset, sequence + 2)
+
+    def read(self, slot):
+        """
+        Reads a consistent version of the values of the provided
+        slot, retrying in case a write is (or was) in progress.
+
+        :type slot: int
+        :param slot: The index of the slot that is going to be read.
+        :rtype: Dictionary
+        :return: The map with the values of the slot or an invalid
+        value in case the slot has never been written (or in case no
+        consistent read was possible).
+        """
+
+        offset = slot * SLOT_SIZE
+        for _index in range(RETRIES):
+            before = SEQUENCE.unpack_from(self.mmap, offset)[0]
+            if before % 2:
+                continue
+            values = VALUES.unpack_from(self.mmap, offset + SEQUENCE.size)
+            after = SEQUENCE.unpack_from(self.mmap, offset)[0]
+            if before == after:
+                break
+        else:
+            return None
+
+        pid, timestamp, requests, bytes_in, bytes_out, connections, lag = values
+        if not pid:
+            return None
+        return dict(
+            slot=slot,
+            pid=pid,
+            timestamp=timestamp,
+            requests=requests,
+            bytes_in=bytes_in,
+            bytes_out=bytes_out,
+            connections=connections,
+            lag=lag,
+        )
+
+    def release(self, slot):
+        """
+        Releases the provided slot after its owner has exited, the
+        cumulative counters are kept (so that the cluster totals are
+        monotonic) but the live values (connections and lag) are reset.
+
+        :type slot: int
+        :param slot: The index of the slot that is going to be released.
+        """
+
+        values = self.read(slot)
+        if not values:
+            return
+        self.write(
+            slot,
+            values["pid"],
+            requests=values["requests"],
+            bytes_in=values["bytes_in"],
+            bytes_out=values["bytes_out"],
+        )
+
+    def aggregate(self):
+        """
+        Computes the cluster wide view of the metrics by summing the
+        values of the complete set of (written) slots, the loop lag
+        is aggregated as the maximum value across the workers.
+
+        :rtype: Dictionary
+        :return: The map containing the totals of the cluster and the
+        per worker values (under the workers key).
+        """
+
+        workers = [self.read(slot) for slot in range(self.slots)]
+        workers = [worker for worker in workers if worker]
+        return dict(
+            requests=sum(worker["requests"] for worker in workers),
+            bytes_in=sum(worker["bytes_in"] for worker in workers),
+            bytes_out=sum(worker["bytes_out"] for worker in workers),
+            connections=sum(worker["connections"] for worker in workers),
+            lag=max([worker["lag"] for worker in workers] or [0.0]),
+            workers=workers,
+        )
+
+
+class Histogram(object):
+    """
+    Fixed bucket histogram of durations (in seconds), the buckets
+    grow exponentially so that both microsecond and multi second
+    values are represented with the same (relative) precision.
+
+    Adding a value is a binary search on the (small) set of bounds
+    plus a couple of integer increments, cheap enough to be used
+    for every iteration of the event loop.
+    """
+
+    def __init__(self, bounds=BUCKETS):
+        self.bounds = bounds
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percentile):
+        """
+        Estimates the value for the provided percentile, as the upper
+        bound of the bucket where the percentile falls (overestimate),
+        for the overflow bucket the maximum value is returned instead.
+
+        :type percentile: float
+        :param percentile: The percentile (from 0.0 to 100.0) that is
+        going to be estimated.
+        :rtype: float
+        :return: The estimated value (in seconds) for the percentile.
+        """
+
+        if not self.count:
+            return 0.0
+        target = self.count * percentile / 100.0
+        accumulated = 0
+        for index, count in enumerate(self.counts):
+            accumulated += count
+            if accumulated < target:
+                continue
+            if index == len(self.bounds):
+                break
+            return min(self.bounds[index], self.max)
+        return self.max
+
+    def to_dict(self):
+        buckets = dict(
+            ("%.5f" % bound, count)
+            for bound, count in zip(self.bounds, self.counts)
+            if count
+        )
+        if self.counts[-1]:
+            buckets["+inf"] = self.counts[-1]
+        return dict(
+            count=self.count,
+            total=self.total,
+            mean=self.total / self.count if self.count else 0.0,
+            max=self.max,
+            p50=self.percentile(50.0),
+            p90=self.percentile(90.0),
+            p99=self.percentile(99.0),
+            buckets=buckets,
+        )
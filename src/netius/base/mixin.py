@@ -138,6 +138,31 @@ class ConnectionCompat(object):
             return
         connection.enable_read()
 
+    def set_watermarks(self, high, low=None):
+        connection = self.connection
+        if not connection:
+            return
+        connection.set_watermarks(high, low=low)
+
+    def link(self, peer, mutual=True):
+        connection = self.connection
+        if not connection:
+            return
+        connection.link(peer, mutual=mutual)
+
+    def unlink(self, peer, mutual=True):
+        connection = self.connection
+        if not connection:
+            return
+        connection.unlink(peer, mutual=mutual)
+
+    @property
+    def linked(self):
+        connection = self.connection
+        if not connection:
+            return ()
+        return connection.linked
+
     @property
     def max_pending(self):
         connection = self.connection
@@ -49,8 +49,15 @@ class Observable(object):
     and should avoid variable naming collision.
     """
 
+    __slots__ = ("events", "_dispatch", "__dict__", "__weakref__")
+    """ The compact (slot based) layout of the observable, the
+    dictionary slot makes it possible for both the sub classes
+    and the users to set ad-hoc attributes, the dictionary is
+    only created on the first assignment of one of them """
+
     def __init__(self, *args, **kwargs):
         self.events = {}
+        self._dispatch = {}
 
     def build(self):
         pass
@@ -64,6 +71,7 @@ class Observable(object):
         methods = self.events.get(name, [])
         methods.append(method)
         self.events[name] = methods
+        self._compile(name)
 
     def unbind(self, name, method=None):
         methods = self.events.get(name, None)
@@ -73,6 +81,7 @@ class Observable(object):
             methods.remove(method)
         else:
             del methods[:]
+        self._compile(name)
 
     def unbind_all(self):
         if not hasattr(self, "events"):
@@ -80,17 +89,37 @@ class Observable(object):
         for methods in self.events.values():
             del methods[:]
         self.events.clear()
+        self._dispatch.clear()
+
+    def has_listeners(self, name):
+        """
+        Cheap verification of the existence of listeners for the
+        event with the provided name, to be used by the callers
+        before building (possibly expensive) event arguments.
+
+        :type name: String
+        :param name: The name of the event to be verified.
+        :rtype: bool
+        :return: If there's at least one listener for the event.
+        """
+
+        return name in self._dispatch
 
     def trigger(self, name, *args, **kwargs):
-        methods = self.events.get(name, None)
-        if not methods:
+        # retrieves the precomputed dispatch entry for the event, that
+        # is either the single (non oneshot) handler, to be called
+        # directly, or the list of handlers for the general case
+        handler = self._dispatch.get(name, None)
+        if handler == None:
+            return
+        if not handler.__class__ == list:
+            handler(*args, **kwargs)
             return
+
         oneshots = None
-        for method in methods:
+        for method in handler:
             method(*args, **kwargs)
-            if not hasattr(method, "oneshot"):
-                continue
-            if not method.oneshot:
+            if not getattr(method, "oneshot", False):
                 continue
             oneshots = [] if oneshots == None else oneshots
             oneshots.append(method)
@@ -98,3 +127,16 @@ class Observable(object):
             return
         for oneshot in oneshots:
             self.unbind(name, oneshot)
+
+    def _compile(self, name):
+        # re-computes the dispatch entry for the event after a change in
+        # its handlers, where no handlers means no entry, a single (non
+        # oneshot) one is stored directly and the list of handlers is
+        # stored otherwise (live list, changes during trigger are visible)
+        methods = self.events.get(name, None)
+        if not methods:
+            self._dispatch.pop(name, None)
+        elif len(methods) == 1 and not getattr(methods[0], "oneshot", False):
+            self._dispatch[name] = methods[0]
+        else:
+            self._dispatch[name] = methods
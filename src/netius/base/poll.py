@@ -46,6 +46,11 @@ POLL_TIMEOUT = 0.25
 this should be considered the maximum amount of time a
 thread waits for a poll request """
 
+EPOLLEXCLUSIVE = getattr(select, "EPOLLEXCLUSIVE", 0)
+""" The exclusive wakeup flag for the epoll registration of a
+socket (Linux 4.5+), zero in case it's not available meaning that
+the registration is going to be performed without it """
+
 
 class Poll(object):
     """
@@ -91,11 +96,24 @@ class Poll(object):
         self.write_o.clear()
         self.error_o.clear()
 
-    def poll(self):
+    def poll(self, timeout=None):
+        """
+        Runs the polling operation blocking for the provided amount
+        of time (in seconds) or until at least one event is ready.
+
+        :type timeout: float
+        :param timeout: The maximum amount of time to block for, in
+        case it's not provided the timeout defined at open time is used
+        and a negative value implies blocking indefinitely.
+        :rtype: Tuple
+        :return: The tuple containing the sequences of sockets ready
+        for read, write and that are in error.
+        """
+
         return ([], [], [])
 
-    def poll_owner(self):
-        reads, writes, errors = self.poll()
+    def poll_owner(self, timeout=None):
+        reads, writes, errors = self.poll(timeout=timeout)
 
         result = dict()
 
@@ -139,6 +157,27 @@ class Poll(object):
         self.sub_write(socket, owner=owner)
         self.sub_error(socket, owner=owner)
 
+    def sub_service(self, socket, owner=None, exclusive=False):
+        """
+        Subscribes the provided service (listening) socket for all of
+        the operations, so that new connections may be accepted.
+
+        The exclusive flag requests that only one of the waiters on
+        a shared (eg: forked) listening socket is awaken for each of
+        the incoming connections, for poll implementations that do not
+        support such mechanism this is the same as `sub_all()`.
+
+        :type socket: Socket
+        :param socket: The service socket to be subscribed.
+        :type owner: Base
+        :param owner: The owner (event loop) of the socket.
+        :type exclusive: bool
+        :param exclusive: If the exclusive wakeup mode should be used
+        for the socket (avoids the thundering herd on accept).
+        """
+
+        self.sub_all(socket, owner=owner)
+
     def unsub_all(self, socket):
         self.unsub_error(socket)
         self.unsub_write(socket)
@@ -224,10 +263,11 @@ class EpollPoll(Poll):
         self.write_o.clear()
         self.error_o.clear()
 
-    def poll(self):
+    def poll(self, timeout=None):
         result = ([], [], [])
 
-        events = self.epoll.poll(self.timeout)
+        timeout = self.timeout if timeout == None else timeout
+        events = self.epoll.poll(timeout)
         for fd, event in events:
             if event & select.EPOLLIN:  # @UndefinedVariable pylint: disable=E1101
                 socket = self.fd_m.get(fd, None)
@@ -263,6 +303,31 @@ class EpollPoll(Poll):
             | select.EPOLLET,  # @UndefinedVariable pylint: disable=E1101
         )
 
+    def sub_service(self, socket, owner=None, exclusive=False):
+        # in case the exclusive mode is not requested the default
+        # (edge triggered) subscription is used for the socket
+        if not exclusive:
+            return self.sub_all(socket, owner=owner)
+
+        # otherwise the socket is registered under the level triggered
+        # mode with the exclusive flag (when available), so that only one
+        # of the waiting processes is awaken for each new connection and
+        # any connection not accepted by it is going to be reported again
+        if socket in self.read_o:
+            return
+        socket_fd = socket.fileno()
+        self.fd_m[socket_fd] = socket
+        self.read_o[socket] = owner
+        self.write_o[socket] = owner
+        self.error_o[socket] = owner
+        self.epoll.register(  # @UndefinedVariable pylint: disable=E1101
+            socket_fd,
+            select.EPOLLIN
+            | select.EPOLLERR
+            | select.EPOLLHUP
+            | EPOLLEXCLUSIVE,  # @UndefinedVariable pylint: disable=E1101
+        )
+
     def sub_write(self, socket, owner=None):
         pass
 
@@ -326,10 +391,13 @@ class KqueuePoll(Poll):
         self.write_o.clear()
         self.error_o.clear()
 
-    def poll(self):
+    def poll(self, timeout=None):
         result = ([], [], [])
 
-        events = self.kqueue.control(None, 32, self.timeout)
+        timeout = self.timeout if timeout == None else timeout
+        if timeout != None and timeout < 0:
+            timeout = None
+        events = self.kqueue.control(None, 32, timeout)
         for event in events:
             if (
                 event.flags & select.KQ_EV_ERROR
@@ -458,10 +526,11 @@ class PollPoll(Poll):
         self.write_o.clear()
         self.error_o.clear()
 
-    def poll(self):
+    def poll(self, timeout=None):
         result = ([], [], [])
 
-        events = self._poll.poll(self.timeout * 1000)
+        timeout = self.timeout if timeout == None else timeout
+        events = self._poll.poll(timeout * 1000)
         for fd, event in events:
             if event & select.POLLIN:  # @UndefinedVariable pylint: disable=E1101
                 socket = self.read_fd.get(fd, None)
@@ -569,11 +638,17 @@ class SelectPoll(Poll):
         self.write_o.clear()
         self.error_o.clear()
 
-    def poll(self):
-        # "calculates" the amount of time the select method is going
-        # to be sleeping for empty polls based on the fact that the
-        # current timeout value may be unset
-        sleep_timeout = self.timeout or POLL_TIMEOUT
+    def poll(self, timeout=None):
+        # determines the timeout to be used in the current selection
+        # defaulting to the one provided on open, and "calculates" the
+        # amount of time the select method is going to be sleeping for
+        # empty polls based on the fact that the timeout may be unset
+        if timeout == None:
+            timeout = self.timeout
+            sleep_timeout = self.timeout or POLL_TIMEOUT
+        else:
+            timeout = None if timeout < 0 else timeout
+            sleep_timeout = POLL_TIMEOUT if timeout == None else timeout
 
         # verifies if the current selection list is empty
         # in case it's sleeps for a while and then continues
@@ -586,7 +661,7 @@ class SelectPoll(Poll):
         # runs the proper select statement waiting for the desired
         # amount of time as timeout at the end a tuple with three
         # list for the different operations should be returned
-        return select.select(self.read_l, self.write_l, self.error_l, self.timeout)
+        return select.select(self.read_l, self.write_l, self.error_l, timeout)
 
     def is_edge(self):
         return False
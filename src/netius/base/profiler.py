@@ -0,0 +1,165 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+"""netius.base.profiler
+
+Low overhead sampling profiler for a running event loop. Defines the
+SamplingProfiler, that uses a helper (daemon) thread to periodically
+snapshot the stack of the event loop thread (`sys._current_frames()`)
+and aggregates the snapshots as collapsed stacks, the format consumed
+by flamegraph tools (one `frame;frame;frame count` line per stack).
+No tracing hooks are installed so the profiled thread runs unchanged.
+"""
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import os
+import sys
+import time
+import threading
+
+from . import legacy
+
+INTERVAL = 0.005
+""" The default amount of time (in seconds) in between each of
+the stack samples, lower values increase both the precision
+and the overhead of the profiling """
+
+DEPTH = 128
+""" The maximum number of frames (from the top of the stack)
+that are going to be considered for each of the samples """
+
+
+class SamplingProfiler(object):
+    """
+    Sampling profiler that periodically captures the stack of the
+    target thread from a helper thread, counting the number of times
+    each (collapsed) stack has been observed.
+
+    As the samples are taken from a different thread the profiled
+    thread is not instrumented in any way, the only cost is the
+    holding of the GIL while the stack is walked by the helper.
+    """
+
+    def __init__(self, tid, interval=INTERVAL, depth=DEPTH):
+        self.tid = tid
+        self.interval = interval
+        self.depth = depth
+        self.stacks = {}
+        self.samples = 0
+        self.start_time = None
+        self.end_time = None
+        self._names = {}
+        self._thread = None
+        self._running = False
+
+    @property
+    def running(self):
+        return self._running
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self.start_time = time.time()
+        self.end_time = None
+        self._thread = threading.Thread(target=self._run, name="SamplingProfiler")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, join=True):
+        if not self._running:
+            return
+        self._running = False
+        self.end_time = time.time()
+        if not join:
+            return
+        if self._thread == threading.current_thread():
+            return
+        self._thread.join(self.interval * 10.0 + 1.0)
+
+    def sample(self):
+        """
+        Takes a single sample of the stack of the target thread, in
+        case the thread is not running (no frame) nothing is done.
+        """
+
+        frame = sys._current_frames().get(self.tid, None)
+        if frame == None:
+            return
+        stack = []
+        while frame and len(stack) < self.depth:
+            stack.append(self._name(frame.f_code))
+            frame = frame.f_back
+        stack.reverse()
+        key = ";".join(stack)
+        self.stacks[key] = self.stacks.get(key, 0) + 1
+        self.samples += 1
+
+    def collapsed(self):
+        """
+        Builds the collapsed stacks representation of the samples,
+        one line per stack (root frame first) followed by the number
+        of samples, sorted from the most to the least frequent one.
+
+        :rtype: String
+        :return: The collapsed stacks, ready to be used as the input
+        of flamegraph tools (eg: `flamegraph.pl`, speedscope).
+        """
+
+        items = list(legacy.iteritems(self.stacks))
+        items.sort(key=lambda item: item[1], reverse=True)
+        return "\n".join("%s %d" % item for item in items)
+
+    def to_dict(self):
+        end_time = self.end_time or time.time()
+        return dict(
+            running=self._running,
+            interval=self.interval,
+            samples=self.samples,
+            stacks=len(self.stacks),
+            duration=end_time - self.start_time if self.start_time else 0.0,
+        )
+
+    def _run(self):
+        while self._running:
+            self.sample()
+            time.sleep(self.interval)
+
+    def _name(self, code):
+        name = self._names.get(code, None)
+        if name:
+            return name
+        name = "%s (%s:%d)" % (
+            code.co_name,
+            os.path.basename(code.co_filename),
+            code.co_firstlineno,
+        )
+        name = name.replace(";", ":")
+        self._names[code] = name
+        return name
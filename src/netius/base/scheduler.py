@@ -0,0 +1,545 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+"""netius.base.scheduler
+
+Delayed call scheduling structures that back the event loop `delay()`
+operation. Defines an abstract Scheduler interface for pushing, popping
+and cancelling delayed callable tuples and two concrete back-ends: the
+HeapScheduler, a binary heap ordered by target time (the historical
+behavior) and the WheelScheduler, a hierarchical timing wheel with
+constant time insertion and real cancellation, better suited for very
+large numbers of pending timers (eg: keep-alive and receive timeouts).
+"""
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import time
+import heapq
+import collections
+
+from . import legacy
+from . import errors
+
+WHEEL_RESOLUTION = 0.01
+""" The amount of time in seconds represented by each tick
+(slot) of the lowest level of the timing wheel, delayed calls
+may be executed at most this amount of time after their target """
+
+WHEEL_SLOTS = 64
+""" The number of slots in each of the levels of the timing
+wheel, each level covers this many slots of the level below """
+
+WHEEL_LEVELS = 4
+""" The number of levels (wheels) in the hierarchy, together
+with the slots and resolution it defines the largest timeout
+that is stored without re-cascading (~46 hours by default) """
+
+IMMEDIATE = -1
+""" Location marker for entries stored in the immediate (target
+equal to minus one) queue of the timing wheel """
+
+NEXT = -2
+""" Location marker for entries stored in the next tick (target
+equal to zero) queue of the timing wheel """
+
+EXPIRED = -3
+""" Location marker for entries that have already been moved
+out of the wheel into the expired (ready to run) heap """
+
+
+class Scheduler(object):
+    """
+    The top level abstract implementation of a scheduler
+    object, to be used for inheritance and as reference for
+    the methods that are part of the API.
+
+    The elements handled by a scheduler are the callable tuples
+    created by the event loop, in the form of (target, delay id,
+    callable, loop id, options) where the target is either -1
+    (immediate), 0 (next tick) or an absolute timestamp.
+    """
+
+    @classmethod
+    def name(cls):
+        name = cls.__name__
+        name = name[:-9]
+        name = name.lower()
+        return name
+
+    @classmethod
+    def test(cls):
+        return True
+
+    def __len__(self):
+        raise errors.NotImplemented("Missing implementation")
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __nonzero__(self):
+        return self.__bool__()
+
+    def push(self, callable_t):
+        raise errors.NotImplemented("Missing implementation")
+
+    def pop(self, current):
+        """
+        Retrieves (and removes) the next callable tuple that is
+        ready to be executed at the provided timestamp, respecting
+        the target based ordering of the scheduled elements.
+
+        :type current: float
+        :param current: The current timestamp to be used in the
+        comparison against the target of the scheduled elements.
+        :rtype: Tuple
+        :return: The next callable tuple ready for execution or
+        an invalid value in case there's none ready.
+        """
+
+        raise errors.NotImplemented("Missing implementation")
+
+    def deadline(self):
+        """
+        Retrieves the target timestamp of the next scheduled element
+        so that the event loop is able to determine how long it may
+        block waiting for events without delaying any execution.
+
+        The returned value may be a lower bound of the real target
+        (the caller is then awaken sooner than required) but it must
+        never be greater than the moment at which the element is ready
+        to be popped (the target rounded up to the resolution of the
+        scheduler, if any).
+
+        :rtype: float
+        :return: The target timestamp of the next element, a zero or
+        negative value in case an element is ready for execution and
+        an invalid value in case there's nothing scheduled.
+        """
+
+        raise errors.NotImplemented("Missing implementation")
+
+    def cancel(self, callable_t):
+        raise errors.NotImplemented("Missing implementation")
+
+    def contains(self, target, callable):
+        raise errors.NotImplemented("Missing implementation")
+
+    def items(self):
+        raise errors.NotImplemented("Missing implementation")
+
+    def clear(self):
+        raise errors.NotImplemented("Missing implementation")
+
+
+class HeapScheduler(Scheduler):
+    """
+    Scheduler implementation based on a binary heap ordered by
+    the target time of the callable tuples.
+
+    Insertion and removal are logarithmic and cancellation is
+    lazy, meaning that canceled elements remain in the heap
+    until they are popped (and then ignored).
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._heap_o = []
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, callable_t):
+        target, _did, callable, _lid, _options = callable_t
+        callable_o = legacy.orderable((target, callable))
+        heapq.heappush(self._heap, callable_t)
+        heapq.heappush(self._heap_o, callable_o)
+
+    def pop(self, current):
+        # in case there's no elements in the heap there's nothing
+        # that can be popped, returns an invalid value immediately
+        if not self._heap:
+            return None
+
+        # defines the proper target value that is going to be used
+        # for the comparison against the current time reference
+        # this is performed by defaulting the value against negative
+        # ensuring immediate execution of the associated callable
+        target = self._heap[0][0]
+        if target == None:
+            target = -1
+
+        # tests if the target of the top element is valid (less than
+        # or equals to the current time value) and in case it's not
+        # there's nothing ready to be popped (heap is ordered)
+        if target > current:
+            return None
+
+        # "pops" both the callable tuple and the associated original
+        # (verification) tuple from the heaps, returning the first one
+        callable_t = heapq.heappop(self._heap)
+        heapq.heappop(self._heap_o)
+        return callable_t
+
+    def deadline(self):
+        if not self._heap:
+            return None
+        target = self._heap[0][0]
+        if target == None:
+            target = -1
+        return target
+
+    def cancel(self, callable_t):
+        options = callable_t[4]
+        options[0] = False
+
+    def contains(self, target, callable):
+        callable_o = legacy.orderable((target, callable))
+        return callable_o in self._heap_o
+
+    def items(self):
+        return list(self._heap)
+
+    def clear(self):
+        del self._heap[:]
+        del self._heap_o[:]
+
+
+class WheelScheduler(Scheduler):
+    """
+    Hierarchical timing wheel scheduler, where each timed element
+    is stored in a slot of one of several wheels according to how
+    far in the future its target is, lower levels having a finer
+    granularity (one tick per slot) and upper levels a coarser one.
+
+    As time advances the slots of the upper levels are cascaded
+    into the lower ones and the lowest level slots are expired into
+    a small heap, so that execution order among ready elements is
+    still exact. Immediate (target -1) and next tick (target 0)
+    elements are kept in insertion ordered queues.
+
+    Insertion and cancellation are constant time operations and
+    cancellation effectively removes the element from the wheel.
+    """
+
+    def __init__(
+        self, resolution=WHEEL_RESOLUTION, slots=WHEEL_SLOTS, levels=WHEEL_LEVELS
+    ):
+        self.resolution = resolution
+        self.slots = slots
+        self.levels = levels
+        self._tick = int(time.time() / resolution)
+        self._wheels = [[dict() for _index in range(slots)] for _level in range(levels)]
+        self._counts = [0] * levels
+        self._spans = [slots**level for level in range(levels)]
+        self._horizon = slots**levels
+        self._immediate = collections.OrderedDict()
+        self._next = collections.OrderedDict()
+        self._expired = []
+        self._locations = dict()
+        self._verify = dict()
+        self._timed = 0
+
+    def __len__(self):
+        return len(self._locations)
+
+    def push(self, callable_t):
+        target, did, callable, _lid, _options = callable_t
+
+        # in case there's no element scheduled any remaining element
+        # in the expired heap is a canceled one and may be discarded,
+        # this avoids collisions as delay identifiers may be reset
+        if not self._locations and self._expired:
+            del self._expired[:]
+
+        # registers the target and callable pair in the verification
+        # map so that duplicated insertions may be detected in constant
+        # time, non hashable callables are not considered for it
+        self._verify_add(target, callable)
+
+        # immediate and next tick elements are not stored in the
+        # wheel but rather in their own insertion ordered queues
+        # so that their relative (fifo) order is kept
+        if target == None or target < 0:
+            self._immediate[did] = callable_t
+            self._locations[did] = IMMEDIATE
+            return
+        if target == 0:
+            self._next[did] = callable_t
+            self._locations[did] = NEXT
+            return
+
+        # calculates the tick at which the element expires, rounding
+        # it up so that no element is ever executed before its target
+        # and then places it in the proper wheel level and slot
+        expiry = int(-(-target // self.resolution))
+        self._place(did, expiry, callable_t)
+
+    def pop(self, current):
+        # the immediate and the next tick queues have the highest
+        # priority as their targets are smaller than any timestamp
+        if self._immediate:
+            did, callable_t = self._immediate.popitem(last=False)
+            return self._release(did, callable_t)
+        if self._next:
+            did, callable_t = self._next.popitem(last=False)
+            return self._release(did, callable_t)
+
+        # advances the wheel up until the current tick, so that the
+        # complete set of elements whose target is in the past are
+        # moved into the expired heap (exact target ordering)
+        tick = int(current / self.resolution)
+        if tick > self._tick:
+            self._advance(tick)
+
+        # pops the expired elements by target order, skipping the
+        # ones that have been canceled in the meantime
+        while self._expired:
+            callable_t = heapq.heappop(self._expired)
+            did = callable_t[1]
+            if not self._locations.get(did, None) == EXPIRED:
+                continue
+            return self._release(did, callable_t)
+
+        # no element is ready to be executed at the provided time,
+        # returns an invalid value to the caller method
+        return None
+
+    def deadline(self):
+        # the immediate and next tick elements are meant to be executed
+        # on the next iteration so their targets are returned directly
+        if self._immediate:
+            return -1
+        if self._next:
+            return 0
+
+        # discards the canceled elements from the top of the expired
+        # heap and in case there's a valid one its target is returned
+        while self._expired:
+            callable_t = self._expired[0]
+            if self._locations.get(callable_t[1], None) == EXPIRED:
+                return callable_t[0]
+            heapq.heappop(self._expired)
+
+        # in case there are no timed elements in the wheel there's
+        # nothing scheduled and an invalid value is returned
+        if not self._timed:
+            return None
+
+        # iterates over the non empty levels of the wheel to find the
+        # nearest tick at which one of their slots is going to be turned,
+        # this is exact for the lowest level and a lower bound for the
+        # upper ones (tick at which they're cascaded)
+        tick = None
+        for level in range(self.levels):
+            if not self._counts[level]:
+                continue
+            wheel = self._wheels[level]
+            span = self._spans[level]
+            base = self._tick // span
+            for offset in range(1, self.slots + 1):
+                if wheel[(base + offset) % self.slots]:
+                    break
+            _tick = (base + offset) * span
+            tick = _tick if tick == None else min(tick, _tick)
+
+        return tick * self.resolution
+
+    def cancel(self, callable_t):
+        target, did, callable, _lid, options = callable_t
+
+        # marks the callable as not meant to be run, so that any
+        # other reference to it will ignore its execution
+        options[0] = False
+
+        # retrieves the current location of the element and in
+        # case it's no longer scheduled returns immediately
+        location = self._locations.get(did, None)
+        if location == None:
+            return
+
+        # removes the element from the proper structure according
+        # to its location, note that expired elements are only
+        # removed from the locations map (lazy heap removal)
+        if location == IMMEDIATE:
+            current = self._immediate.get(did, None)
+            if not current is callable_t:
+                return
+            del self._immediate[did]
+        elif location == NEXT:
+            current = self._next.get(did, None)
+            if not current is callable_t:
+                return
+            del self._next[did]
+        elif location == EXPIRED:
+            pass
+        else:
+            level, index = location
+            slot = self._wheels[level][index]
+            current = slot.get(did, None)
+            if not current or not current[1] is callable_t:
+                return
+            del slot[did]
+            self._counts[level] -= 1
+            self._timed -= 1
+
+        del self._locations[did]
+        self._verify_remove(target, callable)
+
+    def contains(self, target, callable):
+        try:
+            return (target, callable) in self._verify
+        except TypeError:
+            return False
+
+    def items(self):
+        items = list(self._immediate.values()) + list(self._next.values())
+        for wheel in self._wheels:
+            for slot in wheel:
+                items.extend(callable_t for _expiry, callable_t in slot.values())
+        items.extend(
+            callable_t
+            for callable_t in self._expired
+            if self._locations.get(callable_t[1], None) == EXPIRED
+        )
+        return items
+
+    def clear(self):
+        for wheel in self._wheels:
+            for slot in wheel:
+                slot.clear()
+        self._counts = [0] * self.levels
+        self._immediate.clear()
+        self._next.clear()
+        del self._expired[:]
+        self._locations.clear()
+        self._verify.clear()
+        self._timed = 0
+
+    def _place(self, did, expiry, callable_t):
+        # in case the element has already expired (the wheel has
+        # already passed its tick) it's moved directly to the heap
+        # of expired elements so that it's executed as soon as possible
+        delta = expiry - self._tick
+        if delta <= 0:
+            heapq.heappush(self._expired, callable_t)
+            self._locations[did] = EXPIRED
+            return
+
+        # determines the level of the wheel that is going to hold
+        # the element, the one whose range covers the delta, note
+        # that elements beyond the horizon are placed at the top level
+        # and are going to be re-cascaded once they are reached
+        level = 0
+        while level < self.levels - 1 and delta >= self._spans[level + 1]:
+            level += 1
+        slot_tick = expiry
+        if delta >= self._horizon:
+            slot_tick = self._tick + self._horizon - 1
+
+        index = (slot_tick // self._spans[level]) % self.slots
+        self._wheels[level][index][did] = (expiry, callable_t)
+        self._locations[did] = (level, index)
+        self._counts[level] += 1
+        self._timed += 1
+
+    def _advance(self, tick):
+        while self._tick < tick:
+            # in case there are no more timed elements in the wheel
+            # the current tick may be moved directly to the target
+            if not self._timed:
+                self._tick = tick
+                break
+
+            # determines the span of the lowest non empty level, as all
+            # the levels below it are empty it's possible to jump directly
+            # to the tick just before the next cascade of that level
+            span = 1
+            for level in range(self.levels):
+                if self._counts[level]:
+                    break
+                span *= self.slots
+            if span > 1:
+                skip = (self._tick // span + 1) * span - 1
+                if skip > self._tick:
+                    self._tick = min(skip, tick)
+                    continue
+
+            # increments the current tick and runs the turn operation
+            # that cascades and expires the proper slots of the wheels
+            self._tick += 1
+            self._turn(self._tick)
+
+    def _turn(self, tick):
+        # cascades the slots of the upper levels whose range starts
+        # at the current tick, from the top to the bottom level so
+        # that elements flow through the complete hierarchy
+        for level in range(self.levels - 1, 0, -1):
+            span = self._spans[level]
+            if tick % span:
+                continue
+            index = (tick // span) % self.slots
+            self._cascade(level, index)
+
+        # moves the complete set of elements of the lowest level slot
+        # for the current tick into the heap of expired elements
+        self._cascade(0, tick % self.slots)
+
+    def _cascade(self, level, index):
+        slot = self._wheels[level][index]
+        if not slot:
+            return
+        entries = list(slot.items())
+        slot.clear()
+        self._counts[level] -= len(entries)
+        self._timed -= len(entries)
+        for did, (expiry, callable_t) in entries:
+            self._place(did, expiry, callable_t)
+
+    def _release(self, did, callable_t):
+        del self._locations[did]
+        self._verify_remove(callable_t[0], callable_t[2])
+        return callable_t
+
+    def _verify_add(self, target, callable):
+        try:
+            key = (target, callable)
+            self._verify[key] = self._verify.get(key, 0) + 1
+        except TypeError:
+            pass
+
+    def _verify_remove(self, target, callable):
+        try:
+            key = (target, callable)
+            count = self._verify.get(key, 0) - 1
+            if count > 0:
+                self._verify[key] = count
+            else:
+                self._verify.pop(key, None)
+        except TypeError:
+            pass
@@ -41,6 +41,8 @@ __license__ = "Apache License, Version 2.0"
 from .conn import *  # @UnusedWildImport
 from .common import *  # @UnusedWildImport
 
+from . import idle
+
 BUFFER_SIZE_S = None
 """ The size of both the send and receive buffers for
 the socket representing the server, this socket is
@@ -61,7 +63,11 @@ class Server(Base):
         self.send_buffer_s = kwargs.get("send_buffer_s", BUFFER_SIZE_S)
         self.receive_buffer_c = kwargs.get("receive_buffer_c", BUFFER_SIZE_C)
         self.send_buffer_c = kwargs.get("send_buffer_c", BUFFER_SIZE_C)
-        self.socket = None
+        self.reuse_port = kwargs.get("reuse_port", False)
+        self.idle_timeout = kwargs.get("idle_timeout", 0.0)
+        self.idle_resolution = kwargs.get("idle_resolution", idle.RESOLUTION)
+        self.loops = kwargs.get("loops", 0)
+        self.loops_policy = kwargs.get("loops_policy", "round")
         self.host = None
         self.port = None
         self.type = None
@@ -73,6 +79,14 @@ class Server(Base):
         self.allowed = []
         self._concrete = True
 
+    def init_state(self):
+        Base.init_state(self)
+        self.socket = None
+        self._idle = None
+        self._loops = []
+        self._loops_t = []
+        self._loops_i = 0
+
     def welcome(self):
         Base.welcome(self)
 
@@ -104,11 +118,39 @@ class Server(Base):
         # and not able to be used for any kind of communication
         self.socket = None
 
+        # releases the idle buckets (if any) so that the sweep operation
+        # is no longer re-scheduled for the current server
+        if self._idle:
+            self._idle.clear()
+        self._idle = None
+
+    def on_drain(self):
+        Base.on_drain(self)
+
+        # unsubscribes and closes the service socket so that no more
+        # connections are accepted by the current (draining) process
+        if self.socket:
+            self.unsub_all(self.socket)
+            self.socket.close()
+
     def info_dict(self, full=False):
         info = Base.info_dict(self, full=full)
         info.update(host=self.host, port=self.port, type=self.type, ssl=self.ssl)
+        if self._idle:
+            info.update(idle=self._idle.info_dict())
+        if self._loops:
+            info.update(loops=[loop.info_loop() for loop in self._loops])
         return info
 
+    def info_loop(self):
+        return dict(
+            name=self.name,
+            tid=self.tid,
+            state=self.get_state_s(),
+            connections=len(self.connections),
+            requests=self.requests_c,
+        )
+
     def serve(
         self,
         host=None,
@@ -170,10 +212,52 @@ class Server(Base):
             self.children = self.get_env("CHILD", self.children, cast=int)
         if env:
             self.children = self.get_env("CHILDREN", self.children, cast=int)
+        if env:
+            self.affinity = self.get_env("AFFINITY", self.affinity, cast=bool)
+        if env:
+            self.reuse_port = self.get_env("REUSE_PORT", self.reuse_port, cast=bool)
+        if env:
+            self.respawn = self.get_env("RESPAWN", self.respawn, cast=bool)
+        if env:
+            self.drain_timeout = self.get_env(
+                "DRAIN_TIMEOUT", self.drain_timeout, cast=float
+            )
+        if env:
+            self.metrics = self.get_env("METRICS", self.metrics, cast=bool)
+        if env:
+            self.metrics_interval = self.get_env(
+                "METRICS_INTERVAL", self.metrics_interval, cast=float
+            )
+        if env:
+            self.instrument = self.get_env("INSTRUMENT", self.instrument, cast=bool)
+        if env:
+            self.slow_callback = self.get_env(
+                "SLOW_CALLBACK", self.slow_callback, cast=float
+            )
+        if env:
+            self.profile_interval = self.get_env(
+                "PROFILE_INTERVAL", self.profile_interval, cast=float
+            )
+        if env:
+            self.profile_path = self.get_env("PROFILE_PATH", self.profile_path)
+        if env:
+            self.profile_signal = self.get_env("PROFILE_SIGNAL", self.profile_signal)
         if env:
             self.logging = self.get_env("LOGGING", self.logging)
         if env:
             self.poll_name = self.get_env("POLL", self.poll_name)
+        if env:
+            self.exclusive = self.get_env("EXCLUSIVE", self.exclusive, cast=bool)
+        if env:
+            self.scheduler_name = self.get_env("SCHEDULER", self.scheduler_name)
+        if env:
+            self.read_into = self.get_env("READ_INTO", self.read_into, cast=bool)
+        if env:
+            self.read_budget = self.get_env("READ_BUDGET", self.read_budget, cast=int)
+        if env:
+            self.read_iterations = self.get_env(
+                "READ_ITERATIONS", self.read_iterations, cast=int
+            )
         if env:
             self.poll_timeout = self.get_env(
                 "POLL_TIMEOUT", self.poll_timeout, cast=float
@@ -190,6 +274,18 @@ class Server(Base):
             self.keepalive_count = self.get_env(
                 "KEEPALIVE_COUNT", self.keepalive_count, cast=int
             )
+        if env:
+            self.idle_timeout = self.get_env(
+                "IDLE_TIMEOUT", self.idle_timeout, cast=float
+            )
+        if env:
+            self.idle_resolution = self.get_env(
+                "IDLE_RESOLUTION", self.idle_resolution, cast=float
+            )
+        if env:
+            self.loops = self.get_env("LOOPS", self.loops, cast=int)
+        if env:
+            self.loops_policy = self.get_env("LOOPS_POLICY", self.loops_policy)
         if env:
             self.allowed = self.get_env("ALLOWED", self.allowed, cast=list)
 
@@ -245,6 +341,18 @@ class Server(Base):
         # to work under the much more latency free unix sockets
         is_unix = host == "unix"
 
+        # determines if the reuse port mode should be used for the socket
+        # and if the worker mode is enabled, meaning that each of the child
+        # processes binds its own listening socket so that the kernel is
+        # responsible for the balancing of the accept operations
+        reuse_port = (
+            self.reuse_port
+            and type == TCP_TYPE
+            and not is_unix
+            and hasattr(socket, "SO_REUSEPORT")
+        )
+        is_worker = reuse_port and int(self.children) > 0 and hasattr(os, "fork")
+
         # checks the type of service that is meant to be created and
         # creates a service socket according to the defined service
         family = socket.AF_INET6 if ipv6 else socket.AF_INET
@@ -260,6 +368,7 @@ class Server(Base):
                 ca_root=ca_root,
                 ssl_verify=ssl_verify,
                 family=family,
+                reuse_port=reuse_port,
             )
         elif type == UDP_TYPE:
             self.socket = self.socket_udp()
@@ -276,9 +385,11 @@ class Server(Base):
 
         # binds the socket to the provided address value (per spec) and then
         # starts the listening in the socket with the provided backlog value
-        # defaulting to the typical maximum backlog as possible if not provided
+        # defaulting to the typical maximum backlog as possible if not provided,
+        # note that under the worker mode the (master) socket is only bound
+        # (reserving the port) as each child is going to listen on its own
         self.socket.bind(address)
-        if type == TCP_TYPE:
+        if type == TCP_TYPE and not is_worker:
             self.socket.listen(backlog)
 
         # in case the set user id value the user of the current process should
@@ -316,6 +427,29 @@ class Server(Base):
         if not result:
             return
 
+        # in case the worker mode is enabled creates (for child processes)
+        # a new listening socket bound to the same address with the reuse
+        # port option set, replacing the inherited (non listening) one, if
+        # no fork occurred the master socket is used for listening instead
+        if is_worker and self._child:
+            _socket = self.socket
+            self.socket = self.socket_tcp(
+                ssl,
+                key_file=key_file,
+                cer_file=cer_file,
+                ca_file=ca_file,
+                ca_root=ca_root,
+                ssl_verify=ssl_verify,
+                family=family,
+                reuse_port=True,
+            )
+            self.socket.bind((host, self.port))
+            self.socket.listen(backlog)
+            _socket.close()
+            self.debug("Listening on own socket for child '%d' ...", os.getpid())
+        elif is_worker:
+            self.socket.listen(backlog)
+
         # ensures that the current polling mechanism is correctly open as the
         # service socket is going to be added to it next, this overrides the
         # default behavior of the common infra-structure (on start)
@@ -324,8 +458,13 @@ class Server(Base):
 
         # adds the socket to all of the pool lists so that it's ready to read
         # write and handle error, this is the expected behavior of a service
-        # socket so that it can handle all of the expected operations
-        self.sub_all(self.socket)
+        # socket so that it can handle all of the expected operations, note
+        # that listening sockets may use the exclusive (wakeup) mode so that
+        # only one of the (forked) children is awaken for each connection
+        if type == TCP_TYPE:
+            self.sub_service(self.socket)
+        else:
+            self.sub_all(self.socket)
 
         # calls the on serve callback handler so that underlying services may be
         # able to respond to the fact that the service is starting and some of
@@ -347,6 +486,7 @@ class Server(Base):
         ssl_verify=False,
         family=socket.AF_INET,
         type=socket.SOCK_STREAM,
+        reuse_port=False,
     ):
         # verifies if the provided family is of type internet and if that's
         # the case the associated flag is set to valid for usage
@@ -390,6 +530,10 @@ class Server(Base):
         # avoiding the leak of connections (operative system managed)
         _socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         _socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if reuse_port:
+            _socket.setsockopt(
+                socket.SOL_SOCKET, socket.SO_REUSEPORT, 1
+            )  # @UndefinedVariable pylint: disable=E1101
         if is_inet:
             _socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
         if self.receive_buffer_s:
@@ -765,12 +909,172 @@ class StreamServer(Server):
     def serve(self, type=TCP_TYPE, *args, **kwargs):
         Server.serve(self, type=type, *args, **kwargs)
 
+    def ensure_idle(self):
+        """
+        Makes sure that the idle buckets structure is created for the
+        current server and that its periodic sweep is scheduled.
+
+        Connections are only registered in the buckets by the server
+        (on creation and by upper layers like HTTP keep-alive), the
+        activity in them only "touches" a tick value, avoiding the
+        (re-)scheduling of a delayed call per connection and event.
+
+        :rtype: IdleBuckets
+        :return: The idle buckets structure associated with the server.
+        """
+
+        if self._idle:
+            return self._idle
+        self._idle = idle.IdleBuckets(resolution=self.idle_resolution)
+        self.delay(self._sweep_idle, timeout=self.idle_resolution)
+        return self._idle
+
+    def on_serve(self):
+        Server.on_serve(self)
+        if self.idle_timeout:
+            self.ensure_idle()
+
+    def on_idle(self, connection):
+        self.debug("Connection '%s' closed after being idle", connection.id)
+        connection.close()
+
+    def del_connection(self, connection):
+        if self._idle:
+            self._idle.remove(connection)
+        return Server.del_connection(self, connection)
+
+    def start_loops(self):
+        """
+        Starts the (multiple) loop threads of the server, each of them
+        running its own poll instance and scheduler, the current loop
+        remains responsible only for the accepting of the connections
+        that are then handed to the loops (according to the policy).
+
+        This mode is meant for free-threaded Python builds, where the
+        loops run in parallel while sharing the state of the server
+        (configuration, caches, etc.) that must then be thread safe,
+        under the GIL the loops are serialized (no real parallelism).
+        """
+
+        for index in range(self.loops):
+            loop = self.build_loop(index)
+            thread = threading.Thread(target=loop.run_loop, name=loop.name)
+            thread.daemon = True
+            self._loops.append(loop)
+            self._loops_t.append(thread)
+            thread.start()
+        self.info(
+            "Started %d loop threads using '%s' policy ...",
+            self.loops,
+            self.loops_policy,
+        )
+
+    def stop_loops(self, timeout=None):
+        for loop in self._loops:
+            loop.delay_s(loop.stop)
+        for thread in self._loops_t:
+            thread.join(timeout or self.drain_timeout)
+        del self._loops[:]
+        del self._loops_t[:]
+
+    def build_loop(self, index):
+        """
+        Builds a new loop (for the loop threads mode) as a shallow copy
+        of the current server, sharing its configuration but with its own
+        runtime state (as created by the init state operation), so that
+        the connections handled by it are owned by it (thread safety
+        verifications are performed against the thread of the loop).
+
+        :type index: int
+        :param index: The index of the loop that is going to be built.
+        :rtype: StreamServer
+        :return: The newly built loop, ready to be run in its thread.
+        """
+
+        loop = copy.copy(self)
+        loop.name = "%s-%d" % (self.name, index)
+        loop.events = dict(
+            (name, list(methods)) for name, methods in legacy.iteritems(self.events)
+        )
+        loop._dispatch = dict()
+        for name in loop.events:
+            loop._compile(name)
+        loop.loops = 0
+        loop._main = False
+        loop.init_state()
+        loop.set_state(STATE_STOP)
+        return loop
+
+    def run_loop(self):
+        # updates the thread information of the loop so that the thread
+        # safety verifications (eg: connection send) are performed against
+        # the thread of the loop and sets the loop as the main one for it
+        cthread = threading.current_thread()
+        self.tid = cthread.ident or 0
+        self.tname = cthread.getName()
+        Base.set_local(self)
+
+        # opens the (own) poll of the loop and makes sure that the notify
+        # pool exists, so that the sockets handed by the accepting loop
+        # (via safe delay) wake the loop, then re-creates the idle buckets
+        # in case they're enabled for the server
+        self.poll.open(timeout=self.poll_timeout)
+        self.nensure()
+        if self.idle_timeout or getattr(self, "keep_alive_timeout", None):
+            self.ensure_idle()
+
+        try:
+            self.main()
+        finally:
+            Base.unset_local()
+
+    def select_loop(self):
+        """
+        Selects the loop that is going to handle a newly accepted
+        connection according to the loops policy, either round robin
+        (`round`) or the one with the least connections (`least`).
+
+        :rtype: StreamServer
+        :return: The loop selected for the handling of the connection.
+        """
+
+        if self.loops_policy == "least":
+            return min(self._loops, key=lambda loop: len(loop.connections))
+        loop = self._loops[self._loops_i % len(self._loops)]
+        self._loops_i += 1
+        return loop
+
+    def on_start(self):
+        Server.on_start(self)
+        if self.loops and not self._loops:
+            self.start_loops()
+
+    def on_stop(self):
+        Server.on_stop(self)
+        if self._loops:
+            self.stop_loops()
+
+    def on_socket_l(self, socket_c, address):
+        loop = self.select_loop()
+
+        def on_socket():
+            try:
+                loop.on_socket_c(socket_c, address)
+            except Exception:
+                socket_c.close()
+                raise
+
+        loop.delay_s(on_socket)
+
     def on_read_s(self, _socket):
         try:
             while True:
                 socket_c, address = _socket.accept()
                 try:
-                    self.on_socket_c(socket_c, address)
+                    if self._loops:
+                        self.on_socket_l(socket_c, address)
+                    else:
+                        self.on_socket_c(socket_c, address)
                 except Exception:
                     socket_c.close()
                     raise
@@ -836,6 +1140,11 @@ class StreamServer(Server):
         if not connection.renable == True:
             return
 
+        # marks the connection as active for the current tick of the
+        # idle buckets (if enabled), this is just an integer store
+        if self._idle:
+            connection.idle_t = self._idle.tick
+
         try:
             # verifies if there's any pending operations in the
             # connection (eg: SSL handshaking) and performs it trying
@@ -844,11 +1153,24 @@ class StreamServer(Server):
             if self._pending(connection):
                 return
 
+            # in case the connection is part of a zero-copy tunnel the data
+            # is moved by the kernel into the peer (no data is read here)
+            if connection.spliced:
+                connection.spliced.read(connection)
+                return
+
             # iterates continuously trying to read as much data as possible
             # when there's a failure to read more data it should raise an
-            # exception that should be handled properly
+            # exception that should be handled properly, note that in case
+            # the read into mode is enabled the data is received into the
+            # reusable buffer of the loop and provided as a memory view
+            view = self.get_read_view() if not connection.datagram else None
+            count, size = 0, 0
             while True:
-                data = connection.recv(CHUNK_SIZE)
+                if view:
+                    data = connection.recv_into(view)
+                else:
+                    data = connection.recv(CHUNK_SIZE)
                 if data:
                     self.on_data(connection, data)
                 else:
@@ -860,6 +1182,14 @@ class StreamServer(Server):
                     break
                 if not connection.socket == _socket:
                     break
+
+                # updates the read budget counters and in case it has been
+                # exhausted yields the loop to the other connections, the
+                # socket is re-queued for the next iteration (if needed)
+                count, size = count + 1, size + len(data)
+                if self.is_read_exhausted(count, size):
+                    self.requeue_read(_socket, force=bool(connection.ssl))
+                    break
         except ssl.SSLError as error:
             error_v = error.args[0] if error.args else None
             error_m = (
@@ -905,6 +1235,9 @@ class StreamServer(Server):
         if not connection.status == OPEN:
             return
 
+        if self._idle:
+            connection.idle_t = self._idle.tick
+
         try:
             connection._send()
         except ssl.SSLError as error:
@@ -1058,6 +1391,12 @@ class StreamServer(Server):
         connection = self.build_connection(socket_c, address, ssl=self.ssl)
         connection.open()
 
+        # registers the connection in the idle buckets (if enabled) so
+        # that it's closed in case no activity happens in it for longer
+        # than the idle timeout (coarse grained verification)
+        if self._idle and self.idle_timeout:
+            self._idle.add(connection, self.idle_timeout)
+
         # registers the SSL handshake method as a starter method
         # for the connection, so that the handshake is properly
         # performed on the initial stage of the connection (as expected)
@@ -1102,3 +1441,18 @@ class StreamServer(Server):
         # that SSL is now enabled for that socket/connection and so
         # the communication between peers is now secured
         self.on_ssl(connection)
+
+    def _sweep_idle(self):
+        # in case the idle buckets have been released meanwhile (eg: the
+        # server has been cleaned up) there's nothing remaining to be done
+        if not self._idle:
+            return
+
+        # runs the bulk sweep operation over the buckets, closing every
+        # single connection that has been idle for longer than its timeout
+        # and then re-schedules the sweep for the next resolution period
+        for connection in self._idle.sweep():
+            if not connection.status == OPEN:
+                continue
+            self.on_idle(connection)
+        self.delay(self._sweep_idle, timeout=self.idle_resolution)
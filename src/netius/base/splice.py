@@ -0,0 +1,290 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+"""netius.base.splice
+
+Zero-copy tunnelling of data between two plain (non SSL) stream
+connections using the splice system call (Linux only). Data read
+from one of the sockets is moved into a kernel pipe and from there
+into the other socket, never crossing into the Python space, the
+process is driven by the read and write readiness events of the loop.
+"""
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import os
+import errno
+
+CHUNK_SIZE = 65536
+""" The maximum number of bytes to be moved from the source socket
+into the pipe on each splice operation, should match the default
+size of a pipe buffer in Linux (larger values are useless) """
+
+FLAGS = getattr(os, "SPLICE_F_MOVE", 0) | getattr(os, "SPLICE_F_NONBLOCK", 0)
+""" The flags to be used in the splice operations, pages are moved
+(instead of copied) when possible and the pipe operations must never
+block the event loop """
+
+WOULD_BLOCK = (errno.EAGAIN, errno.EWOULDBLOCK)
+""" The set of error codes that indicate that the splice operation
+would block, meaning that a readiness event must be waited for """
+
+
+def is_supported():
+    """
+    Determines if the current platform and interpreter support the
+    splice system call (Linux and Python 3.10 or newer).
+
+    :rtype: bool
+    :return: If zero-copy tunnelling using splice is supported.
+    """
+
+    return hasattr(os, "splice")
+
+
+class SpliceChannel(object):
+    """
+    One of the directions of a splice based tunnel, moving the data
+    read from the source connection into the target connection using
+    a kernel pipe as the intermediate buffer.
+    """
+
+    __slots__ = (
+        "source",
+        "target",
+        "size",
+        "pipe_r",
+        "pipe_w",
+        "pending",
+        "paused",
+        "eof",
+    )
+
+    def __init__(self, source, target, size=CHUNK_SIZE):
+        self.source = source
+        self.target = target
+        self.size = size
+        self.pipe_r, self.pipe_w = os.pipe()
+        self.pending = 0
+        self.paused = False
+        self.eof = False
+
+    def close(self):
+        for fd in (self.pipe_r, self.pipe_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self.pending = 0
+
+    def read(self):
+        source = self.source
+        owner = source.owner
+        count, size = 0, 0
+
+        while True:
+            # moves the data available in the source socket into the pipe
+            # and in case there's no more data available (would block) the
+            # control flow is returned to wait for the next read event
+            try:
+                data_l = os.splice(
+                    source.socket.fileno(), self.pipe_w, self.size, flags=FLAGS
+                )
+            except OSError as error:
+                if error.errno in WOULD_BLOCK:
+                    return
+                raise
+
+            # in case no data has been read the source has reached the
+            # end of the stream, the connection is closed as soon as the
+            # data in the pipe has been flushed into the target
+            if data_l == 0:
+                self.eof = True
+                self.flush()
+                return
+
+            self.pending += data_l
+            if owner:
+                owner.bytes_in_c += data_l
+
+            # tries to flush the data into the target and in case that's
+            # not possible (target is full) pauses the reading of the source
+            # until the target is writable again (bounded by the pipe size)
+            if not self.flush():
+                return
+
+            # updates the read budget counters and in case it has been
+            # exhausted yields the loop to the other connections
+            count, size = count + 1, size + data_l
+            if owner and owner.is_read_exhausted(count, size):
+                owner.requeue_read(source.socket)
+                return
+
+    def flush(self):
+        source, target = self.source, self.target
+        owner = target.owner
+
+        # the data in the pipe is only written after the (userland) pending
+        # data of the target has been sent, keeping the order of the data,
+        # the target's send operation is going to flush the pipe afterwards
+        # (the target is already waiting for a write event in such case)
+        if target.pending:
+            self._pause()
+            return False
+
+        while self.pending:
+            try:
+                data_l = os.splice(
+                    self.pipe_r, target.socket.fileno(), self.pending, flags=FLAGS
+                )
+            except OSError as error:
+                if not error.errno in WOULD_BLOCK:
+                    raise
+                self._pause()
+                target.wready = False
+                target.ensure_write()
+                return False
+
+            self.pending -= data_l
+            if owner:
+                owner.bytes_out_c += data_l
+
+        # marks the target as active in the idle buckets (if enabled) as
+        # the data written is never going through its on write handler
+        idle = getattr(owner, "_idle", None)
+        if idle:
+            target.idle_t = idle.tick
+
+        # in case the end of the stream has been reached by the source
+        # and the pipe is now empty, the source can be closed, otherwise
+        # resumes the reading of the source in case it has been paused
+        if self.eof:
+            source.close()
+            return True
+        self._resume()
+        return True
+
+    def _pause(self):
+        if self.paused:
+            return
+        self.paused = True
+        self.source.disable_read()
+
+    def _resume(self):
+        if not self.paused:
+            return
+        self.paused = False
+
+        # re-enables the reading of the source and forces a read operation
+        # as there may be data waiting in the socket that won't trigger a
+        # new read event (edge based polling)
+        source = self.source
+        if not source.is_open():
+            return
+        if not source.renable == False:
+            return
+        source.enable_read()
+        if source.owner:
+            source.owner.reads((source.socket,), state=False)
+
+
+class Splice(object):
+    """
+    Zero-copy tunnel between two plain stream connections, composed
+    by two channels (one per direction) each one with its own pipe.
+
+    Once started the read events of both connections are handled by
+    the tunnel (no data events are triggered) and the write events
+    flush the data waiting in the pipe after the pending data of the
+    connection, closing any of the connections closes the tunnel.
+    """
+
+    def __init__(self, first, second, size=CHUNK_SIZE):
+        self.first = first
+        self.second = second
+        self.forward = SpliceChannel(first, second, size=size)
+        self.backward = SpliceChannel(second, first, size=size)
+
+    @classmethod
+    def is_spliceable(cls, first, second):
+        """
+        Verifies if the provided pair of connections may be tunnelled
+        using splice, which requires platform support and two plain
+        (no SSL) stream sockets with no data restored for reading.
+
+        :type first: Connection
+        :param first: The first connection of the pair to be verified.
+        :type second: Connection
+        :param second: The second connection of the pair to be verified.
+        :rtype: bool
+        :return: If the pair of connections can be spliced together.
+        """
+
+        if not is_supported():
+            return False
+        for connection in (first, second):
+            if connection.ssl:
+                return False
+            if connection.datagram:
+                return False
+            if connection.restored_s:
+                return False
+            if connection.spliced:
+                return False
+            if not hasattr(connection.socket, "fileno"):
+                return False
+        return True
+
+    def start(self):
+        self.first.spliced = self
+        self.second.spliced = self
+
+    def close(self):
+        if self.first.spliced == self:
+            self.first.spliced = None
+        if self.second.spliced == self:
+            self.second.spliced = None
+        self.forward.close()
+        self.backward.close()
+
+    def read(self, connection):
+        channel = self.forward if connection == self.first else self.backward
+        channel.read()
+
+    def flush(self, connection):
+        channel = self.backward if connection == self.first else self.forward
+        return channel.flush()
+
+    def info_dict(self, full=False):
+        info = dict(
+            forward_pending=self.forward.pending,
+            backward_pending=self.backward.pending,
+            forward_paused=self.forward.paused,
+            backward_paused=self.backward.paused,
+        )
+        return info
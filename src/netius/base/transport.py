@@ -39,7 +39,6 @@ __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
 from . import mixin
-from . import errors
 from . import observer
 from . import asynchronous
 
@@ -174,13 +173,8 @@ class Transport(observer.Observable):
                 high = 65536
             else:
                 high = 4 * low
-        if low == None:
-            low = high // 4
-        if not high >= low >= 0:
-            raise errors.RuntimeError("High must be larger than low")
 
-        self._connection.max_pending = high
-        self._connection.min_pending = low
+        self._connection.set_watermarks(high, low=low)
 
     def set_extra_dict(self):
         self._extra_dict = dict(
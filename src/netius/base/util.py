@@ -26,7 +26,9 @@ camel_to_underscore for normalizing camel cased names into underscore
 based strings using precompiled regular expressions, matching the
 common Python naming convention. Also provides verify, an assertion
 helper that raises a configurable exception with a custom message when
-a given condition does not hold, breaking the current execution flow.
+a given condition does not hold, breaking the current execution flow,
+and callable_name that builds a readable description of a callable
+(including the source location of lambdas) for diagnostics messages.
 """
 
 __author__ = "João Magalhães <joamag@hive.pt>"
@@ -38,7 +40,9 @@ __copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import os
 import re
+import types
 
 from . import errors
 
@@ -99,3 +103,46 @@ def verify(condition, message=None, exception=None):
         return
     exception = exception or errors.AssertionError
     raise exception(message or "Assertion Error")
+
+
+def callable_name(method):
+    """
+    Builds a human readable name for the provided callable, to be
+    used in diagnostics messages (eg: slow callback warnings).
+
+    Partial objects are unwrapped and functions (including lambdas)
+    have their source location added, as their name alone is often
+    not enough to identify them.
+
+    Under Python 2 (no qualified names) the name of the class of a
+    bound method is prepended to the name of the function.
+
+    :type method: Function
+    :param method: The callable object to build the name for.
+    :rtype: String
+    :return: The readable name of the callable.
+    """
+
+    while hasattr(method, "func"):
+        method = method.func
+    function = getattr(method, "__func__", method)
+    name = getattr(function, "__qualname__", None) or getattr(
+        function, "__name__", None
+    )
+    if not name:
+        return repr(method)
+    if not hasattr(function, "__qualname__"):
+        owner = getattr(method, "__self__", None)
+        cls = getattr(method, "im_class", None)
+        if not cls and not owner == None and not isinstance(owner, types.ModuleType):
+            cls = owner.__class__
+        if cls:
+            name = "%s.%s" % (cls.__name__, name)
+    code = getattr(function, "__code__", None)
+    if not code:
+        return name
+    return "%s (%s:%d)" % (
+        name,
+        os.path.basename(code.co_filename),
+        code.co_firstlineno,
+    )
@@ -0,0 +1,203 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+"""netius.bench.base
+
+Shared infrastructure for the Netius benchmarks, providing a
+monotonic timer helper, the JSON result output and the dispatch of
+the command line sub commands (much like the shell tools do).
+
+Example:
+    python -m netius.bench.scheduler run 10000,100000
+"""
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import sys
+import json
+import time
+import socket
+
+import netius
+
+clock = getattr(time, "perf_counter", time.time)
+""" The high resolution clock to be used for the measurement
+of the elapsed time, falls back to the wall clock for older
+interpreters that do not provide the performance counter """
+
+
+class Timer(object):
+    """
+    Context manager based timer that measures the elapsed
+    time (in seconds) of the enclosed block of code.
+    """
+
+    def __init__(self):
+        self.start = None
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        self.start = clock()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.elapsed = clock() - self.start
+
+
+def counts(value, default=(10000, 100000, 1000000)):
+    """
+    Parses the provided comma separated sequence of counts
+    (as received from the command line) into a tuple of integers.
+
+    :type value: String
+    :param value: The comma separated string of counts, may
+    be an already parsed sequence or an invalid value.
+    :type default: Tuple
+    :param default: The sequence of counts to be returned in
+    case no value is provided.
+    :rtype: Tuple
+    :return: The sequence of integer counts.
+    """
+
+    if not value:
+        return default
+    if isinstance(value, (list, tuple)):
+        return tuple(int(item) for item in value)
+    return tuple(int(item) for item in value.split(",") if item)
+
+
+def output(name, results, file=None):
+    """
+    Prints the results of the benchmark with the provided name
+    as a JSON document to the target file (standard output by
+    default), returning the structure that was printed.
+
+    :type name: String
+    :param name: The name of the benchmark that was executed.
+    :type results: List
+    :param results: The sequence of result dictionaries.
+    :type file: File
+    :param file: The file like object to write the JSON to.
+    :rtype: Dictionary
+    :return: The complete document that has been printed.
+    """
+
+    file = file or sys.stdout
+    document = dict(
+        name=name,
+        python=sys.version.split(" ")[0],
+        platform=sys.platform,
+        results=results,
+    )
+    json.dump(document, file, indent=4, sort_keys=True)
+    file.write("\n")
+    return document
+
+
+def percentile(values, value):
+    """
+    Retrieves the provided percentile (from 0 to 100) out of the
+    already sorted sequence of values using the nearest rank method.
+
+    :type values: List
+    :param values: The sorted sequence of values to be used.
+    :type value: float
+    :param value: The percentile to be retrieved (eg: 99.0).
+    :rtype: float
+    :return: The value at the requested percentile or zero in
+    case the sequence of values is empty.
+    """
+
+    if not values:
+        return 0.0
+    index = int(round(value / 100.0 * (len(values) - 1)))
+    return values[index]
+
+
+def summary(latencies, elapsed, transferred=0, errors=0):
+    """
+    Builds the summary dictionary of a load run out of the latencies
+    (in seconds) of each request, the elapsed time of the complete run
+    and the amount of bytes transferred during it.
+
+    :type latencies: List
+    :param latencies: The sequence of latencies, one per request.
+    :type elapsed: float
+    :param elapsed: The time (in seconds) taken by the complete run.
+    :type transferred: int
+    :param transferred: The number of payload bytes received.
+    :type errors: int
+    :param errors: The number of requests that have failed.
+    :rtype: Dictionary
+    :return: The summary with the rate, throughput and the latency
+    percentiles (in milliseconds) of the run.
+    """
+
+    latencies = sorted(latencies)
+    count = len(latencies)
+    elapsed = elapsed or 1e-9
+    return dict(
+        requests=count,
+        errors=errors,
+        elapsed=elapsed,
+        rps=count / elapsed,
+        throughput=transferred / elapsed,
+        latency=dict(
+            mean=(sum(latencies) / count if count else 0.0) * 1000.0,
+            p50=percentile(latencies, 50.0) * 1000.0,
+            p90=percentile(latencies, 90.0) * 1000.0,
+            p99=percentile(latencies, 99.0) * 1000.0,
+            max=(latencies[-1] if count else 0.0) * 1000.0,
+        ),
+    )
+
+
+def free_port():
+    _socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        _socket.bind(("127.0.0.1", 0))
+        return _socket.getsockname()[1]
+    finally:
+        _socket.close()
+
+
+def wait_port(port, timeout=10.0):
+    target = time.time() + timeout
+    while time.time() < target:
+        try:
+            socket.create_connection(("127.0.0.1", port)).close()
+            return
+        except socket.error:
+            time.sleep(0.05)
+    raise netius.NetiusError("Server not available on port '%d'" % port)
+
+
+def bench_call(globals={}, locals={}, default="run"):
+    name = sys.argv[1] if len(sys.argv) > 1 else default
+    method = globals[name]
+    method(*sys.argv[2:])
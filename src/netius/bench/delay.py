@@ -0,0 +1,127 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+"""netius.bench.delay
+
+Benchmark of the cross thread delayed call submission (`delay_s()`)
+with multiple producer threads submitting callables into a running
+event loop. Measures the submission rate, the time until every single
+callable has been run in the loop and the number of wakeup operations
+(notifications) issued, showing their coalescing under bursts.
+
+Example:
+    python -m netius.bench.delay run 1000000 4
+"""
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import threading
+
+import netius
+
+from . import base
+
+
+class CountingBase(netius.Base):
+    """
+    Event loop that counts the number of wakeup operations that
+    have been requested by the other (producer) threads.
+    """
+
+    def __init__(self, *args, **kwargs):
+        netius.Base.__init__(self, *args, **kwargs)
+        self.wakeups = 0
+
+    def wakeup(self, force=False):
+        self.wakeups += 1
+        netius.Base.wakeup(self, force=force)
+
+
+def measure(count, producers=4):
+    loop = CountingBase(level="ERROR")
+    executed = [0]
+    submitted = [0.0]
+
+    def callable():
+        executed[0] += 1
+        if executed[0] < count:
+            return
+        loop.stop()
+
+    def produce(amount):
+        delay_s = loop.delay_s
+        for _index in netius.legacy.xrange(amount):
+            delay_s(callable)
+
+    def start():
+        amount = count // producers
+        threads = [
+            threading.Thread(
+                target=produce,
+                args=(amount + (count % producers if index == 0 else 0),),
+            )
+            for index in range(producers)
+        ]
+        with base.Timer() as timer:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        submitted[0] = timer.elapsed
+
+    thread = None
+    with base.Timer() as timer:
+        thread = threading.Thread(target=start)
+        loop.delay(thread.start, immediately=True)
+        loop.start()
+    thread and thread.join()
+    loop.cleanup()
+
+    return dict(
+        count=count,
+        producers=producers,
+        executed=executed[0],
+        submit=submitted[0],
+        total=timer.elapsed,
+        rate=count / timer.elapsed if timer.elapsed else 0.0,
+        wakeups=loop.wakeups,
+        batch=count / float(loop.wakeups) if loop.wakeups else float(count),
+    )
+
+
+def run(counts=None, producers="4"):
+    results = []
+    for count in base.counts(counts, default=(1000000,)):
+        results.append(measure(count, producers=int(producers)))
+    return base.output("delay", results)
+
+
+if __name__ == "__main__":
+    base.bench_call(globals(), locals())
+else:
+    __path__ = []
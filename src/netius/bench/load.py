@@ -0,0 +1,492 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+"""netius.bench.load
+
+Loopback load generators to be used by the server benchmarks, built
+both on top of raw (blocking) sockets running in a set of threads and
+on top of the Netius HTTP client running its own event loop.
+
+Each of the generators returns the summary structure (see `summary()`
+in the base module) with the rate, throughput and latency percentiles.
+"""
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import os
+import base64
+import socket
+import struct
+import threading
+
+import netius
+import netius.common
+import netius.clients
+
+from . import base
+
+BUFFER_SIZE = 65536
+""" The size of the buffer used in each of the receive operations
+performed by the raw socket based load generators """
+
+HTTP2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+""" The connection preface that must be sent by the client at the
+start of an HTTP/2 (prior knowledge) connection """
+
+HTTP2_FRAME = struct.Struct("!BHBBI")
+""" The structure of the HTTP/2 frame header, with the length (split
+into a high byte and a low short), type, flags and stream identifier """
+
+
+class Lanes(object):
+    """
+    Helper that runs the provided lane function in a set of threads,
+    one per unit of concurrency, collecting the latencies, the number
+    of bytes transferred and the errors of each of them.
+    """
+
+    def __init__(self, target, count, concurrency):
+        self.target = target
+        self.count = count
+        self.concurrency = concurrency
+        self.latencies = []
+        self.transferred = 0
+        self.errors = 0
+        self.lock = threading.Lock()
+
+    def run(self):
+        quota = [self.count // self.concurrency] * self.concurrency
+        for index in netius.legacy.xrange(self.count % self.concurrency):
+            quota[index] += 1
+        threads = [
+            threading.Thread(target=self._lane, args=(_quota,)) for _quota in quota
+        ]
+        with base.Timer() as timer:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        return base.summary(
+            self.latencies,
+            timer.elapsed,
+            transferred=self.transferred,
+            errors=self.errors,
+        )
+
+    def _lane(self, quota):
+        latencies = []
+        transferred = 0
+        errors = 0
+        try:
+            for latency, size in self.target(quota):
+                latencies.append(latency)
+                transferred += size
+        except (socket.error, netius.NetiusError):
+            errors = quota - len(latencies)
+        with self.lock:
+            self.latencies.extend(latencies)
+            self.transferred += transferred
+            self.errors += errors
+
+
+def http_raw(port, count, concurrency, path="/", keep_alive=True):
+    """
+    Runs an HTTP/1.1 load against the server listening on the
+    provided port using raw sockets, re-using the connection of
+    each lane in case keep alive is requested.
+
+    :type port: int
+    :param port: The port of the loopback server to be loaded.
+    :type count: int
+    :param count: The total number of requests to be performed.
+    :type concurrency: int
+    :param concurrency: The number of concurrent connections.
+    :type path: String
+    :param path: The path of the resource to be requested.
+    :type keep_alive: bool
+    :param keep_alive: If the connections should be re-used.
+    :rtype: Dictionary
+    :return: The summary of the load run.
+    """
+
+    request = netius.legacy.bytes(
+        "GET %s HTTP/1.1\r\nHost: 127.0.0.1:%d\r\nConnection: %s\r\n\r\n"
+        % (path, port, "keep-alive" if keep_alive else "close")
+    )
+
+    def lane(quota):
+        _socket = None
+        buffer = [b""]
+        try:
+            for _index in netius.legacy.xrange(quota):
+                start = base.clock()
+                if not _socket:
+                    _socket = _connect(port)
+                    buffer = [b""]
+                _socket.sendall(request)
+                size, close = _read_http(_socket, buffer)
+                yield base.clock() - start, size
+                if keep_alive and not close:
+                    continue
+                _socket.close()
+                _socket = None
+        finally:
+            if _socket:
+                _socket.close()
+
+    return Lanes(lane, count, concurrency).run()
+
+
+def http_client(port, count, concurrency, path="/", version="HTTP/1.1"):
+    """
+    Runs an HTTP load against the server listening on the provided
+    port using the Netius HTTP client, with one (re-used) protocol
+    per unit of concurrency, all of them running in the same loop.
+
+    :type port: int
+    :param port: The port of the loopback server to be loaded.
+    :type count: int
+    :param count: The total number of requests to be performed.
+    :type concurrency: int
+    :param concurrency: The number of concurrent protocols.
+    :type path: String
+    :param path: The path of the resource to be requested.
+    :type version: String
+    :param version: The HTTP version string of the requests.
+    :rtype: Dictionary
+    :return: The summary of the load run.
+    """
+
+    url = "http://127.0.0.1:%d%s" % (port, path)
+    client = netius.clients.HTTPClient(auto_release=False)
+    loop = netius.new_loop()
+    latencies = []
+    protocols = set()
+    state = dict(issued=0, done=0, transferred=0, errors=0)
+
+    def finish():
+        if state["done"] + state["errors"] < count:
+            return
+        netius.compat_loop(loop).stop()
+
+    def issue(protocol=None):
+        _loop, _protocol = client.method(
+            "GET", url, version=version, protocol=protocol, loop=loop
+        )
+        _protocol._bench_start = base.clock()
+        protocols.add(_protocol)
+
+        # the (re-)setting of the protocol for a new request unbinds
+        # all of its handlers so they must be bound for every request
+        _protocol.bind("partial", on_partial)
+        _protocol.bind("message", on_message)
+        _protocol.bind("close", on_close)
+
+    def on_partial(protocol, parser, data):
+        state["transferred"] += len(data)
+
+    def on_message(protocol, parser, message):
+        latencies.append(base.clock() - protocol._bench_start)
+        state["done"] += 1
+        if state["issued"] < count:
+            state["issued"] += 1
+            loop.delay(lambda: issue(protocol))
+        finish()
+
+    def on_close(protocol):
+        if state["done"] + state["errors"] >= count:
+            return
+        state["errors"] += 1
+        if state["issued"] < count:
+            state["issued"] += 1
+            loop.delay(issue)
+        finish()
+
+    for _index in netius.legacy.xrange(min(concurrency, count)):
+        state["issued"] += 1
+        issue()
+
+    with base.Timer() as timer:
+        loop.run_forever()
+
+    for protocol in protocols:
+        protocol.close()
+    client.cleanup()
+    return base.summary(
+        latencies,
+        timer.elapsed,
+        transferred=state["transferred"],
+        errors=state["errors"],
+    )
+
+
+def http2_raw(port, count, concurrency, path="/"):
+    """
+    Runs an HTTP/2 (prior knowledge, clear text) load against the
+    server listening on the provided port using raw sockets, each
+    lane issues its requests sequentially over a single connection
+    with an hand encoded (static table only) header block.
+
+    :type port: int
+    :param port: The port of the loopback server to be loaded.
+    :type count: int
+    :param count: The total number of requests to be performed.
+    :type concurrency: int
+    :param concurrency: The number of concurrent connections.
+    :type path: String
+    :param path: The path of the resource to be requested.
+    :rtype: Dictionary
+    :return: The summary of the load run.
+    """
+
+    authority = netius.legacy.bytes("127.0.0.1:%d" % port)
+    path = netius.legacy.bytes(path)
+    block = b"\x82\x86"
+    block += b"\x84" if path == b"/" else _literal(4, path)
+    block += _literal(1, authority)
+
+    def lane(quota):
+        _socket = _connect(port)
+        buffer = [b""]
+        try:
+            _socket.sendall(HTTP2_PREFACE + _frame(0x04, 0x00, 0))
+            for index in netius.legacy.xrange(quota):
+                stream = index * 2 + 1
+                start = base.clock()
+                _socket.sendall(_frame(0x01, 0x05, stream, block))
+                size = _read_http2(_socket, buffer, stream)
+                yield base.clock() - start, size
+        finally:
+            _socket.close()
+
+    return Lanes(lane, count, concurrency).run()
+
+
+def echo_raw(port, count, concurrency, size=64):
+    """
+    Runs a load against the echo server listening on the provided
+    port, sending a payload of the provided size and waiting for
+    the same amount of data to be echoed back.
+
+    :type port: int
+    :param port: The port of the loopback server to be loaded.
+    :type count: int
+    :param count: The total number of round trips to be performed.
+    :type concurrency: int
+    :param concurrency: The number of concurrent connections.
+    :type size: int
+    :param size: The size in bytes of the payload of each round trip.
+    :rtype: Dictionary
+    :return: The summary of the load run.
+    """
+
+    payload = os.urandom(size)
+
+    def lane(quota):
+        _socket = _connect(port)
+        try:
+            for _index in netius.legacy.xrange(quota):
+                start = base.clock()
+                _socket.sendall(payload)
+                _read_exact(_socket, size, [b""])
+                yield base.clock() - start, size
+        finally:
+            _socket.close()
+
+    return Lanes(lane, count, concurrency).run()
+
+
+def ws_raw(port, count, concurrency, size=64):
+    """
+    Runs a load against the websocket echo server listening on the
+    provided port, performing the handshake and then sending masked
+    binary frames of the provided size and waiting for the echo.
+
+    :type port: int
+    :param port: The port of the loopback server to be loaded.
+    :type count: int
+    :param count: The total number of round trips to be performed.
+    :type concurrency: int
+    :param concurrency: The number of concurrent connections.
+    :type size: int
+    :param size: The size in bytes of the payload of each frame.
+    :rtype: Dictionary
+    :return: The summary of the load run.
+    """
+
+    frame = netius.common.encode_ws(os.urandom(size), mask=True)
+    key = base64.b64encode(os.urandom(16))
+    handshake = netius.legacy.bytes(
+        "GET / HTTP/1.1\r\nHost: 127.0.0.1:%d\r\nUpgrade: websocket\r\n"
+        "Connection: Upgrade\r\nSec-WebSocket-Key: %s\r\n"
+        "Sec-WebSocket-Version: 13\r\n\r\n" % (port, netius.legacy.str(key))
+    )
+
+    def lane(quota):
+        _socket = _connect(port)
+        buffer = [b""]
+        try:
+            _socket.sendall(handshake)
+            _read_until(_socket, b"\r\n\r\n", buffer)
+            for _index in netius.legacy.xrange(quota):
+                start = base.clock()
+                _socket.sendall(frame)
+                header = _read_exact(_socket, 2, buffer)
+                length = netius.legacy.ord(header[1]) & 0x7F
+                if length == 126:
+                    length = struct.unpack("!H", _read_exact(_socket, 2, buffer))[0]
+                elif length == 127:
+                    length = struct.unpack("!Q", _read_exact(_socket, 8, buffer))[0]
+                _read_exact(_socket, length, buffer)
+                yield base.clock() - start, length
+        finally:
+            _socket.close()
+
+    return Lanes(lane, count, concurrency).run()
+
+
+def _connect(port):
+    _socket = socket.create_connection(("127.0.0.1", port))
+    _socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return _socket
+
+
+def _fill(_socket, buffer):
+    data = _socket.recv(BUFFER_SIZE)
+    if not data:
+        raise netius.NetiusError("Connection closed by peer")
+    buffer[0] += data
+
+
+def _read_exact(_socket, size, buffer):
+    while len(buffer[0]) < size:
+        _fill(_socket, buffer)
+    data, buffer[0] = buffer[0][:size], buffer[0][size:]
+    return data
+
+
+def _read_until(_socket, token, buffer):
+    while True:
+        index = buffer[0].find(token)
+        if not index == -1:
+            break
+        _fill(_socket, buffer)
+    index += len(token)
+    data, buffer[0] = buffer[0][:index], buffer[0][index:]
+    return data
+
+
+def _read_http(_socket, buffer):
+    """
+    Reads a complete HTTP/1.1 response from the provided socket,
+    returning the size of its body and if the connection is meant
+    to be closed by the server after it (no keep alive).
+    """
+
+    # reads the complete set of headers of the response and tries
+    # to find out the way the body is delimited, either by the content
+    # length, by the chunked encoding or by the closing of the connection
+    headers = _read_until(_socket, b"\r\n\r\n", buffer).lower()
+    length = None
+    close = False
+    for line in headers.split(b"\r\n")[1:]:
+        name, _sep, value = line.partition(b":")
+        if name == b"content-length":
+            length = int(value)
+        if name == b"transfer-encoding" and b"chunked" in value:
+            length = -1
+        if name == b"connection" and b"close" in value:
+            close = True
+
+    # in case the content length is defined reads exactly that amount
+    # of bytes from the socket, this should be the most common case
+    if length and length > 0:
+        return len(_read_exact(_socket, length, buffer)), close
+    if length == 0:
+        return 0, close
+
+    # in case the response is chunked iterates over the complete set
+    # of chunks until the last (empty) one is found, discarding the
+    # trailer that is expected to be empty
+    if length == -1:
+        size = 0
+        while True:
+            line = _read_until(_socket, b"\r\n", buffer)
+            chunk = int(line.split(b";")[0], 16)
+            _read_exact(_socket, chunk + 2, buffer)
+            if chunk == 0:
+                return size, close
+            size += chunk
+
+    # otherwise the body is delimited by the closing of the connection
+    # so the socket is read until there's no more data available
+    while True:
+        data = _socket.recv(BUFFER_SIZE)
+        if not data:
+            break
+        buffer[0] += data
+    size, buffer[0] = len(buffer[0]), b""
+    return size, True
+
+
+def _read_http2(_socket, buffer, stream):
+    size = 0
+    while True:
+        header = _read_exact(_socket, HTTP2_FRAME.size, buffer)
+        length_h, length_l, type, flags, _stream = HTTP2_FRAME.unpack(header)
+        _stream &= 0x7FFFFFFF
+        length = (length_h << 16) + length_l
+        payload = _read_exact(_socket, length, buffer)
+
+        # handles the control frames that require an answer from the
+        # client side, the settings acknowledgement, the ping answer and
+        # the window update that keeps the flow control window open
+        if type == 0x04 and not flags & 0x01:
+            _socket.sendall(_frame(0x04, 0x01, 0))
+        elif type == 0x06 and not flags & 0x01:
+            _socket.sendall(_frame(0x06, 0x01, 0, payload))
+        elif type == 0x07:
+            raise netius.NetiusError("Connection terminated by peer (GOAWAY)")
+        elif type == 0x00 and length:
+            size += length
+            _socket.sendall(_frame(0x08, 0x00, 0, struct.pack("!I", length)))
+
+        # in case the frame is the one that closes the stream that is
+        # currently being waited, returns the size of the payload
+        if _stream == stream and type in (0x00, 0x01) and flags & 0x01:
+            return size
+
+
+def _frame(type, flags, stream, payload=b""):
+    length = len(payload)
+    header = HTTP2_FRAME.pack(length >> 16, length & 0xFFFF, type, flags, stream)
+    return header + payload
+
+
+def _literal(index, value):
+    return netius.legacy.chr(index) + netius.legacy.chr(len(value)) + value
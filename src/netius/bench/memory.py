@@ -0,0 +1,123 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+"""netius.bench.memory
+
+Benchmark of the memory footprint of idle connections, accepts
+(in process) a large number of connections in the stream, HTTP,
+HTTP/2 and WebSocket servers, without any traffic, measuring the
+number of bytes allocated per connection (and its parser).
+
+Example:
+    python -m netius.bench.memory run 10000
+"""
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import gc
+import socket
+
+import netius
+import netius.servers
+
+from . import base
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+SERVERS = (
+    ("stream", netius.StreamServer, dict()),
+    ("http", netius.servers.HTTPServer, dict()),
+    ("http2_legacy", netius.servers.HTTP2Server, dict(legacy=True)),
+    ("http2", netius.servers.HTTP2Server, dict(legacy=False)),
+    ("ws", netius.servers.WSServer, dict()),
+)
+""" The sequence of servers to be measured, each of them with
+its name, class and the keyword arguments of the constructor """
+
+
+def measure(name, server_c, kwargs, count):
+    if not tracemalloc:
+        raise netius.NetiusError("Memory benchmark requires tracemalloc")
+
+    # creates the server and prepares it as if it was serving (poll
+    # opened and serve handler called) but without binding any socket
+    server = server_c(level="ERROR", **kwargs)
+    server.poll = server.build_poll()
+    server.poll.open()
+    server.on_serve()
+
+    # creates the (unconnected) sockets upfront so that their cost is
+    # not accounted, only the connection structures are measured
+    sockets = [socket.socket() for _index in netius.legacy.xrange(count)]
+    connections = []
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _peak = tracemalloc.get_traced_memory()
+        with base.Timer() as timer:
+            for index, _socket in enumerate(sockets):
+                connection = server.build_connection(
+                    _socket, address=("127.0.0.1", index)
+                )
+                connection.open()
+                connections.append(connection)
+        gc.collect()
+        after, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    for connection in connections:
+        connection.close()
+    for _socket in sockets:
+        _socket.close()
+    server.cleanup()
+
+    return dict(
+        name=name,
+        connections=count,
+        bytes=after - before,
+        per_connection=float(after - before) / count,
+        elapsed=timer.elapsed,
+    )
+
+
+def run(count="10000"):
+    results = []
+    for name, server_c, kwargs in SERVERS:
+        results.append(measure(name, server_c, kwargs, int(count)))
+    return base.output("memory", results)
+
+
+if __name__ == "__main__":
+    base.bench_call(globals(), locals())
+else:
+    __path__ = []
@@ -0,0 +1,133 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+"""netius.bench.parser
+
+Benchmark of the event dispatching of the observable structures
+and of the HTTP/1.1 parser (that triggers multiple events for each
+message). Measures the cost of triggering an event without any,
+with a single and with multiple listeners and the time taken to
+parse simple, chunked and pipelined requests.
+
+Example:
+    python -m netius.bench.parser run 100000,1000000
+"""
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import netius
+import netius.common
+
+from . import base
+
+SIMPLE = b"GET /hello HTTP/1.1\r\n\
+Host: localhost\r\n\
+User-Agent: netius/bench\r\n\
+Accept: */*\r\n\
+\r\n"
+""" The simple (no body) request, the most common one,
+that is going to be parsed by the benchmark """
+
+CHUNKED = b"POST /upload HTTP/1.1\r\n\
+Host: localhost\r\n\
+Transfer-Encoding: chunked\r\n\
+\r\n\
+5\r\n\
+Hello\r\n\
+6\r\n\
+ World\r\n\
+0\r\n\
+\r\n"
+""" The chunked request (multiple chunk events) that is
+going to be parsed by the benchmark """
+
+
+def measure_trigger(count, listeners=0):
+    observable = netius.Observable()
+    noop = lambda *args: None
+    for _index in range(listeners):
+        observable.bind("event", noop)
+
+    trigger = observable.trigger
+    with base.Timer() as timer:
+        for _index in netius.legacy.xrange(count):
+            trigger("event", observable, None)
+
+    return dict(
+        kind="trigger",
+        listeners=listeners,
+        count=count,
+        elapsed=timer.elapsed,
+        event=timer.elapsed / count * 1e9,
+    )
+
+
+def measure_parser(count, name="simple"):
+    data = dict(simple=SIMPLE, chunked=CHUNKED, pipelined=SIMPLE * 8)[name]
+    messages = data.count(b"HTTP/1.1")
+    finished = [0]
+
+    parser = netius.common.HTTPParser(None, type=netius.common.REQUEST)
+
+    def on_data():
+        finished[0] += 1
+        parser.clear()
+
+    parser.bind("on_data", on_data)
+
+    iterations = max(count // messages, 1)
+    with base.Timer() as timer:
+        for _index in netius.legacy.xrange(iterations):
+            view = data
+            while view:
+                size = parser.parse(view)
+                view = view[size:]
+
+    return dict(
+        kind="parser",
+        name=name,
+        count=finished[0],
+        elapsed=timer.elapsed,
+        message=timer.elapsed / max(finished[0], 1) * 1e9,
+    )
+
+
+def run(counts=None, parsers="simple,chunked,pipelined"):
+    results = []
+    for count in base.counts(counts, default=(100000,)):
+        for listeners in (0, 1, 3):
+            results.append(measure_trigger(count, listeners=listeners))
+        for name in parsers.split(","):
+            results.append(measure_parser(count, name=name))
+    return base.output("parser", results)
+
+
+if __name__ == "__main__":
+    base.bench_call(globals(), locals())
+else:
+    __path__ = []
@@ -0,0 +1,153 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+"""netius.bench.recv
+
+Benchmark of a raw proxy like relay workload (64 KiB per read),
+comparing the regular receive operation that allocates a new buffer
+for every read with the receive into operation that re-uses a single
+(per loop) buffer, in terms of buffer allocations and elapsed time.
+
+Example:
+    python -m netius.bench.recv run 1000,10000 65536
+"""
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import select
+import socket
+import threading
+
+import netius
+
+from . import base
+
+
+def feed(_socket, count, size):
+    chunk = b"x" * size
+    for _index in netius.legacy.xrange(count):
+        _socket.sendall(chunk)
+    _socket.shutdown(socket.SHUT_WR)
+
+
+def drain(_socket, received):
+    while True:
+        data = _socket.recv(1048576)
+        if not data:
+            break
+        received[0] += len(data)
+
+
+def measure(count, size, into=True):
+    source, upstream = socket.socketpair()
+    writer, reader = socket.socketpair()
+    writer.setblocking(False)
+
+    received = [0]
+    feeder = threading.Thread(target=feed, args=(upstream, count, size))
+    drainer = threading.Thread(target=drain, args=(reader, received))
+    feeder.daemon = True
+    drainer.daemon = True
+    feeder.start()
+    drainer.start()
+
+    owner = netius.Base()
+    owner.tid = threading.current_thread().ident
+
+    connection = netius.Connection(owner=owner, socket=source)
+    connection.status = netius.OPEN
+    peer = netius.Connection(owner=owner, socket=writer)
+    peer.status = netius.OPEN
+    peer.wready = True
+
+    view = memoryview(bytearray(size))
+    reads = 0
+    allocations = 0
+    allocated = 0
+
+    with base.Timer() as timer:
+        while True:
+            # reads the next block from the source connection, either
+            # into the re-used buffer or into a newly allocated one
+            if into:
+                data = connection.recv_into(view)
+            else:
+                data = connection.recv(size)
+                allocations += 1
+                allocated += size
+            if not data:
+                break
+            reads += 1
+
+            # relays the data to the peer connection, any part of it that
+            # could not be sent right away is copied into the pending
+            # buffer (counted as an allocation for the receive into case)
+            pending_s = peer.pending_s
+            peer.send(data, delay=False)
+            if into and peer.pending_s > pending_s:
+                allocations += 1
+                allocated += peer.pending_s - pending_s
+
+            # flushes the pending data of the peer connection (if any)
+            # waiting for the peer socket to become writable
+            while peer.pending:
+                select.select([], [writer], [])
+                peer.wready = True
+                peer._send()
+
+    writer.close()
+    feeder.join()
+    drainer.join()
+    source.close()
+    upstream.close()
+    reader.close()
+
+    return dict(
+        mode="recv_into" if into else "recv",
+        blocks=count,
+        size=size,
+        reads=reads,
+        allocations=allocations,
+        allocated=allocated,
+        received=received[0],
+        elapsed=timer.elapsed,
+    )
+
+
+def run(counts="1000,10000", size="65536"):
+    results = []
+    for count in base.counts(counts):
+        for into in (False, True):
+            results.append(measure(count, int(size), into=into))
+    return base.output("recv", results)
+
+
+if __name__ == "__main__":
+    base.bench_call(globals(), locals())
+else:
+    __path__ = []
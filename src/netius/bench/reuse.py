@@ -0,0 +1,160 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+"""netius.bench.reuse
+
+Benchmark of the distribution of the accept operations among the
+child processes of a forked server, comparing the shared listening
+socket mode (with and without the exclusive epoll wakeup) with the
+reuse port (worker) mode in which each child binds its own listening
+socket and the kernel balances the accepts.
+
+Example:
+    python -m netius.bench.reuse run 4 10000 16
+"""
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import os
+import time
+import signal
+import socket
+import threading
+import multiprocessing
+
+import netius
+import netius.common
+
+from . import base
+
+MODES = ("shared", "exclusive", "reuse_port")
+""" The sequence of listening modes to be compared, the shared
+socket one (with and without exclusive wakeup) and the reuse port
+one where each of the children has its own listening socket """
+
+
+class PIDConnection(netius.Connection):
+    pass
+
+
+class PIDServer(netius.StreamServer):
+    """
+    Simple server that replies to each new connection with the
+    PID of the process that accepted it, closing it afterwards.
+    """
+
+    def build_connection(self, socket, address, ssl=False):
+        return PIDConnection(owner=self, socket=socket, address=address, ssl=ssl)
+
+    def on_connection_c(self, connection):
+        netius.StreamServer.on_connection_c(self, connection)
+        data = netius.legacy.bytes("%d\n" % os.getpid())
+        connection.send(data, callback=lambda connection: connection.close())
+
+
+def serve(port, children, mode):
+    server = PIDServer(
+        children=children,
+        reuse_port=mode == "reuse_port",
+        exclusive=mode == "exclusive",
+        level="ERROR",
+    )
+    server.serve(port=port)
+
+
+def connect(port, count, pids):
+    for _index in netius.legacy.xrange(count):
+        _socket = socket.create_connection(("127.0.0.1", port))
+        try:
+            data = b""
+            while not data.endswith(b"\n"):
+                chunk = _socket.recv(64)
+                if not chunk:
+                    break
+                data += chunk
+        finally:
+            _socket.close()
+        pids.append(int(data))
+
+
+def measure(children, count, concurrency, mode="reuse_port"):
+    port = base.free_port()
+    process = multiprocessing.Process(target=serve, args=(port, children, mode))
+    process.daemon = True
+    process.start()
+
+    try:
+        base.wait_port(port)
+        time.sleep(0.5)
+
+        pids = []
+        threads = [
+            threading.Thread(target=connect, args=(port, count // concurrency, pids))
+            for _index in range(concurrency)
+        ]
+        with base.Timer() as timer:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+    finally:
+        os.kill(process.pid, signal.SIGTERM)
+        process.join(10.0)
+
+    distribution = dict()
+    for pid in pids:
+        distribution[pid] = distribution.get(pid, 0) + 1
+    accepts = sorted(distribution.values(), reverse=True)
+    accepts += [0] * (children - len(accepts))
+    mean = float(len(pids)) / children
+
+    return dict(
+        mode=mode,
+        children=children,
+        connections=len(pids),
+        concurrency=concurrency,
+        accepts=accepts,
+        spread=(accepts[0] - accepts[-1]) / mean,
+        deviation=(sum((value - mean) ** 2 for value in accepts) / children) ** 0.5
+        / mean,
+        elapsed=timer.elapsed,
+    )
+
+
+def run(children="4", count="10000", concurrency="16"):
+    results = []
+    for _children in base.counts(children):
+        for mode in MODES:
+            results.append(measure(_children, int(count), int(concurrency), mode=mode))
+    return base.output("reuse", results)
+
+
+if __name__ == "__main__":
+    base.bench_call(globals(), locals())
+else:
+    __path__ = []
@@ -0,0 +1,111 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+"""netius.bench.scheduler
+
+Benchmark of the delayed call schedulers (heap and timing wheel)
+under a large number of pending timers. Measures the insertion of
+timers with keep-alive like timeouts, the cancellation of half of
+them (typical of connections that see traffic) and the expiration
+of the remaining ones.
+
+Example:
+    python -m netius.bench.scheduler run 10000,100000,1000000
+"""
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import time
+import random
+
+import netius
+
+from . import base
+
+TIMEOUT = 300.0
+""" The maximum timeout (in seconds) for the timers that are
+going to be created, values are randomly distributed up to it """
+
+
+def measure(scheduler_c, count, seed=0):
+    _random = random.Random(seed)
+    scheduler = scheduler_c()
+    current = time.time()
+    noop = lambda: None
+
+    timers = []
+    for index in netius.legacy.xrange(count):
+        target = current + _random.uniform(0.0, TIMEOUT)
+        callable_t = (target, index, noop, 0, [True])
+        timers.append(netius.legacy.orderable(callable_t))
+
+    with base.Timer() as push:
+        for callable_t in timers:
+            scheduler.push(callable_t)
+
+    with base.Timer() as cancel:
+        for callable_t in timers[::2]:
+            scheduler.cancel(callable_t)
+
+    expired = 0
+    with base.Timer() as pop:
+        target = current + TIMEOUT + 1.0
+        while True:
+            callable_t = scheduler.pop(target)
+            if not callable_t:
+                break
+            if not callable_t[4][0]:
+                continue
+            expired += 1
+
+    return dict(
+        scheduler=scheduler_c.name(),
+        count=count,
+        expired=expired,
+        push=push.elapsed,
+        cancel=cancel.elapsed,
+        pop=pop.elapsed,
+        total=push.elapsed + cancel.elapsed + pop.elapsed,
+    )
+
+
+def run(counts=None, schedulers="heap,wheel"):
+    results = []
+    names = schedulers.split(",")
+    for count in base.counts(counts):
+        for scheduler_c in (netius.HeapScheduler, netius.WheelScheduler):
+            if not scheduler_c.name() in names:
+                continue
+            results.append(measure(scheduler_c, count))
+    return base.output("scheduler", results)
+
+
+if __name__ == "__main__":
+    base.bench_call(globals(), locals())
+else:
+    __path__ = []
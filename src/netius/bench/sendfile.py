@@ -0,0 +1,167 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+"""netius.bench.sendfile
+
+Benchmark of the file server serving a single large (1 GiB by
+default) file through the loopback interface, comparing the buffered
+path (the file is read into Python in chunks) with the sendfile path
+(the data goes directly from the file descriptor into the socket).
+Reports the throughput of the transfer and the CPU time consumed by
+the server process (when available) for each of the paths.
+
+Example:
+    python -m netius.bench.sendfile run 1024 3
+"""
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import os
+import shutil
+import tempfile
+
+import netius
+import netius.extra
+
+from . import base
+from . import load
+from . import servers
+
+BUFFER_SIZE = 262144
+""" The size of the buffer used by the client to receive the
+file, large enough so that the client is not the bottleneck """
+
+
+def serve_file(port, base_path, sendfile):
+    server = netius.extra.FileServer(
+        base_path=base_path, sendfile=sendfile, level="ERROR"
+    )
+    server.serve(port=port)
+
+
+def cpu_time(pid):
+    """
+    Retrieves the CPU time (user and system) in seconds consumed
+    so far by the process with the provided identifier, using the
+    proc file system (only available in Linux).
+
+    :type pid: int
+    :param pid: The identifier of the process to be inspected.
+    :rtype: float
+    :return: The CPU time consumed by the process or an invalid
+    value in case it's not possible to retrieve it.
+    """
+
+    path = "/proc/%d/stat" % pid
+    if not os.path.exists(path):
+        return None
+    file = open(path, "r")
+    try:
+        values = file.read().rsplit(")", 1)[1].split()
+    finally:
+        file.close()
+    ticks = os.sysconf("SC_CLK_TCK")
+    return (int(values[11]) + int(values[12])) / float(ticks)
+
+
+def download(port, path="/file.bin"):
+    _socket = load._connect(port)
+    buffer = bytearray(BUFFER_SIZE)
+    view = memoryview(buffer)
+    size = 0
+    try:
+        request = "GET %s HTTP/1.1\r\nHost: 127.0.0.1:%d\r\n\r\n" % (path, port)
+        _socket.sendall(netius.legacy.bytes(request))
+        data = b""
+        while not b"\r\n\r\n" in data:
+            data += _socket.recv(BUFFER_SIZE)
+        headers, body = data.split(b"\r\n\r\n", 1)
+        for line in headers.lower().split(b"\r\n")[1:]:
+            name, _sep, value = line.partition(b":")
+            if name == b"content-length":
+                size = int(value)
+        received = len(body)
+        while received < size:
+            count = _socket.recv_into(view)
+            if not count:
+                raise netius.NetiusError("Connection closed by peer")
+            received += count
+    finally:
+        _socket.close()
+    return size
+
+
+def measure(size, count, sendfile):
+    base_path = tempfile.mkdtemp()
+    process = None
+    try:
+        # creates the (sparse) file to be served, so that no extra disk
+        # space is required, the pages are served from the page cache
+        file = open(os.path.join(base_path, "file.bin"), "wb")
+        try:
+            file.truncate(size)
+        finally:
+            file.close()
+
+        port, process = servers.start(serve_file, base_path, sendfile)
+        cpu = cpu_time(process.pid)
+        transferred = 0
+
+        with base.Timer() as timer:
+            for _index in netius.legacy.xrange(count):
+                transferred += download(port)
+
+        _cpu = cpu_time(process.pid)
+        cpu = _cpu - cpu if not _cpu == None and not cpu == None else None
+    finally:
+        if process:
+            servers.stop(process)
+        shutil.rmtree(base_path, ignore_errors=True)
+
+    return dict(
+        sendfile=sendfile,
+        size=size,
+        count=count,
+        elapsed=timer.elapsed,
+        throughput=transferred / timer.elapsed if timer.elapsed else 0.0,
+        server_cpu=cpu,
+    )
+
+
+def run(size="1024", count="3"):
+    size = int(size) * 1024 * 1024
+    results = []
+    for sendfile in (False, True):
+        results.append(measure(size, int(count), sendfile))
+    return base.output("sendfile", results)
+
+
+if __name__ == "__main__":
+    base.bench_call(globals(), locals())
+else:
+    __path__ = []
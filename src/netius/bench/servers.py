@@ -0,0 +1,242 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+"""netius.bench.servers
+
+Reproducible loopback benchmarks of the complete servers, each of
+the scenarios starts the server under test in a separate process and
+then loads it using one of the load generators (raw sockets or the
+Netius HTTP client), reporting the rate, throughput and latency
+percentiles of each of the runs.
+
+Example:
+    python -m netius.bench.servers run hello,echo 10000 16
+"""
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import os
+import time
+import shutil
+import signal
+import tempfile
+import multiprocessing
+
+import netius
+import netius.extra
+import netius.servers
+
+from . import base
+from . import load
+
+SCENARIOS = (
+    "hello",
+    "hello_h2",
+    "wsgi",
+    "proxy",
+    "file_small",
+    "file_large",
+    "echo",
+    "ws",
+)
+""" The sequence containing the names of the complete set of
+scenarios to be run by default, in the order they are run """
+
+SMALL_SIZE = 1024
+""" The size in bytes of the small file served by the file
+server scenario, meant to measure the per request overhead """
+
+LARGE_SIZE = 16 * 1024 * 1024
+""" The size in bytes of the large file served by the file
+server scenario, meant to measure the throughput """
+
+LARGE_RATIO = 100
+""" The ratio between the number of requests of the regular
+scenarios and the ones of the large file scenario """
+
+
+def serve_hello(port, legacy=True):
+    server = netius.extra.HelloServer(legacy=legacy, level="ERROR")
+    server.serve(port=port, env=True)
+
+
+def serve_wsgi(port):
+    def app(environ, start_response):
+        headers = [("Content-Type", "text/plain"), ("Content-Length", "11")]
+        start_response("200 OK", headers)
+        return [b"Hello World"]
+
+    server = netius.servers.WSGIServer(app=app, level="ERROR")
+    server.serve(port=port)
+
+
+def serve_proxy(port, backend):
+    server = netius.extra.ReverseProxyServer(
+        hosts=dict(default="http://127.0.0.1:%d" % backend),
+        resolve=False,
+        level="ERROR",
+    )
+    server.serve(port=port)
+
+
+def serve_file(port, base_path):
+    server = netius.extra.FileServer(base_path=base_path, level="ERROR")
+    server.serve(port=port)
+
+
+def serve_echo(port):
+    # uses the asyncio compatible API of the loop (as the runners do)
+    # so that a new echo protocol is created for each connection
+    loop = netius.get_loop(_compat=True)
+    create = loop.create_server(netius.servers.EchoProtocol, "127.0.0.1", port)
+    loop.run_until_complete(create)
+    loop.run_forever()
+    loop.close()
+
+
+def serve_ws(port):
+    server = netius.servers.EchoWSServer(level="ERROR")
+    server.serve(port=port)
+
+
+def start(target, *args):
+    port = base.free_port()
+    process = multiprocessing.Process(target=target, args=(port,) + args)
+    process.daemon = True
+    process.start()
+    base.wait_port(port)
+    return port, process
+
+
+def stop(*processes):
+    for process in processes:
+        os.kill(process.pid, signal.SIGTERM)
+        process.join(10.0)
+
+
+def measure(name, count, concurrency):
+    """
+    Runs the scenario with the provided name, starting the required
+    server(s) and running the associated load generator(s) against it.
+
+    :type name: String
+    :param name: The name of the scenario to be run.
+    :type count: int
+    :param count: The number of requests (round trips) to be issued.
+    :type concurrency: int
+    :param concurrency: The number of concurrent connections.
+    :rtype: List
+    :return: The sequence of results, one per load generator.
+    """
+
+    results = []
+    processes = []
+    base_path = None
+
+    def result(generator, summary, **kwargs):
+        summary.update(
+            name=name, generator=generator, concurrency=concurrency, **kwargs
+        )
+        results.append(summary)
+
+    try:
+        if name == "hello":
+            port, process = start(serve_hello)
+            processes.append(process)
+            result("raw", load.http_raw(port, count, concurrency))
+            result("client", load.http_client(port, count, concurrency))
+
+        elif name == "hello_h2":
+            # the HTTP/2 support of the server depends on the hpack
+            # library, in case it's not available the scenario is skipped
+            if not netius.servers.HTTP2Server._has_hpack():
+                results.append(dict(name=name, skipped="hpack not available"))
+                return results
+            port, process = start(serve_hello, False)
+            processes.append(process)
+            result("raw", load.http2_raw(port, count, concurrency))
+
+        elif name == "wsgi":
+            port, process = start(serve_wsgi)
+            processes.append(process)
+            result("raw", load.http_raw(port, count, concurrency))
+
+        elif name == "proxy":
+            backend, process = start(serve_hello)
+            processes.append(process)
+            port, process = start(serve_proxy, backend)
+            processes.append(process)
+            result("raw", load.http_raw(port, count, concurrency))
+
+        elif name in ("file_small", "file_large"):
+            small = name == "file_small"
+            size = SMALL_SIZE if small else LARGE_SIZE
+            count = count if small else max(count // LARGE_RATIO, concurrency)
+            base_path = tempfile.mkdtemp()
+            file = open(os.path.join(base_path, "file.bin"), "wb")
+            try:
+                file.write(os.urandom(size))
+            finally:
+                file.close()
+            port, process = start(serve_file, base_path)
+            processes.append(process)
+            result("raw", load.http_raw(port, count, concurrency, path="/file.bin"))
+
+        elif name == "echo":
+            port, process = start(serve_echo)
+            processes.append(process)
+            result("raw", load.echo_raw(port, count, concurrency))
+
+        elif name == "ws":
+            port, process = start(serve_ws)
+            processes.append(process)
+            result("raw", load.ws_raw(port, count, concurrency))
+
+        else:
+            raise netius.NetiusError("Invalid scenario '%s'" % name)
+    finally:
+        stop(*processes)
+        if base_path:
+            shutil.rmtree(base_path, ignore_errors=True)
+
+    return results
+
+
+def run(names="", count="10000", concurrency="16"):
+    names = [name for name in names.split(",") if name] or SCENARIOS
+    results = []
+    for name in names:
+        results.extend(measure(name, int(count), int(concurrency)))
+        time.sleep(0.5)
+    return base.output("servers", results)
+
+
+if __name__ == "__main__":
+    base.bench_call(globals(), locals())
+else:
+    __path__ = []
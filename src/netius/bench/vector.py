@@ -0,0 +1,147 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+"""netius.bench.vector
+
+Benchmark of the connection flush operation for chunked HTTP like
+responses (headers plus many small chunk parts), comparing the plain
+single buffer send strategy with the vectored (scatter-gather) one,
+in terms of elapsed time and number of send system calls.
+
+Example:
+    python -m netius.bench.vector run 1000,10000 64
+"""
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import errno
+import select
+import socket
+import threading
+
+import netius
+
+from . import base
+
+HEADERS = b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+""" The headers of the chunked response that is going to be
+sent before the complete set of chunk parts """
+
+
+class CountingSocket(object):
+    """
+    Socket wrapper that counts the number of send related
+    calls (system calls) performed on the underlying socket.
+    """
+
+    def __init__(self, socket):
+        self.socket = socket
+        self.calls = 0
+
+    def __getattr__(self, name):
+        return getattr(self.socket, name)
+
+    def send(self, data):
+        self.calls += 1
+        return self.socket.send(data)
+
+    def sendmsg(self, buffers):
+        self.calls += 1
+        return self.socket.sendmsg(buffers)
+
+
+def drain(_socket):
+    while True:
+        data = _socket.recv(1048576)
+        if not data:
+            break
+
+
+def measure(count, size, vectored=True):
+    writer, reader = socket.socketpair()
+    writer.setblocking(False)
+    thread = threading.Thread(target=drain, args=(reader,))
+    thread.daemon = True
+    thread.start()
+
+    owner = netius.Base()
+    owner.tid = threading.current_thread().ident
+
+    _socket = CountingSocket(writer)
+    connection = netius.Connection(owner=owner, socket=_socket)
+    connection.vectored = vectored
+
+    chunk = b"x" * size
+    sent = [0]
+
+    def callback(connection):
+        sent[0] += 1
+
+    with base.Timer() as timer:
+        connection.pend((HEADERS, None, None))
+        for _index in netius.legacy.xrange(count):
+            connection.pend((netius.legacy.bytes("%x\r\n" % size), None, None))
+            connection.pend((chunk, None, None))
+            connection.pend((b"\r\n", None, callback))
+        connection.pend((b"0\r\n\r\n", None, None))
+
+        while connection.pending:
+            try:
+                connection._send()
+            except socket.error as exception:
+                if not exception.args[0] in (errno.EWOULDBLOCK, errno.EAGAIN):
+                    raise
+                select.select([], [writer], [])
+
+    writer.close()
+    thread.join()
+    reader.close()
+
+    return dict(
+        mode="vectored" if vectored else "plain",
+        chunks=count,
+        size=size,
+        buffers=count * 3 + 2,
+        calls=_socket.calls,
+        elapsed=timer.elapsed,
+        callbacks=sent[0],
+    )
+
+
+def run(counts="1000,10000,100000", size="64"):
+    results = []
+    for count in base.counts(counts):
+        for vectored in (False, True):
+            results.append(measure(count, int(size), vectored=vectored))
+    return base.output("vector", results)
+
+
+if __name__ == "__main__":
+    base.bench_call(globals(), locals())
+else:
+    __path__ = []
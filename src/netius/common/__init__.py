@@ -190,6 +190,7 @@ from .util import (
     string_to_bits,
     integer_to_bytes,
     bytes_to_integer,
+    find_bytes,
     random_integer,
     host,
     hostname,
@@ -187,6 +187,43 @@ class HTTPParser(parser.Parser):
     parsing. But the object itself is not thread safe.
     """
 
+    __slots__ = (
+        "type",
+        "store",
+        "file_limit",
+        "state",
+        "buffer",
+        "headers",
+        "message",
+        "method",
+        "version",
+        "code",
+        "status",
+        "keep_alive",
+        "line_s",
+        "headers_s",
+        "method_s",
+        "path_s",
+        "version_s",
+        "code_s",
+        "status_s",
+        "connection_s",
+        "message_s",
+        "message_f",
+        "content_l",
+        "message_l",
+        "transfer_e",
+        "encodings",
+        "chunked",
+        "chunk_d",
+        "chunk_l",
+        "chunk_s",
+        "chunk_e",
+        "connection",
+        "states",
+        "state_l",
+    )
+
     FIELDS = (
         "_pid",
         "type",
@@ -319,6 +356,20 @@ class HTTPParser(parser.Parser):
         if hasattr(self, "message_f") and self.message_f:
             self.message_f.close()
 
+    def is_idle(self):
+        """
+        Determines if the parser is waiting for the start of a new
+        message, meaning that the previous message has been completely
+        parsed and that no (partial) data of a new one has been received.
+
+        :rtype: bool
+        :return: If no message is currently being parsed.
+        """
+
+        if self.state == FINISH_STATE:
+            return True
+        return self.state == LINE_STATE and not self.buffer
+
     def get_path(self, normalize=False):
         """
         Retrieves the path associated with the request, this
@@ -565,9 +616,10 @@ class HTTPParser(parser.Parser):
 
         # in case not all of the data has been processed
         # must add it to the buffer so that it may be used
-        # latter in the next parsing of the message
+        # latter in the next parsing of the message, note
+        # that memory views must be copied as they are volatile
         if size > 0:
-            self.buffer.append(data)
+            self.buffer.append(netius.legacy.bytes(data))
 
         # returns the number of read (processed) bytes of the
         # data that has been sent to the parser
@@ -577,7 +629,7 @@ class HTTPParser(parser.Parser):
         # tries to find the final newline value in the provided
         # data in case there's one it's considered that the the
         # initial line must have been found
-        index = data.find(b"\n")
+        index = util.find_bytes(data, b"\n")
         if index == -1:
             return 0
 
@@ -586,7 +638,7 @@ class HTTPParser(parser.Parser):
         # should not include the final newline characters, after that
         # the buffer is cleared as new data is going to be stored for
         # (remaining part of the request or response)
-        self.buffer.append(data[:index])
+        self.buffer.append(netius.legacy.bytes(data[:index]))
         self.line_s = b"".join(self.buffer).rstrip()
         self.line_s = netius.legacy.str(self.line_s)
         del self.buffer[:]
@@ -637,7 +689,7 @@ class HTTPParser(parser.Parser):
         # joins it to retrieve the current complete buffer
         # string to be used in the finding of the end of
         # header sequence (required for complete parsing)
-        buffer_t = self.buffer + [data]
+        buffer_t = self.buffer + [netius.legacy.bytes(data)]
         buffer_s = b"".join(buffer_t)
 
         # tries to find the end of headers sequence in case
@@ -868,7 +920,8 @@ class HTTPParser(parser.Parser):
             # and the chunk event must be triggered
             else:
                 self.chunk_e = len(self.message)
-                self.trigger("on_chunk", (self.chunk_s, self.chunk_e))
+                if self.has_listeners("on_chunk"):
+                    self.trigger("on_chunk", (self.chunk_s, self.chunk_e))
 
             # in case the message is not meant to be stored or in
             # case the file storage mode is active (spares memory),
@@ -888,14 +941,14 @@ class HTTPParser(parser.Parser):
         if is_start:
             # tries to find the separator of the initial value for
             # the chunk in case it's not found returns immediately
-            index = data.find(b"\n")
+            index = util.find_bytes(data, b"\n")
             if index == -1:
                 return 0
 
             # some of the current data to the buffer and then re-joins
             # it as the header value, then removes the complete set of
             # contents from the buffer so that it may be re-used
-            self.buffer.append(data[:index])
+            self.buffer.append(netius.legacy.bytes(data[:index]))
             header = b"".join(self.buffer)[:-1]
             del self.buffer[:]
 
@@ -930,7 +983,7 @@ class HTTPParser(parser.Parser):
         # it's possible to refer the chunk as a tuple of start and end indexes when
         # triggering the chunk parsed (on chunk) event (performance gains)
         if data:
-            self.message.append(data)
+            self.message.append(netius.legacy.bytes(data))
         if data and self.store:
             self._store_data(data, memory=False)
         self.chunk_l -= data_s
@@ -951,7 +1004,7 @@ class HTTPParser(parser.Parser):
         if self.message_f:
             self.message_f.write(data)
         elif memory:
-            self.message.append(data)
+            self.message.append(netius.legacy.bytes(data))
 
     def _parse_query(self, query):
         # runs the "default" parsing of the query string from the system
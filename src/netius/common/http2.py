@@ -172,6 +172,32 @@ HTTP2_SETTINGS_OPTIMAL_T = netius.legacy.items(HTTP2_SETTINGS_OPTIMAL)
 
 class HTTP2Parser(parser.Parser):
 
+    __slots__ = (
+        "store",
+        "file_limit",
+        "state",
+        "buffer",
+        "keep_alive",
+        "payload",
+        "length",
+        "type",
+        "flags",
+        "stream",
+        "stream_o",
+        "end_headers",
+        "last_type",
+        "last_stream",
+        "last_end_headers",
+        "connection",
+        "states",
+        "state_l",
+        "parsers",
+        "streams",
+        "_max_stream",
+        "_encoder",
+        "_decoder",
+    )
+
     FIELDS = (
         "_pid",
         "store",
@@ -356,9 +382,10 @@ class HTTP2Parser(parser.Parser):
 
         # in case not all of the data has been processed
         # must add it to the buffer so that it may be used
-        # latter in the next parsing of the message
+        # latter in the next parsing of the message, note
+        # that memory views must be copied as they are volatile
         if size > 0:
-            self.buffer.append(data)
+            self.buffer.append(netius.legacy.bytes(data))
 
         # returns the number of read (processed) bytes of the
         # data that has been sent to the parser
@@ -567,7 +594,7 @@ class HTTP2Parser(parser.Parser):
             return -1
 
         size = HEADER_SIZE - self.buffer_size
-        data = self.buffer_data + data[:size]
+        data = self.buffer_data + netius.legacy.bytes(data[:size])
 
         header = struct.unpack("!BHBBI", data)
         extra, self.length, self.type, self.flags, self.stream = header
@@ -585,7 +612,7 @@ class HTTP2Parser(parser.Parser):
             return -1
 
         size = self.length - self.buffer_size
-        data = self.buffer_data + data[:size]
+        data = self.buffer_data + netius.legacy.bytes(data[:size])
 
         valid_type = self.type < len(self.parsers)
         if not valid_type:
@@ -43,6 +43,8 @@ import netius
 
 class Parser(netius.Observable):
 
+    __slots__ = ("owner", "_pid")
+
     FIELDS = ("_pid",)
 
     def __init__(self, owner):
@@ -38,6 +38,7 @@ __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
 import os
+import re
 import math
 import socket
 import collections
@@ -71,6 +72,11 @@ _HOST = None
 this value is used to avoid an excessive blocking in the
 get host by name call, as it is a blocking call """
 
+_FIND_REGEX = dict()
+""" The map that associates the byte sequences searched in
+memory views with the compiled regular expressions, avoiding
+the compilation of the expression for each search """
+
 
 def cstring(value):
     index = value.index("\0")
@@ -212,6 +218,38 @@ def bytes_to_integer(bytes):
     return number
 
 
+def find_bytes(data, value, start=0):
+    """
+    Finds the index of the first occurrence of the provided value
+    in the data buffer, supporting memory views (without copying
+    their contents) besides the plain bytes buffers.
+
+    Under Python 2 the regular expression engine is not able to
+    handle memory views so the view contents are copied instead.
+
+    :type data: String
+    :param data: The bytes buffer or memory view to search in.
+    :type value: String
+    :param value: The sequence of bytes to be searched for.
+    :type start: int
+    :param start: The index from which the search is started.
+    :rtype: int
+    :return: The index of the first occurrence of the value or
+    minus one in case the value has not been found.
+    """
+
+    if not type(data) == memoryview:
+        return data.find(value, start)
+    if not netius.legacy.PYTHON_3:
+        return data.tobytes().find(value, start)
+    regex = _FIND_REGEX.get(value, None)
+    if not regex:
+        regex = re.compile(re.escape(value))
+        _FIND_REGEX[value] = regex
+    match = regex.search(data, start)
+    return match.start() if match else -1
+
+
 def random_integer(number_bits):
     """
     Generates a random integer of approximately the
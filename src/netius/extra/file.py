@@ -25,7 +25,14 @@ Static file server that exposes a base path over HTTP, serving files
 and rendering directory listings in several styles (base, apache and
 legacy). Supports byte range requests for partial downloads, ETag
 based caching and optional cross origin resource sharing. Reading is
-synchronous, so the loop blocks during file I/O operations.
+synchronous, so the loop blocks during file I/O operations, the file
+system metadata (and optionally the descriptors) of the served paths
+is kept in a bounded cache revalidated after a short period, and small
+files are served from an in-memory object cache holding both their
+identity and (pre-)gzipped bodies. Directory listings are scanned in
+batches (interleaved with the loop), cached while the directory does not
+change and streamed (chunked) to the client, optionally paginated or
+rendered as JSON.
 
 Example:
     BASE_PATH=. python -m netius.extra.file
@@ -42,8 +49,14 @@ __license__ = "Apache License, Version 2.0"
 
 import os
 import re
+import stat
+import time
+import zlib
+import json
 import datetime
+import threading
 import mimetypes
+import collections
 
 import netius.common
 import netius.servers
@@ -66,6 +79,828 @@ EMPTY_GIF = "data:image/gif;base64,R0lGODlhAQABAAAAACH5BAEKAAEALAAAAAABAAEAAAICT
 corruption while rendering empty images on browser """
 
 
+META_SIZE = 1024
+""" The default maximum number of paths (entries) kept in the
+file system metadata cache of the server, zero disables it """
+
+META_TTL = 1.0
+""" The default amount of time (in seconds) during which the cached
+metadata of a path is used without being revalidated (stat call) """
+
+
+OBJECT_BUDGET = 16777216
+""" The default maximum amount of memory (in bytes) used by the
+bodies stored in the in-memory object cache, zero disables it """
+
+OBJECT_MAX = 262144
+""" The default maximum size (in bytes) of a file for it to be
+considered eligible for storage in the in-memory object cache """
+
+OBJECT_POLICY = "lru"
+""" The default eviction policy of the in-memory object cache,
+either least recently used (lru) or least frequently used (lfu) """
+
+OBJECT_POLICIES = ("lru", "lfu")
+""" The sequence containing the names of the eviction policies
+that are supported by the in-memory object cache """
+
+
+LIST_BUDGET = 262144
+""" The default maximum number of directory entries kept (in total)
+by the cache of directory listings, zero disables the cache """
+
+LIST_TTL = 1.0
+""" The default amount of time (in seconds) during which a cached
+listing of a directory is used, as changes to the files contained
+in it (size or modification time) do not change the directory """
+
+LIST_BATCH = 1024
+""" The number of directory entries scanned in each iteration of the
+loop while listing a directory, keeps the loop responsive """
+
+
+class FileMeta(object):
+    """
+    Metadata of a file system path (as resolved by the file server)
+    gathered from a single stat call, including the values derived
+    from it that are used in the response (eg: ETag and MIME type).
+
+    May hold an open (read only) descriptor of the file that is then
+    shared by the connections serving it, closed once the entry is
+    evicted from the cache and no connection is using it anymore.
+    """
+
+    _LOCK = threading.Lock()
+    """ The lock that guards the reference counting of the shared
+    descriptors, as they may be released from other threads (eg: the
+    file pool) and the metadata may be shared by multiple loops """
+
+    __slots__ = (
+        "path",
+        "exists",
+        "is_dir",
+        "size",
+        "mtime",
+        "etag",
+        "type",
+        "fd",
+        "refs",
+        "evicted",
+        "checked",
+    )
+
+    def __init__(self, path, _stat=None, checked=0.0):
+        self.path = path
+        self.exists = not _stat == None
+        self.is_dir = self.exists and stat.S_ISDIR(_stat.st_mode)
+        self.size = _stat.st_size if self.exists else 0
+        self.mtime = _stat.st_mtime if self.exists else 0.0
+        self.etag = "netius-%.2f" % self.mtime
+        self.type = None
+        self.fd = None
+        self.refs = 0
+        self.evicted = False
+        self.checked = checked
+
+        # tries to guess the mime type of the file, this may fail as it's
+        # not always possible to determine the correct mime type for a file
+        # for such situations the default (binary) mime type is used
+        if self.exists and not self.is_dir:
+            type, _encoding = mimetypes.guess_type(path, strict=True)
+            self.type = type or "application/octet-stream"
+
+    @classmethod
+    def build(cls, path, checked=0.0):
+        try:
+            _stat = os.stat(path)
+        except (OSError, ValueError):
+            _stat = None
+        return cls(path, _stat=_stat, checked=checked)
+
+    def same(self, other):
+        return (
+            self.exists == other.exists
+            and self.is_dir == other.is_dir
+            and self.size == other.size
+            and self.mtime == other.mtime
+        )
+
+    def open(self):
+        """
+        Opens the file described by the metadata for reading, using
+        the shared descriptor (when available) so that no system call
+        is required, otherwise a new file object is opened.
+
+        :rtype: File
+        :return: The file like object to be used to read the file,
+        that must be closed once the file is no longer needed.
+        """
+
+        self._LOCK.acquire()
+        try:
+            shared = not self.fd == None
+            if shared:
+                self.refs += 1
+        finally:
+            self._LOCK.release()
+        if not shared:
+            return open(self.path, "rb")
+        return SharedFile(self)
+
+    def release(self):
+        self._LOCK.acquire()
+        try:
+            self.refs -= 1
+            if self.evicted and self.refs == 0:
+                self._close()
+        finally:
+            self._LOCK.release()
+
+    def evict(self):
+        self._LOCK.acquire()
+        try:
+            self.evicted = True
+            if self.refs == 0:
+                self._close()
+        finally:
+            self._LOCK.release()
+
+    def _close(self):
+        if self.fd == None:
+            return
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+        self.fd = None
+
+
+class SharedFile(object):
+    """
+    File like object over the descriptor shared by the connections
+    serving the same file, each instance keeps its own position and
+    reads using `pread()` so that the position of the descriptor is
+    never changed (concurrent usage is safe).
+    """
+
+    __slots__ = ("meta", "position", "closed")
+
+    def __init__(self, meta):
+        self.meta = meta
+        self.position = 0
+        self.closed = False
+
+    def read(self, size=-1):
+        if size < 0:
+            size = max(self.meta.size - self.position, 0)
+        data = os.pread(self.meta.fd, size, self.position)
+        self.position += len(data)
+        return data
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self.position
+        elif whence == os.SEEK_END:
+            offset += self.meta.size
+        self.position = offset
+        return offset
+
+    def tell(self):
+        return self.position
+
+    def fileno(self):
+        return self.meta.fd
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.meta.release()
+
+
+class MetaCache(object):
+    """
+    Bounded cache of the file system metadata of the paths served
+    by the file server, keyed by the resolved path, evicting the least
+    recently used entries once the maximum number of entries is reached.
+
+    The entries are used without any system call during the TTL period
+    and then revalidated using a single stat call, keeping the entry
+    (and its shared descriptor) in case the file did not change.
+
+    The operations are guarded by a lock as the cache is shared by the
+    loops of the server when running in the loop threads mode.
+    """
+
+    def __init__(self, size=META_SIZE, ttl=META_TTL, fds=False):
+        self.size = size
+        self.ttl = ttl
+        self.fds = fds and hasattr(os, "pread")
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, path, current=None):
+        """
+        Retrieves the metadata for the provided (resolved) path, using
+        the cached entry in case it's still valid and revalidating it
+        (or gathering it for the first time) otherwise.
+
+        :type path: String
+        :param path: The resolved (absolute) path of the file system
+        entry to retrieve the metadata for.
+        :type current: float
+        :param current: The current timestamp to be used in the validity
+        verification, if not provided the current time is used.
+        :rtype: FileMeta
+        :return: The metadata of the path, for non existing paths the
+        metadata is marked as non existent (also cached).
+        """
+
+        self._lock.acquire()
+        try:
+            current = time.time() if current == None else current
+            entry = self._entries.pop(path, None)
+
+            # in case there's an entry for the path that is still valid it's
+            # returned immediately, re-inserted at the end of the cache as the
+            # most recently used one (LRU ordering)
+            if entry and current - entry.checked < self.ttl:
+                self._entries[path] = entry
+                self.hits += 1
+                return entry
+
+            # gathers the metadata of the path from the file system and in case
+            # the file did not change re-uses the previous entry (and descriptor)
+            self.misses += 1
+            meta = FileMeta.build(path, checked=current)
+            if entry and entry.same(meta):
+                entry.checked = current
+                self._entries[path] = entry
+                return entry
+            if entry:
+                entry.evict()
+
+            # in case the cache is disabled the metadata is returned without
+            # being stored (no shared descriptor is opened for it)
+            if not self.size:
+                return meta
+
+            # opens the shared descriptor for the file (in case it's requested)
+            # and stores the entry evicting the least recently used ones
+            if self.fds and meta.exists and not meta.is_dir:
+                try:
+                    meta.fd = os.open(path, os.O_RDONLY)
+                except OSError:
+                    meta.fd = None
+            self._entries[path] = meta
+            while len(self._entries) > self.size:
+                _path, _entry = self._entries.popitem(last=False)
+                _entry.evict()
+            return meta
+        finally:
+            self._lock.release()
+
+    def invalidate(self, path):
+        self._lock.acquire()
+        try:
+            entry = self._entries.pop(path, None)
+            if entry:
+                entry.evict()
+        finally:
+            self._lock.release()
+
+    def clear(self):
+        self._lock.acquire()
+        try:
+            for entry in self._entries.values():
+                entry.evict()
+            self._entries.clear()
+        finally:
+            self._lock.release()
+
+    def info_dict(self, full=False):
+        self._lock.acquire()
+        try:
+            total = self.hits + self.misses
+            info = dict(
+                size=self.size,
+                count=len(self._entries),
+                ttl=self.ttl,
+                fds=self.fds,
+                hits=self.hits,
+                misses=self.misses,
+                ratio=float(self.hits) / total if total else 0.0,
+            )
+            return info
+        finally:
+            self._lock.release()
+
+
+class CachedObject(object):
+    """
+    Entry of the in-memory object cache holding the identity body
+    of a file and, once requested, its gzipped body (either read from
+    the on-disk `.gz` sibling or compressed once from the identity).
+    """
+
+    __slots__ = ("meta", "sibling", "data", "data_gz", "hits")
+
+    def __init__(self, meta, data, sibling=None):
+        self.meta = meta
+        self.sibling = sibling
+        self.data = data
+        self.data_gz = None
+        self.hits = 0
+
+    def __len__(self):
+        return len(self.data) + (len(self.data_gz) if self.data_gz else 0)
+
+    def valid(self, meta, sibling=None):
+        if not self.meta.same(meta):
+            return False
+        if sibling == None or self.sibling == None:
+            return True
+        return self.sibling.same(sibling)
+
+    def gzip(self, level=netius.servers.http.GZIP_LEVEL):
+        """
+        Retrieves the gzipped body of the cached file, reading it from
+        the on-disk `.gz` sibling when it's at least as recent as the
+        file and compressing the identity body (only once) otherwise.
+
+        :type level: int
+        :param level: The compression level to be used in case the
+        body has to be compressed from the identity one.
+        :rtype: String
+        :return: The gzipped body or an empty value in case compression
+        does not reduce the size of the body (identity should be used).
+        """
+
+        if self.data_gz == None:
+            self.data_gz = self.build_gzip(level=level)
+        return self.data_gz
+
+    def build_gzip(self, level=netius.servers.http.GZIP_LEVEL):
+        """
+        Builds the gzipped body of the cached file (reading or compressing
+        it) without storing it in the entry, so that the (expensive) build
+        may take place outside of the lock of the cache.
+
+        :type level: int
+        :param level: The compression level to be used in case the
+        body has to be compressed from the identity one.
+        :rtype: String
+        :return: The gzipped body or an empty value in case compression
+        does not reduce the size of the body (identity should be used).
+        """
+
+        sibling = self.sibling
+        if sibling and sibling.exists and not sibling.is_dir:
+            if sibling.mtime >= self.meta.mtime:
+                file = sibling.open()
+                try:
+                    return file.read()
+                finally:
+                    file.close()
+        gzip = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+        data_gz = gzip.compress(self.data) + gzip.flush()
+        return data_gz if len(data_gz) < len(self.data) else b""
+
+
+class ObjectCache(object):
+    """
+    In-memory cache of the bodies of small (and popular) files, bounded
+    by a budget in bytes and evicting either the least recently used or
+    the least frequently used entries once that budget is exceeded.
+
+    The entries are validated against the (cached) file system metadata
+    of the file and of its `.gz` sibling, so that a change in any of them
+    reloads the entry without any further system call being required.
+
+    Just like the metadata cache it's safe to be used from multiple
+    threads (eg: the loops of the server), the bodies are read (and
+    compressed) outside of its lock so that misses do not block hits.
+    """
+
+    def __init__(
+        self,
+        budget=OBJECT_BUDGET,
+        max_size=OBJECT_MAX,
+        policy=OBJECT_POLICY,
+        level=netius.servers.http.GZIP_LEVEL,
+    ):
+        if not policy in OBJECT_POLICIES:
+            raise netius.DataError("Invalid object cache policy '%s'" % policy)
+        self.budget = budget
+        self.max_size = min(max_size, budget)
+        self.policy = policy
+        self.level = level
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def is_cacheable(self, meta):
+        if not self.budget:
+            return False
+        if not meta.exists or meta.is_dir:
+            return False
+        return meta.size <= self.max_size
+
+    def get(self, meta, sibling=None):
+        """
+        Retrieves the cached object for the file described by the provided
+        metadata, loading its identity body from the file system in case
+        there's no valid entry for it in the cache.
+
+        :type meta: FileMeta
+        :param meta: The (current) metadata of the file to retrieve the
+        cached object for, should be eligible for caching.
+        :type sibling: FileMeta
+        :param sibling: The (current) metadata of the `.gz` sibling of
+        the file, to be used as the source of the gzipped body.
+        :rtype: CachedObject
+        :return: The cached object for the file, that holds the bodies
+        to be used in the response.
+        """
+
+        entry = self._get(meta, sibling=sibling)
+        if not entry == None:
+            return entry
+
+        # reads the complete (identity) body of the file, using the shared
+        # descriptor when available, outside of the lock so that a miss does
+        # not block the hits of the other threads (eg: loops of the server)
+        file = meta.open()
+        try:
+            data = file.read()
+        finally:
+            file.close()
+
+        # stores the entry in the cache, unless a valid one has been stored
+        # meanwhile by another thread (the same file missed concurrently) in
+        # which case that one is used instead, keeping a single copy
+        self._lock.acquire()
+        try:
+            current = self._entries.pop(meta.path, None)
+            if not current == None and current.valid(meta, sibling=sibling):
+                self._entries[meta.path] = current
+                return current
+            if not current == None:
+                self.size -= len(current)
+            entry = CachedObject(meta, data, sibling=sibling)
+            self._entries[meta.path] = entry
+            self.size += len(entry)
+            self._evict(keep=entry)
+            return entry
+        finally:
+            self._lock.release()
+
+    def gzip(self, entry):
+        """
+        Retrieves the gzipped body of the provided cached object, updating
+        the size of the cache in case the body had to be built.
+
+        :type entry: CachedObject
+        :param entry: The cached object to retrieve the gzipped body for.
+        :rtype: String
+        :return: The gzipped body of the object or an empty value in case
+        the identity body should be used instead.
+        """
+
+        if not entry.data_gz == None:
+            return entry.data_gz
+
+        # builds the gzipped body (reading or compressing it) outside of
+        # the lock and then stores it in the entry, in case another thread
+        # has stored it meanwhile that body is used instead (single copy)
+        data_gz = entry.build_gzip(level=self.level)
+        self._lock.acquire()
+        try:
+            if not entry.data_gz == None:
+                return entry.data_gz
+            size = len(entry)
+            entry.data_gz = data_gz
+            if self._entries.get(entry.meta.path, None) == entry:
+                self.size += len(entry) - size
+                self._evict(keep=entry)
+            return data_gz
+        finally:
+            self._lock.release()
+
+    def invalidate(self, path):
+        self._lock.acquire()
+        try:
+            entry = self._entries.pop(path, None)
+            if not entry == None:
+                self.size -= len(entry)
+        finally:
+            self._lock.release()
+
+    def clear(self):
+        self._lock.acquire()
+        try:
+            self._entries.clear()
+            self.size = 0
+        finally:
+            self._lock.release()
+
+    def info_dict(self, full=False):
+        self._lock.acquire()
+        try:
+            total = self.hits + self.misses
+            info = dict(
+                budget=self.budget,
+                max_size=self.max_size,
+                policy=self.policy,
+                size=self.size,
+                count=len(self._entries),
+                hits=self.hits,
+                misses=self.misses,
+                ratio=float(self.hits) / total if total else 0.0,
+            )
+            return info
+        finally:
+            self._lock.release()
+
+    def _get(self, meta, sibling=None):
+        # retrieves the entry for the file in case it's still valid, under
+        # the lock, removing the (invalid) entry from the cache otherwise
+        # and accounting the miss, so that the file may then be loaded
+        self._lock.acquire()
+        try:
+            entry = self._entries.pop(meta.path, None)
+            if not entry == None and entry.valid(meta, sibling=sibling):
+                entry.hits += 1
+                if sibling and not entry.sibling:
+                    entry.sibling = sibling
+                self._entries[meta.path] = entry
+                self.hits += 1
+                return entry
+            if not entry == None:
+                self.size -= len(entry)
+            self.misses += 1
+            return None
+        finally:
+            self._lock.release()
+
+    def _evict(self, keep=None):
+        # removes entries while the budget is exceeded, never removing the
+        # entry that has just been used (as it's still going to be served)
+        # and selecting the victim according to the eviction policy
+        while self.size > self.budget and len(self._entries) > 1:
+            if self.policy == "lfu":
+                path = min(
+                    (entry for entry in self._entries.values() if not entry == keep),
+                    key=lambda entry: entry.hits,
+                ).meta.path
+            else:
+                path = next(
+                    path for path, entry in self._entries.items() if not entry == keep
+                )
+            self.invalidate(path)
+
+
+class DirListing(object):
+    """
+    Listing of the entries of a directory gathered using `scandir()`
+    (single stat per entry) in batches, so that the scanning of huge
+    directories may be interleaved with the other work of the loop.
+
+    Each entry is represented by a tuple containing its name, if it's
+    a directory, its size and its modification time, the sorted orders
+    of the entries are built lazily and kept with the listing.
+    """
+
+    __slots__ = ("path", "mtime", "checked", "entries", "orders")
+
+    def __init__(self, path, mtime=None, checked=None):
+        self.path = path
+        self.mtime = mtime
+        self.checked = time.time() if checked == None else checked
+        self.entries = []
+        self.orders = dict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    @classmethod
+    def build(cls, path, mtime=None):
+        listing = cls(path, mtime=mtime)
+        for _value in listing.scan():
+            pass
+        return listing
+
+    def scan(self, batch=LIST_BATCH):
+        """
+        Generator that scans the directory populating the entries of the
+        listing, yielding an invalid value after each batch of entries so
+        that the caller is able to pause the scanning (and resume it).
+
+        The entries that disappear (or can not be stat) during the scan
+        are ignored, as they would not be accessible anyway.
+
+        :type batch: int
+        :param batch: The number of entries to be scanned between each
+        of the pause points of the scanning.
+        """
+
+        scandir = getattr(os, "scandir", None)
+        iterator = scandir(self.path) if scandir else iter(os.listdir(self.path))
+        try:
+            for index, item in enumerate(iterator):
+                if index and index % batch == 0:
+                    yield None
+                try:
+                    name = item.name if scandir else item
+                    if scandir:
+                        _stat = item.stat()
+                    else:
+                        _stat = os.stat(os.path.join(self.path, item))
+                except OSError:
+                    continue
+                is_dir = stat.S_ISDIR(_stat.st_mode)
+                size = 0 if is_dir else _stat.st_size
+                self.entries.append((name, is_dir, size, _stat.st_mtime))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close:
+                close()
+
+    def sorted(self, sorter, sort=None, reverse=False, top=False):
+        key = (sort, reverse, top)
+        entries = self.orders.get(key, None)
+        if not entries == None:
+            return entries
+        entries = list(self.entries)
+        if top:
+            entries.insert(0, self.parent())
+        entries.sort(key=lambda entry: entry[0])
+        entries.sort(key=sorter, reverse=reverse)
+        self.orders[key] = entries
+        return entries
+
+    def page(self, sorter, sort=None, reverse=False, top=False, page=1, size=0):
+        """
+        Retrieves the entries (sorted) of the requested page of the listing
+        together with the (normalized) page and the total number of pages.
+
+        :type sorter: Function
+        :param sorter: The key function to be used to sort the entries.
+        :type sort: String
+        :param sort: The name of the sorting, used to cache the order.
+        :type reverse: bool
+        :param reverse: If the sorting should be done in reverse order.
+        :type top: bool
+        :param top: If the parent directory entry should be included.
+        :type page: int
+        :param page: The (one based) index of the page to be retrieved.
+        :type size: int
+        :param size: The number of entries per page, zero disables the
+        pagination (all of the entries are returned).
+        :rtype: Tuple
+        :return: The entries of the page, the (normalized) page index and
+        the total number of pages of the listing.
+        """
+
+        entries = self.sorted(sorter, sort=sort, reverse=reverse, top=top)
+        if not size:
+            return entries, 1, 1
+        pages = max((len(entries) + size - 1) // size, 1)
+        page = min(max(page, 1), pages)
+        start = (page - 1) * size
+        return entries[start : start + size], page, pages
+
+    def parent(self):
+        try:
+            mtime = os.path.getmtime(os.path.join(self.path, ".."))
+        except OSError:
+            mtime = 0.0
+        return ("..", True, 0, mtime)
+
+
+class ListCache(object):
+    """
+    Cache of the listings of the directories, keyed by the resolved
+    path and validated against the modification time of the directory,
+    bounded by the total number of entries of the cached listings and
+    evicting the least recently used listings once exceeded.
+
+    As the modification time of the directory only changes when entries
+    are added or removed the listings also expire after a time to live,
+    so that the sizes and dates of the changed files are refreshed.
+
+    Access is synchronized, as for the other caches of the server.
+    """
+
+    def __init__(self, budget=LIST_BUDGET, ttl=LIST_TTL):
+        self.budget = budget
+        self.ttl = ttl
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, path, mtime, current=None):
+        """
+        Retrieves the cached listing for the provided (resolved) path
+        in case it's still valid, meaning that the directory did not
+        change and that the listing did not expire.
+
+        :type path: String
+        :param path: The resolved (absolute) path of the directory.
+        :type mtime: float
+        :param mtime: The current modification time of the directory.
+        :type current: float
+        :param current: The current timestamp to be used in the validity
+        verification, if not provided the current time is used.
+        :rtype: DirListing
+        :return: The cached listing or an invalid value in case there's
+        no valid listing cached for the directory.
+        """
+
+        self._lock.acquire()
+        try:
+            current = time.time() if current == None else current
+            listing = self._entries.pop(path, None)
+            is_valid = (
+                not listing == None
+                and listing.mtime == mtime
+                and current - listing.checked < self.ttl
+            )
+            if is_valid:
+                self._entries[path] = listing
+                self.hits += 1
+                return listing
+            if not listing == None:
+                self.size -= len(listing)
+            self.misses += 1
+            return None
+        finally:
+            self._lock.release()
+
+    def put(self, listing):
+        self._lock.acquire()
+        try:
+            if not self.budget or len(listing) > self.budget:
+                return
+            self.invalidate(listing.path)
+            self._entries[listing.path] = listing
+            self.size += len(listing)
+            while self.size > self.budget:
+                _path, _listing = self._entries.popitem(last=False)
+                self.size -= len(_listing)
+        finally:
+            self._lock.release()
+
+    def invalidate(self, path):
+        self._lock.acquire()
+        try:
+            listing = self._entries.pop(path, None)
+            if not listing == None:
+                self.size -= len(listing)
+        finally:
+            self._lock.release()
+
+    def clear(self):
+        self._lock.acquire()
+        try:
+            self._entries.clear()
+            self.size = 0
+        finally:
+            self._lock.release()
+
+    def info_dict(self, full=False):
+        self._lock.acquire()
+        try:
+            total = self.hits + self.misses
+            info = dict(
+                budget=self.budget,
+                ttl=self.ttl,
+                size=self.size,
+                count=len(self._entries),
+                hits=self.hits,
+                misses=self.misses,
+                ratio=float(self.hits) / total if total else 0.0,
+            )
+            return info
+        finally:
+            self._lock.release()
+
+
 class FileServer(netius.servers.HTTP2Server):
     """
     Simple implementation of a file server that is able to list files
@@ -88,6 +923,16 @@ class FileServer(netius.servers.HTTP2Server):
         list_engine="base",
         cors=False,
         cache=0,
+        sendfile=True,
+        meta_size=META_SIZE,
+        meta_ttl=META_TTL,
+        meta_fds=False,
+        object_budget=OBJECT_BUDGET,
+        object_max=OBJECT_MAX,
+        object_policy=OBJECT_POLICY,
+        list_budget=LIST_BUDGET,
+        list_ttl=LIST_TTL,
+        list_page=0,
         *args,
         **kwargs
     ):
@@ -100,60 +945,76 @@ class FileServer(netius.servers.HTTP2Server):
         self.list_engine = list_engine
         self.cors = cors
         self.cache = cache
+        self.sendfile = sendfile
+        self.meta_size = meta_size
+        self.meta_ttl = meta_ttl
+        self.meta_fds = meta_fds
+        self.meta_cache = MetaCache(size=meta_size, ttl=meta_ttl, fds=meta_fds)
+        self.object_budget = object_budget
+        self.object_max = object_max
+        self.object_policy = object_policy
+        self.object_cache = ObjectCache(
+            budget=object_budget, max_size=object_max, policy=object_policy
+        )
+        self.list_budget = list_budget
+        self.list_ttl = list_ttl
+        self.list_page = list_page
+        self.list_cache = ListCache(budget=list_budget, ttl=list_ttl)
 
     @classmethod
     def _sorter_build(cls, name=None):
 
-        def sorter(item):
-            is_dir = item["is_dir"]
-            is_top = item["name"] == ".."
+        def sorter(entry):
+            _name, is_dir, size, modified = entry
+            is_top = _name == ".."
             is_dir_v = 0 if is_dir else 1
             is_dir_v = -1 if is_top else is_dir_v
 
             if name == "name":
-                return (item["name"], is_dir_v)
+                return (_name, is_dir_v)
             if name == "modified":
-                return (item["modified"], is_dir_v)
+                return (modified, is_dir_v)
             if name == "size":
-                return (item["size"], is_dir_v)
+                return (size, is_dir_v)
             if name == "type":
-                return (item["type"], is_dir_v)
+                return (cls._entry_type(entry), is_dir_v)
 
-            return (is_dir_v, item["name"])
+            return (is_dir_v, _name)
 
         return sorter
 
     @classmethod
-    def _items_normalize(cls, items, path, pad=False, space=True, simplified=False):
-        _items = []
+    def _entry_type(cls, entry, default="-"):
+        name, is_dir, _size, _modified = entry
+        if is_dir:
+            return "Directory"
+        type_s, _encoding = mimetypes.guess_type(name, strict=True)
+        return type_s or default
+
+    @classmethod
+    def _items_normalize(cls, entries, path, pad=False, space=True, simplified=False):
+        for entry in entries:
+            item, is_dir, size, _time = entry
 
-        for item in items:
             if netius.legacy.PYTHON_3:
                 item_s = item
             else:
                 item_s = item.encode("utf-8")
 
             path_f = os.path.join(path, item)
-            if not os.path.exists(path_f):
-                continue
 
-            is_dir = os.path.isdir(path_f)
             item_s = item_s + "/" if is_dir and pad else item_s
             item_q = netius.legacy.quote(item_s)
 
-            _time = os.path.getmtime(path_f)
             date_time = datetime.datetime.utcfromtimestamp(_time)
             time_s = date_time.strftime("%Y-%m-%d %H:%M")
 
-            size = 0 if is_dir else os.path.getsize(path_f)
             size_s = netius.common.size_round_unit(
                 size, space=space, simplified=simplified
             )
             size_s = "-" if is_dir else size_s
 
-            type_s, _encoding = mimetypes.guess_type(path_f, strict=True)
-            type_s = type_s or "-"
-            type_s = "Directory" if is_dir else type_s
+            type_s = cls._entry_type(entry)
 
             icon = FOLDER_SVG if is_dir else FILE_SVG
 
@@ -171,9 +1032,57 @@ class FileServer(netius.servers.HTTP2Server):
                 icon=icon,
             )
 
-            _items.append(_item)
+            yield _item
+
+    @classmethod
+    def _list_page(cls, path, query_m, sort=None, reverse=False, top=False, **kwargs):
+        listing = kwargs.get("listing", None)
+        if listing == None:
+            listing = DirListing.build(path)
+
+        page = query_m.get("page", [])
+        size = query_m.get("size", [])
+
+        # parses the pagination values from the query, notice that invalid
+        # values fallback to the defaults, as the listing may already be in
+        # the middle of being streamed to the client (no error is possible)
+        page = int(page[0]) if page and page[0].isdigit() else 1
+        size = (
+            int(size[0]) if size and size[0].isdigit() else kwargs.get("page_size", 0)
+        )
+
+        entries, page, pages = listing.page(
+            cls._sorter_build(name=sort),
+            sort=sort,
+            reverse=reverse,
+            top=top,
+            page=page,
+            size=max(size, 0),
+        )
+        return listing, entries, page, pages, size
+
+    @classmethod
+    def _gen_pages(cls, page, pages, size, sort=None, direction="asc"):
+        if pages < 2:
+            return
+
+        query = dict(direction=direction, size=size)
+        if sort:
+            query["sort"] = sort
 
-        return _items
+        yield '<div class="pages">'
+        if page > 1:
+            query["page"] = page - 1
+            yield '<a href="?%s">Previous</a> ' % netius.legacy.urlencode(
+                sorted(query.items())
+            )
+        yield "<span>Page %d of %d</span>" % (page, pages)
+        if page < pages:
+            query["page"] = page + 1
+            yield ' <a href="?%s">Next</a>' % netius.legacy.urlencode(
+                sorted(query.items())
+            )
+        yield "</div>"
 
     @classmethod
     def _gen_dir(
@@ -195,15 +1104,12 @@ class FileServer(netius.servers.HTTP2Server):
         reverse = direction == "desc"
         _direction = "desc" if direction == "asc" else "asc"
 
-        items = os.listdir(path)
-
         is_root = path_v == "" or path_v == "/"
-        if not is_root:
-            items.insert(0, "..")
 
-        items = cls._items_normalize(items, path, pad=not style)
-        items.sort(key=lambda v: v["name"])
-        items.sort(key=cls._sorter_build(name=sort), reverse=reverse)
+        _listing, entries, page, pages, size = cls._list_page(
+            path, query_m, sort=sort, reverse=reverse, top=not is_root, **kwargs
+        )
+        items = cls._items_normalize(entries, path, pad=not style)
 
         path_n = path_v.rstrip("/")
 
@@ -273,6 +1179,8 @@ class FileServer(netius.servers.HTTP2Server):
             yield "</tr>"
         yield "</tbody>"
         yield "</table>"
+        for value in cls._gen_pages(page, pages, size, sort=sort, direction=direction):
+            yield value
         yield "<hr/>"
         yield "<span>"
         yield netius.IDENTIFIER
@@ -293,15 +1201,12 @@ class FileServer(netius.servers.HTTP2Server):
         reverse = direction == "desc"
         _direction = "desc" if direction == "asc" else "asc"
 
-        items = os.listdir(path)
-
-        items.insert(0, "..")
-
+        _listing, entries, page, pages, size = cls._list_page(
+            path, query_m, sort=sort, reverse=reverse, top=True, **kwargs
+        )
         items = cls._items_normalize(
-            items, path, pad=True, space=False, simplified=True
+            entries, path, pad=True, space=False, simplified=True
         )
-        items.sort(key=lambda v: v["name"])
-        items.sort(key=cls._sorter_build(name=sort), reverse=reverse)
 
         path_n = path_v.rstrip("/")
 
@@ -365,6 +1270,8 @@ class FileServer(netius.servers.HTTP2Server):
             yield "\n"
         yield '<tr><th colspan="5"><hr></th></tr>'
         yield "</table>"
+        for value in cls._gen_pages(page, pages, size, sort=sort, direction=direction):
+            yield value
         yield "<address>%s</address>" % netius.IDENTIFIER
         yield "</body>"
 
@@ -385,17 +1292,17 @@ class FileServer(netius.servers.HTTP2Server):
         reverse = direction == "desc"
         _direction = "desc" if direction == "asc" else "asc"
 
-        items = os.listdir(path)
-
-        items.insert(0, "..")
-
+        _listing, entries, page, pages, size = cls._list_page(
+            path, query_m, sort=sort, reverse=reverse, top=True, **kwargs
+        )
         items = cls._items_normalize(
-            items, path, pad=True, space=False, simplified=True
+            entries, path, pad=True, space=False, simplified=True
         )
-        items.sort(key=lambda v: v["name"])
-        items.sort(key=cls._sorter_build(name=sort), reverse=reverse)
 
-        max_length = max([len(item["name_s"]) for item in items] + [max_length])
+        max_length = max(
+            [len(name) + (1 if is_dir else 0) for name, is_dir, _s, _m in entries]
+            + [max_length]
+        )
         padding_s = (max_length + spacing - 4) * " "
         spacing_s = spacing * " "
 
@@ -449,19 +1356,76 @@ class FileServer(netius.servers.HTTP2Server):
             yield "\n"
         yield "<hr/>"
         yield "</pre>"
+        for value in cls._gen_pages(page, pages, size, sort=sort, direction=direction):
+            yield value
         yield "<address>%s</address>" % netius.IDENTIFIER
         yield "</body>"
 
         for value in cls._gen_footer():
             yield value
 
+    @classmethod
+    def _gen_dir_json(cls, path, path_v, query_m, **kwargs):
+        sort = query_m.get("sort", [])
+        direction = query_m.get("direction", [])
+
+        sort = sort[0] if sort else None
+        direction = direction[0] if direction else "asc"
+
+        reverse = direction == "desc"
+
+        listing, entries, page, pages, size = cls._list_page(
+            path, query_m, sort=sort, reverse=reverse, top=False, **kwargs
+        )
+
+        path_n = path_v.rstrip("/")
+
+        yield '{"path": %s, "page": %d, "pages": %d, "size": %d, "total": %d, ' % (
+            json.dumps(path_n or "/"),
+            page,
+            pages,
+            size,
+            len(listing),
+        )
+        yield '"items": ['
+        for index, entry in enumerate(entries):
+            name, is_dir, size, modified = entry
+            item = dict(
+                name=name,
+                is_dir=is_dir,
+                size=size,
+                modified=modified,
+                type=None if is_dir else cls._entry_type(entry, default=None),
+            )
+            yield (", " if index else "") + json.dumps(item, sort_keys=True)
+        yield "]}"
+
+    def cleanup(self):
+        netius.servers.HTTP2Server.cleanup(self)
+        self.meta_cache.clear()
+        self.object_cache.clear()
+        self.list_cache.clear()
+
+    def info_dict(self, full=False):
+        info = netius.servers.HTTP2Server.info_dict(self, full=full)
+        info.update(
+            meta_cache=self.meta_cache.info_dict(full=full),
+            object_cache=self.object_cache.info_dict(full=full),
+            list_cache=self.list_cache.info_dict(full=full),
+        )
+        return info
+
     def on_connection_d(self, connection):
         netius.servers.HTTP2Server.on_connection_d(self, connection)
 
         file = hasattr(connection, "file") and connection.file
         if file:
             file.close()
+        list_gen = hasattr(connection, "list_gen") and connection.list_gen
+        if list_gen:
+            list_gen.close()
         setattr(connection, "file", None)
+        setattr(connection, "list_gen", None)
         setattr(connection, "range", None)
         setattr(connection, "bytes_p", None)
         setattr(connection, "queue", None)
@@ -470,7 +1434,11 @@ class FileServer(netius.servers.HTTP2Server):
         file = hasattr(stream, "file") and stream.file
         if file:
             file.close()
+        list_gen = hasattr(stream, "list_gen") and stream.list_gen
+        if list_gen:
+            list_gen.close()
         setattr(stream, "file", None)
+        setattr(stream, "list_gen", None)
         setattr(stream, "range", None)
         setattr(stream, "bytes_p", None)
         setattr(stream, "queue", None)
@@ -497,28 +1465,82 @@ class FileServer(netius.servers.HTTP2Server):
             self.cors = self.get_env("CORS", self.cors, cast=bool)
         if self.env:
             self.cache = self.get_env("CACHE", self.cache, cast=int)
+        if self.env:
+            self.sendfile = self.get_env("SENDFILE", self.sendfile, cast=bool)
+        if self.env:
+            self.meta_size = self.get_env("META_SIZE", self.meta_size, cast=int)
+        if self.env:
+            self.meta_ttl = self.get_env("META_TTL", self.meta_ttl, cast=float)
+        if self.env:
+            self.meta_fds = self.get_env("META_FDS", self.meta_fds, cast=bool)
+        if self.env:
+            self.object_budget = self.get_env(
+                "OBJECT_BUDGET", self.object_budget, cast=int
+            )
+        if self.env:
+            self.object_max = self.get_env("OBJECT_MAX", self.object_max, cast=int)
+        if self.env:
+            self.object_policy = self.get_env("OBJECT_POLICY", self.object_policy)
+        if self.env:
+            self.list_budget = self.get_env("LIST_BUDGET", self.list_budget, cast=int)
+        if self.env:
+            self.list_ttl = self.get_env("LIST_TTL", self.list_ttl, cast=float)
+        if self.env:
+            self.list_page = self.get_env("LIST_PAGE", self.list_page, cast=int)
         self._build_regex()
         self.base_path = os.path.abspath(self.base_path)
         self.cache_d = datetime.timedelta(seconds=self.cache)
+        self.meta_cache.clear()
+        self.meta_cache = MetaCache(
+            size=self.meta_size, ttl=self.meta_ttl, fds=self.meta_fds
+        )
+        self.object_cache.clear()
+        self.object_cache = ObjectCache(
+            budget=self.object_budget,
+            max_size=self.object_max,
+            policy=self.object_policy,
+        )
+        self.list_cache.clear()
+        self.list_cache = ListCache(budget=self.list_budget, ttl=self.list_ttl)
         self.base_path = netius.legacy.u(self.base_path, force=True)
         self.info(
             "Defining '%s' as the root of the file server ...", self.base_path or "."
         )
         if self.list_dirs:
             self.info("Listing directories with '%s' engine ...", self.list_engine)
+        if self.list_dirs and self.list_page:
+            self.info("Paginating directory listings with %d entries", self.list_page)
         if self.cors:
             self.info("Cross origin resource sharing is enabled")
         if self.cache:
             self.info("Resource cache set with %d seconds", self.cache)
+        if self.sendfile:
+            self.info("Sending plain files using sendfile (when possible)")
+        if self.meta_size:
+            self.info(
+                "Caching metadata of %d paths for %.2f seconds",
+                self.meta_size,
+                self.meta_ttl,
+            )
+        if self.object_budget:
+            self.info(
+                "Caching files up to %d bytes in %d bytes of memory (%s)",
+                self.object_cache.max_size,
+                self.object_budget,
+                self.object_policy,
+            )
 
     def on_data_http(self, connection, parser):
         netius.servers.HTTP2Server.on_data_http(self, connection, parser)
 
         # verifies if the current connection contains a reference to the
-        # file object, in case it exists there's a file currently being
-        # handled by the connection and so the current data processing
-        # must be delayed until the file is processed (inserted in queue)
-        if hasattr(connection, "file") and connection.file:
+        # file object (or directory listing), in case it exists there's a file
+        # currently being handled by the connection and so the current data
+        # processing must be delayed until the file is processed (inserted in queue)
+        is_busy = getattr(connection, "file", None) or getattr(
+            connection, "list_gen", None
+        )
+        if is_busy:
             if not hasattr(connection, "queue"):
                 connection.queue = []
             state = parser.get_state()
@@ -551,17 +1573,19 @@ class FileServer(netius.servers.HTTP2Server):
             if not is_sub:
                 raise netius.SecurityError("Invalid path")
 
+            # retrieves the (cached) metadata of the resolved path and
             # verifies if the requested file exists in case it does not
             # raises an error indicating the problem so that the user is
             # notified about the failure to find the appropriate file
-            if not os.path.exists(path_f):
+            meta = self.meta_cache.get(path_f)
+            if not meta.exists:
                 self.on_no_file(connection)
                 return
 
             # verifies if the currently resolved path refers an directory or
             # instead a normal file and handles each of the cases properly by
             # redirecting the request to the proper handlers
-            is_dir = os.path.isdir(path_f)
+            is_dir = meta.is_dir
             if is_dir:
                 self.on_dir_file(connection, parser, path_f)
             else:
@@ -593,7 +1617,7 @@ class FileServer(netius.servers.HTTP2Server):
 
         for index_file in self.index_files:
             index_path = os.path.join(path, index_file)
-            if not os.path.exists(index_path):
+            if not self.meta_cache.get(index_path).exists:
                 continue
             return self.on_normal_file(connection, parser, index_path)
 
@@ -601,27 +1625,101 @@ class FileServer(netius.servers.HTTP2Server):
             self.on_no_file(connection)
             return
 
-        data = "".join(
-            cls._gen_dir(
-                self.list_engine,
-                path,
-                path_v,
-                query_m,
-                style=style,
-                style_urls=self.style_urls,
+        # determines the engine to be used in the listing, taking into account
+        # that the JSON format may be requested using the query string
+        format = query_m.get("format", [])
+        format = format[0] if format else None
+        engine = "json" if format == "json" else self.list_engine
+
+        # determines if the listing is going to be streamed, which requires
+        # either a chunked connection or an HTTP 1.1 one that may be changed
+        # into chunked (HEAD requests are never streamed, as no body is sent)
+        is_legacy = getattr(connection, "legacy", False)
+        is_chunked = connection.is_chunked() or (
+            is_legacy and parser.version >= netius.common.HTTP_11
+        )
+        is_stream = is_chunked and not parser.method.upper() == "HEAD"
+
+        # in case there's a valid cached listing for the directory (did not
+        # change since it was scanned nor expired) it's sent immediately
+        meta = self.meta_cache.get(path)
+        listing = self.list_cache.get(path, meta.mtime)
+        if not listing == None:
+            self.on_dir_list(
+                connection, path, path_v, query_m, listing, engine, style, is_stream
             )
+            return
+
+        # otherwise the directory is scanned in batches, one per iteration of
+        # the loop, so that huge directories do not block the loop, notice that
+        # the connection is considered busy while the scanning takes place
+        listing = DirListing(path, mtime=meta.mtime)
+        connection.list_gen = listing.scan()
+        self._list_scan(
+            connection,
+            listing,
+            lambda: self.on_dir_list(
+                connection, path, path_v, query_m, listing, engine, style, is_stream
+            ),
+        )
+
+    def on_dir_list(
+        self,
+        connection,
+        path,
+        path_v,
+        query_m,
+        listing,
+        engine,
+        style=True,
+        is_stream=False,
+    ):
+        cls = self.__class__
+
+        generator = cls._gen_dir(
+            engine,
+            path,
+            path_v,
+            query_m,
+            style=style,
+            style_urls=self.style_urls,
+            listing=listing,
+            page_size=self.list_page,
         )
-        data = netius.legacy.bytes(data, encoding="utf-8", force=True)
 
         headers = dict()
-        headers["content-type"] = "text/html"
+        headers["content-type"] = (
+            "application/json" if engine == "json" else "text/html"
+        )
+
+        # in case the listing is not meant to be streamed (unknown length)
+        # the complete listing is generated and sent at once
+        if not is_stream:
+            data = "".join(generator)
+            data = netius.legacy.bytes(data, encoding="utf-8", force=True)
+            connection.send_response(
+                data=data,
+                headers=headers,
+                code=200,
+                apply=True,
+                callback=self._file_check_close,
+            )
+            self._next_queue(connection)
+            return
 
+        # otherwise sends the headers and then streams the listing as it's
+        # generated, one buffer at a time as the data is flushed, using the
+        # chunked encoding in case the connection is a plain one
+        if connection.is_plain():
+            connection.set_encoding(netius.common.CHUNKED_ENCODING)
+        connection.list_gen = generator
         connection.send_response(
-            data=data,
             headers=headers,
             code=200,
             apply=True,
-            callback=self._file_check_close,
+            final=False,
+            flush=False,
+            callback=self._list_send,
         )
 
     def on_normal_file(self, connection, parser, path):
@@ -639,10 +1737,10 @@ class FileServer(netius.servers.HTTP2Server):
         range_s = parser.headers.get("range", None)
         is_partial = True if range_s else False
 
-        # retrieves the last modified timestamp for the resource path and
-        # uses it to create the ETag for the resource to be served
-        modified = os.path.getmtime(path)
-        etag = "netius-%.2f" % modified
+        # retrieves the (cached) metadata of the resource path, that
+        # includes the ETag for the resource to be served (modified time)
+        meta = self.meta_cache.get(path)
+        etag = meta.etag
 
         # retrieves the header that describes the previous version in the
         # client side (client side ETag) and compares both of the ETags to
@@ -656,18 +1754,18 @@ class FileServer(netius.servers.HTTP2Server):
             self.on_not_modified(connection, path)
             return
 
-        # tries to guess the mime type of the file present in the target
-        # file path that is going to be returned, this may fail as it's not
-        # always possible to determine the correct mime type for a file
-        # for suck situations the default mime type is used
-        type, _encoding = mimetypes.guess_type(path, strict=True)
-        type = type or "application/octet-stream"
-
-        # retrieves the size of the file that has just be resolved using
-        # the currently provided path value and then associates the file
-        # with the current connection
-        file_size = os.path.getsize(path)
-        file = open(path, "rb")
+        # in case the file is small enough to be kept in memory the complete
+        # (non partial) response is served from the in-memory object cache
+        if not is_partial and self.object_cache.is_cacheable(meta):
+            self.on_cached_file(connection, parser, meta)
+            return
+
+        # retrieves the mime type and the size of the file from the metadata
+        # and then opens the file (possibly sharing the cached descriptor)
+        # associating it with the current connection
+        type = meta.type
+        file_size = meta.size
+        file = meta.open()
         connection.file = file
 
         # convert the current string based representation of the range
@@ -716,13 +1814,7 @@ class FileServer(netius.servers.HTTP2Server):
 
         # in case there's a valid cache defined must populate the proper header
         # fields so that cache is applied to the request
-        if self.cache:
-            current = datetime.datetime.utcnow()
-            target = current + self.cache_d
-            target_s = target.strftime("%a, %d %b %Y %H:%M:%S GMT")
-            cache_s = "public, max-age=%d" % self.cache
-            headers["expires"] = target_s
-            headers["cache-control"] = cache_s
+        self._apply_cache(headers)
 
         # "calculates" the proper returning code taking into account if the
         # current data to be sent is partial or not
@@ -741,6 +1833,50 @@ class FileServer(netius.servers.HTTP2Server):
             callback=self._file_send,
         )
 
+    def on_cached_file(self, connection, parser, meta):
+        # retrieves the cached object for the file, in case gzip has been
+        # negotiated for the connection the gzipped body is used instead
+        # (taking into account the possible on-disk `.gz` sibling)
+        is_gzip = connection.is_gzip()
+        sibling = self.meta_cache.get(meta.path + ".gz") if is_gzip else None
+        entry = self.object_cache.get(meta, sibling=sibling)
+        data_gz = self.object_cache.gzip(entry) if is_gzip else None
+        data = data_gz or entry.data
+
+        # the body is completely known so it's sent with the plain encoding
+        # (no chunking or compression by the connection) with its length
+        connection.set_encoding(netius.common.PLAIN_ENCODING)
+
+        # creates the map of headers for the response, that in case the
+        # gzipped body is used must describe its encoding, notice that
+        # ranges are only supported for the identity body
+        headers = dict()
+        headers["etag"] = meta.etag
+        headers["content-length"] = "%d" % len(data)
+        if self.cors:
+            headers["access-control-allow-origin"] = "*"
+        if meta.type:
+            headers["content-type"] = meta.type
+        if data_gz:
+            headers["content-encoding"] = "gzip"
+            headers["vary"] = "Accept-Encoding"
+        else:
+            headers["accept-ranges"] = "bytes"
+        self._apply_cache(headers)
+
+        # sends the complete response at once closing the connection after
+        # it has been flushed in case keep alive is not enabled and then
+        # resumes the handling of the pipelined requests
+        is_keep_alive = parser.keep_alive
+        connection.send_response(
+            data=data,
+            headers=headers,
+            code=200,
+            apply=True,
+            callback=None if is_keep_alive else self._file_close,
+        )
+        self._next_queue(connection)
+
     def on_no_file(self, connection):
         cls = self.__class__
         connection.send_response(
@@ -790,6 +1926,12 @@ class FileServer(netius.servers.HTTP2Server):
             parser.destroy()
 
     def _file_send(self, connection):
+        # in case the connection allows it the complete (remaining) range
+        # of the file is sent directly from the file descriptor into the
+        # socket (sendfile) as the socket becomes writable
+        if self._is_sendfile(connection):
+            return self._file_sendfile(connection)
+
         file = connection.file
         range = connection.range
         is_larger = BUFFER_SIZE > connection.bytes_p
@@ -801,6 +1943,14 @@ class FileServer(netius.servers.HTTP2Server):
         callback = self._file_finish if is_final else self._file_send
         connection.send_part(data, final=False, callback=callback)
 
+    def _file_sendfile(self, connection):
+        file = connection.file
+        range = connection.range
+        offset = range[1] + 1 - connection.bytes_p
+        count = connection.bytes_p
+        connection.bytes_p = 0
+        connection.send_file(file, offset, count, callback=self._file_finish)
+
     def _file_finish(self, connection):
         connection.file.close()
         connection.file = None
@@ -811,6 +1961,68 @@ class FileServer(netius.servers.HTTP2Server):
         connection.flush_s(callback=callback)
         self._next_queue(connection)
 
+    def _list_scan(self, connection, listing, callback):
+        # in case the scanning is no longer associated with the connection
+        # (eg: the connection has been closed) returns immediately
+        scanner = connection.list_gen
+        if not scanner:
+            return
+
+        # scans the next batch of entries of the directory, notice that any
+        # problem in the scanning is handled as a file exception
+        try:
+            done = next(scanner, True)
+        except BaseException as exception:
+            connection.list_gen = None
+            self.on_exception_file(connection, exception)
+            return
+
+        # in case the scanning is not finished schedules the next batch for
+        # the next iteration of the loop, otherwise caches the listing
+        if not done:
+            self.delay(lambda: self._list_scan(connection, listing, callback))
+            return
+        connection.list_gen = None
+        self.list_cache.put(listing)
+        callback()
+
+    def _list_send(self, connection):
+        generator = connection.list_gen
+        if not generator:
+            return
+
+        # gathers the next buffer of the listing from the generator, in case
+        # the generator is exhausted the listing is finished
+        buffer = []
+        buffer_l = 0
+        is_final = True
+        for value in generator:
+            buffer.append(value)
+            buffer_l += len(value)
+            if buffer_l < BUFFER_SIZE:
+                continue
+            is_final = False
+            break
+
+        data = "".join(buffer)
+        data = netius.legacy.bytes(data, encoding="utf-8", force=True)
+        if not is_final:
+            connection.send_part(data, final=False, callback=self._list_next)
+            return
+
+        connection.list_gen = None
+        if data:
+            connection.send_part(data, final=False)
+        is_keep_alive = connection.parser.keep_alive
+        callback = None if is_keep_alive else self._file_close
+        connection.flush_s(callback=callback)
+        self._next_queue(connection)
+
+    def _list_next(self, connection):
+        # the generation of the next buffer is delayed to the next iteration
+        # of the loop, so that a fast client does not starve the others
+        self.delay(lambda: self._list_send(connection))
+
     def _file_close(self, connection):
         connection.close(flush=True)
 
@@ -819,6 +2031,31 @@ class FileServer(netius.servers.HTTP2Server):
             return
         connection.close(flush=True)
 
+    def _is_sendfile(self, connection):
+        # the sendfile path is only possible for plain (no SSL) HTTP/1.1
+        # connections where no transformation of the data (eg: chunked
+        # or gzip encoding) is required, otherwise the buffered path is used
+        if not self.sendfile:
+            return False
+        if not connection.bytes_p:
+            return False
+        if not getattr(connection, "legacy", True):
+            return False
+        can_sendfile = getattr(connection, "can_sendfile", None)
+        if not can_sendfile or not can_sendfile():
+            return False
+        return connection.is_plain()
+
+    def _apply_cache(self, headers):
+        if not self.cache:
+            return
+        current = datetime.datetime.utcnow()
+        target = current + self.cache_d
+        target_s = target.strftime("%a, %d %b %Y %H:%M:%S GMT")
+        cache_s = "public, max-age=%d" % self.cache
+        headers["expires"] = target_s
+        headers["cache-control"] = cache_s
+
     def _resolve(self, path):
         path, result = self._resolve_regex(path)
         if result:
@@ -24,8 +24,11 @@
 Asynchronous variant of the static file server that reads file data
 through the async file pool infra-structure instead of blocking calls.
 Uses a larger chunk size than the synchronous server to reduce the
-per read overhead of the pool. This is an experimental implementation
-and depends on event fd support, so it is not suited for production.
+per read overhead of the pool. Keeps a window of positional reads
+outstanding for each connection (read-ahead), adapted to the rate at
+which the client drains the data, so that the disk and the network
+operations overlap. This is an experimental implementation and depends
+on event fd support, so it is not suited for production.
 
 Example:
     BASE_PATH=. python -m netius.extra.filea
@@ -40,6 +43,8 @@ __copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import netius.pool
+
 from . import file as _file
 
 BUFFER_SIZE = _file.BUFFER_SIZE * 4
@@ -47,6 +52,99 @@ BUFFER_SIZE = _file.BUFFER_SIZE * 4
 handles more data for each chunk, this is required to avoid
 extreme amounts of overhead in the file pool """
 
+READ_AHEAD = 4
+""" The default maximum number of reads (buffers) that may be
+outstanding for each connection, the effective read-ahead window
+adapts between one and this value as the client drains the data """
+
+
+class ReadAhead(object):
+    """
+    State of the read-ahead of the range of a file being sent through
+    a connection, keeps track of the (positional) reads outstanding in
+    the file pool and of the chunks that completed out of order, that
+    wait for the previous ones before being sent.
+
+    The window (maximum number of outstanding reads) grows when the
+    connection is drained (the disk is the bottleneck) and shrinks
+    when the pending data accumulates (the client is the bottleneck).
+    """
+
+    __slots__ = (
+        "file",
+        "offset",
+        "position",
+        "end",
+        "limit",
+        "window",
+        "count",
+        "chunks",
+    )
+
+    def __init__(self, file, start, end, limit=READ_AHEAD):
+        self.file = file
+        self.offset = start
+        self.position = start
+        self.end = end
+        self.limit = max(limit, 1)
+        self.window = min(2, self.limit)
+        self.count = 0
+        self.chunks = dict()
+
+    def is_done(self):
+        return self.position >= self.end
+
+    def adapt(self, pending, size=BUFFER_SIZE):
+        if pending == 0:
+            self.window = min(self.window * 2, self.limit)
+        elif pending > self.window * size:
+            self.window = max(self.window // 2, 1)
+
+    def next(self, pending, size=BUFFER_SIZE):
+        """
+        Retrieves the offset and size of the next read to be issued for
+        the file, in case the window allows a new read to be outstanding.
+
+        :type pending: int
+        :param pending: The number of bytes pending to be sent by the
+        connection, no reads are issued while above the window.
+        :type size: int
+        :param size: The (maximum) size of each of the reads.
+        :rtype: Tuple
+        :return: The offset and the size of the read to be issued or an
+        invalid value in case no read should be issued.
+        """
+
+        if self.offset >= self.end:
+            return None
+        if self.count + len(self.chunks) >= self.window:
+            return None
+        if pending >= self.window * size:
+            return None
+        offset = self.offset
+        count = min(size, self.end - offset)
+        self.offset += count
+        self.count += 1
+        return offset, count
+
+    def push(self, offset, count, data):
+        # stores the chunk that has been read, in case the read was short
+        # (the file has been truncated) the end of the range is updated
+        # so that the remaining data is never waited for
+        self.count -= 1
+        self.chunks[offset] = data
+        if len(data) < count:
+            self.end = min(self.end, offset + len(data))
+
+    def pop(self):
+        if self.is_done():
+            return None
+        data = self.chunks.pop(self.position, None)
+        if data == None:
+            return None
+        self.position += len(data)
+        return data
+
 
 class FileAsyncServer(_file.FileServer):
     """
@@ -60,13 +158,22 @@ class FileAsyncServer(_file.FileServer):
     for system that don't provide some system of event fd (eg: windows)
     as it would provide very slow performance or even stall the
     event loop as no notification occurs on events.
+
+    The reads are positional and several of them may be outstanding
+    for the same connection (read-ahead), overlapping the disk access
+    with the sending of the previous chunks to the client.
     """
 
+    def __init__(self, read_ahead=READ_AHEAD, *args, **kwargs):
+        _file.FileServer.__init__(self, *args, **kwargs)
+        self.read_ahead = read_ahead
+
     def on_connection_d(self, connection):
         file = hasattr(connection, "file") and connection.file
         if file:
             self.fclose(file)
             connection.file = None
+        connection.read_a = None
         _file.FileServer.on_connection_d(self, connection)
 
     def on_stream_d(self, stream):
@@ -74,26 +181,90 @@ class FileAsyncServer(_file.FileServer):
         if file:
             self.fclose(file)
             stream.file = None
+        stream.read_a = None
         _file.FileServer.on_stream_d(self, stream)
 
+    def on_serve(self):
+        _file.FileServer.on_serve(self)
+        if self.env:
+            self.read_ahead = self.get_env("READ_AHEAD", self.read_ahead, cast=int)
+        if not netius.pool.file.is_pread:
+            self.read_ahead = 1
+        self.info("Reading ahead up to %d buffers per connection", self.read_ahead)
+
     def _file_send(self, connection):
-        file = connection.file
-        range = connection.range
-        is_larger = BUFFER_SIZE > connection.bytes_p
-        buffer_s = connection.bytes_p if is_larger else BUFFER_SIZE
+        # in case there's no read-ahead state for the file being sent this
+        # is the initial sending (headers sent) and the state is created,
+        # otherwise a chunk has been flushed and the window is adapted
+        read_a = getattr(connection, "read_a", None)
+        if read_a == None or not read_a.file == connection.file:
+            range = connection.range
+            read_a = ReadAhead(
+                connection.file, range[0], range[1] + 1, limit=self.read_ahead
+            )
+            connection.read_a = read_a
+            if read_a.is_done():
+                self._file_finish(connection)
+                return
+        else:
+            read_a.adapt(connection.pending_s)
 
+        # issues as many reads as allowed by the current window so that
+        # they are running while the previous chunks are being sent
+        self._file_read(connection)
+
+    def _file_read(self, connection):
+        read_a = connection.read_a
+        while True:
+            read = read_a.next(connection.pending_s)
+            if not read:
+                break
+            offset, count = read
+            self.fpread(
+                read_a.file,
+                count,
+                offset,
+                data=self._file_callback(connection, read_a, offset, count),
+            )
+
+    def _file_callback(self, connection, read_a, offset, count):
         def callback(data, *args, **kwargs):
-            if connection.file == None:
+            if not getattr(connection, "read_a", None) == read_a:
                 return
             if isinstance(data, BaseException):
+                connection.close()
                 return
-            data_l = len(data) if data else 0
-            connection.bytes_p -= data_l
-            is_final = not data or connection.bytes_p == 0
+            read_a.push(offset, count, data)
+            self._file_flush(connection)
+
+        return callback
+
+    def _file_flush(self, connection):
+        # sends the chunks that are available in order, the last one of
+        # the range finishes the sending of the file once flushed
+        read_a = connection.read_a
+        while True:
+            data = read_a.pop()
+            if data == None:
+                break
+            connection.bytes_p -= len(data)
+            is_final = read_a.is_done()
             callback = self._file_finish if is_final else self._file_send
             connection.send_part(data, final=False, callback=callback)
+            if is_final:
+                return
+
+        # in case the range has been shortened (truncated file) while no
+        # chunk is available the file is finished, otherwise new reads are
+        # issued for the slots that have been released
+        if read_a.is_done():
+            self._file_finish(connection)
+            return
+        self._file_read(connection)
 
-        self.fread(file, buffer_s, data=callback)
+    def _file_finish(self, connection):
+        connection.read_a = None
+        _file.FileServer._file_finish(self, connection)
 
 
 if __name__ == "__main__":
@@ -26,7 +26,9 @@ on the common event pool to run the typical open, close, read and
 write calls on dedicated worker threads, keeping the main event loop
 free from blocking disk access. The outcome of each operation is
 delivered back as an event, allowing results to be consumed
-asynchronously by the owner.
+asynchronously by the owner. Positional reads (`pread()`) do not
+depend on the position of the file, so that several of them may run
+in parallel over the same file.
 """
 
 __author__ = "João Magalhães <joamag@hive.pt>"
@@ -38,6 +40,8 @@ __copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import os
+
 import netius
 
 from . import common
@@ -49,6 +53,12 @@ OPEN_ACTION = 1
 CLOSE_ACTION = 2
 READ_ACTION = 3
 WRITE_ACTION = 4
+PREAD_ACTION = 5
+
+is_pread = hasattr(os, "pread")
+""" If the current platform supports positional reads, without
+them the reads over the same file must not run in parallel (they
+change the position of the file) """
 
 
 class FileThread(common.Thread):
@@ -75,6 +85,14 @@ class FileThread(common.Thread):
         result = file.read(count)
         self.owner.push_event((READ_ACTION, result, data))
 
+    def pread(self, file, count, offset, data):
+        if is_pread:
+            result = os.pread(file.fileno(), count, offset)
+        else:
+            file.seek(offset)
+            result = file.read(count)
+        self.owner.push_event((READ_ACTION, result, data))
+
     def write(self, file, buffer, data):
         file.write(buffer)
         self.owner.push_event((WRITE_ACTION, len(buffer), data))
@@ -89,6 +107,8 @@ class FileThread(common.Thread):
             self.read(*work[2:])
         elif action == WRITE_ACTION:
             self.read(*work[2:])
+        elif action == PREAD_ACTION:
+            self.pread(*work[2:])
         else:
             netius.NotImplemented("Undefined file action '%d'" % action)
 
@@ -113,3 +133,7 @@ class FilePool(common.EventPool):
     def write(self, file, buffer, data=None):
         work = (FILE_WORK, WRITE_ACTION, file, buffer, data)
         self.push(work)
+
+    def pread(self, file, count, offset, data=None):
+        work = (FILE_WORK, PREAD_ACTION, file, count, offset, data)
+        self.push(work)
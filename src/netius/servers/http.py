@@ -84,13 +84,16 @@ in the initial construction of the server """
 
 class HTTPConnection(netius.Connection):
 
+    __slots__ = ("encoding", "current", "parser", "legacy", "waiting", "gzip_m")
+
     def __init__(self, encoding=PLAIN_ENCODING, *args, **kwargs):
         netius.Connection.__init__(self, *args, **kwargs)
         self.encoding = encoding
         self.current = encoding
         self.parser = None
         self.legacy = True
-        self.gzip_m = dict()
+        self.waiting = True
+        self.gzip_m = None
 
     def open(self, *args, **kwargs):
         netius.Connection.open(self, *args, **kwargs)
@@ -440,6 +443,13 @@ class HTTPConnection(netius.Connection):
             return False
         return True
 
+    def is_waiting(self):
+        if not self.waiting or not self.legacy:
+            return False
+        if not self.parser:
+            return False
+        return self.parser.is_idle()
+
     def on_data(self):
         self.owner.on_data_http(self.connection_ctx, self.parser_ctx)
 
@@ -495,7 +505,7 @@ class HTTPConnection(netius.Connection):
         # tries to retrieve the proper gzip object for the requested
         # stream and in case there's one or if the ensure flag is set
         # the retrieved value is returned to the caller method
-        gzip = self.gzip_m.get(stream, None)
+        gzip = self.gzip_m.get(stream, None) if self.gzip_m else None
         if gzip or not ensure:
             return gzip
 
@@ -507,11 +517,14 @@ class HTTPConnection(netius.Connection):
         gzip = zlib.compressobj(level, zlib.DEFLATED, wbits)
 
         # updates the gzip objects map with the gzip object that has
-        # just been created for the target stream
-        self.gzip_m[stream] = gzip
+        # just been created for the target stream, creating the map in
+        # case this is the first compressed stream of the connection
+        self._set_gzip(stream, gzip)
         return gzip
 
     def _set_gzip(self, stream, gzip):
+        if self.gzip_m == None:
+            self.gzip_m = dict()
         self.gzip_m[stream] = gzip
 
     def _unset_gzip(self, stream):
@@ -524,9 +537,9 @@ class HTTPConnection(netius.Connection):
             return
 
         # saves the current gzip object map locally (releasing reference)
-        # and then recreates a new empty dictionary on the other object
+        # and then unsets the map, to be re-created only if required
         gzip_m = self.gzip_m
-        self.gzip_m = dict()
+        self.gzip_m = None
 
         # iterates over the complete set of gzip object to run the flush
         # operation over each of them, as expected for proper and final
@@ -551,14 +564,21 @@ class HTTPServer(netius.StreamServer):
     headers and read of data.
     """
 
+    read_view_safe = True
+    """ The HTTP (and HTTP2) parsers copy the data they keep so the
+    memory views of the read into mode are safe to be used """
+
     BASE_HEADERS = {"Server": netius.IDENTIFIER}
     """ The map containing the complete set of headers
     that are meant to be applied to all the responses """
 
-    def __init__(self, encoding="plain", common_log=None, *args, **kwargs):
+    def __init__(
+        self, encoding="plain", common_log=None, keep_alive_timeout=0.0, *args, **kwargs
+    ):
         netius.StreamServer.__init__(self, *args, **kwargs)
         self.encoding_s = encoding
         self.common_log = common_log
+        self.keep_alive_timeout = keep_alive_timeout
         self.dynamic = False
         self.common_file = None
 
@@ -672,6 +692,19 @@ class HTTPServer(netius.StreamServer):
         info.update(encoding_s=self.encoding_s)
         return info
 
+    def on_drain(self):
+        netius.StreamServer.on_drain(self)
+
+        # closes the keep-alive connections that are waiting for a new
+        # request, the ones handling a request are closed as soon as their
+        # response is sent (keep-alive is no longer granted while draining)
+        for connection in list(self.connections):
+            if not isinstance(connection, HTTPConnection):
+                continue
+            if not connection.is_waiting():
+                continue
+            connection.close()
+
     def on_data(self, connection, data):
         netius.StreamServer.on_data(self, connection, data)
         connection.parse(data)
@@ -682,6 +715,12 @@ class HTTPServer(netius.StreamServer):
             self.encoding_s = self.get_env("ENCODING", self.encoding_s)
         if self.env:
             self.common_log = self.get_env("COMMON_LOG", self.common_log)
+        if self.env:
+            self.keep_alive_timeout = self.get_env(
+                "KEEP_ALIVE_TIMEOUT", self.keep_alive_timeout, cast=float
+            )
+        if self.keep_alive_timeout:
+            self.ensure_idle()
         if self.common_log:
             self.common_file = open(self.common_log, "wb+")
         self.encoding = ENCODING_MAP.get(self.encoding_s, PLAIN_ENCODING)
@@ -695,11 +734,29 @@ class HTTPServer(netius.StreamServer):
         )
 
     def on_data_http(self, connection, parser):
+        self.requests_c += 1
         is_debug = self.is_debug()
         if is_debug:
             self._log_request(connection, parser)
         connection.resolve_encoding(parser)
 
+        # verifies that this is a connection request and not an HTTP/2
+        # stream one, as only connections are subject to keep-alive
+        if not isinstance(connection, HTTPConnection):
+            return
+
+        # in case the server is draining the keep-alive is no longer granted
+        # so that the connection is closed once the response is sent
+        if self._draining:
+            parser.keep_alive = False
+
+        # marks the connection as handling a request and suspends the idle
+        # (keep-alive) verification of it while the request is being handled,
+        # the connection is registered again once the response is flushed
+        connection.waiting = False
+        if self._idle:
+            self._idle.remove(connection)
+
     def on_send_http(
         self, connection, parser, headers=None, version=None, code=200, code_s=None
     ):
@@ -723,6 +780,29 @@ class HTTPServer(netius.StreamServer):
             self.name,
         )
 
+        # verifies that the connection is kept alive for the next request,
+        # note that HTTP/2 streams are not considered (only connections)
+        if not isinstance(connection, HTTPConnection):
+            return
+        if not parser.keep_alive or not connection.is_open():
+            return
+
+        # in case the server started draining while the request was being
+        # handled the connection is closed once the response is sent, as
+        # no new request is going to be handled by the server
+        if self._draining:
+            connection.close(flush=True)
+            return
+
+        # marks the connection as waiting for the next request and (re-)registers
+        # it in the idle buckets with the keep-alive timeout, so that it's
+        # closed if no new request arrives in that period
+        connection.waiting = True
+        timeout = self.keep_alive_timeout or self.idle_timeout
+        if not self._idle or not timeout:
+            return
+        self._idle.add(connection, timeout)
+
     def authorize(self, connection, parser, auth=None, **kwargs):
         # determines the proper authorization method to be used
         # taking into account either the provided method or the
@@ -48,6 +48,19 @@ from . import http
 
 class HTTP2Connection(http.HTTPConnection):
 
+    __slots__ = (
+        "settings",
+        "settings_r",
+        "window",
+        "window_o",
+        "window_l",
+        "window_t",
+        "preface",
+        "preface_b",
+        "frames",
+        "unavailable",
+    )
+
     def __init__(
         self,
         legacy=True,
@@ -59,8 +72,8 @@ class HTTP2Connection(http.HTTPConnection):
     ):
         http.HTTPConnection.__init__(self, *args, **kwargs)
         self.legacy = legacy
-        self.settings = dict(settings)
-        self.settings_r = dict(settings_r)
+        self.settings = settings
+        self.settings_r = settings_r
         self.window = window
         self.window_o = self.settings[netius.common.http2.SETTINGS_INITIAL_WINDOW_SIZE]
         self.window_l = self.window_o
@@ -735,7 +748,12 @@ class HTTP2Connection(http.HTTPConnection):
             self.try_available(stream)
 
     def set_settings(self, settings):
-        self.settings_r.update(settings)
+        # the remote settings start as a reference to the (shared)
+        # default settings, so a copy is created on every change
+        # (copy on write) and the connection owns it from now on
+        settings_r = dict(self.settings_r)
+        settings_r.update(settings)
+        self.settings_r = settings_r
 
         # propagates a peer-driven `SETTINGS_HEADER_TABLE_SIZE` change
         # to the HPACK encoder so the dynamic table stays bounded by
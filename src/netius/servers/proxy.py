@@ -127,6 +127,10 @@ class ProxyServer(http2.HTTP2Server):
       outbound socket exceed `MAX_PENDING` and resumes when the buffer
       drains below `min_pending`. This prevents producer-consumer
       starvation and uncontrolled memory growth.
+    * **Zero-copy tunnels** - with `splice` set to *True* the raw
+      tunnels (CONNECT and WebSocket upgrades) between plain TCP
+      connections move the data between both sockets using a kernel
+      pipe (Linux only), falling back to the regular path for TLS.
     * **Origin rewriting** - with `trust_origin` set to *False* the
       proxy rewrites `Host`, `Origin` and `Via` headers in order to
       guarantee a single authoritative origin and mitigate header
@@ -151,6 +155,7 @@ class ProxyServer(http2.HTTP2Server):
         throttle=True,
         trust_origin=False,
         max_pending=MAX_PENDING,
+        splice=False,
         *args,
         **kwargs
     ):
@@ -166,6 +171,7 @@ class ProxyServer(http2.HTTP2Server):
         self.trust_origin = trust_origin
         self.max_pending = max_pending
         self.min_pending = int(max_pending * MIN_RATIO)
+        self.splice = splice
         self.conn_map = {}
 
         self.http_client = netius.clients.HTTPClient(
@@ -353,18 +359,10 @@ class ProxyServer(http2.HTTP2Server):
             connection.parse(data)
             return
 
-        # verifies that the current size of the pending buffer is greater
-        # than the maximum size for the pending buffer the read operations
-        # if that the case the read operations must be disabled
-        should_throttle = self.throttle and connection.is_throttleable()
-        should_disable = should_throttle and tunnel_c.is_exhausted()
-        if should_disable:
-            connection.disable_read()
-
-        # performs the sending operation on the data but uses the throttle
-        # callback so that the connection read operations may be resumed if
-        # the buffer has reached certain (minimum) levels
-        tunnel_c.send(data, callback=self._throttle)
+        # sends the data to the tunnel connection, notice that no explicit
+        # throttling is required as (for throttleable connections) both ends
+        # are linked and the write buffer watermarks pause the reading
+        tunnel_c.send(data)
 
     def on_connection_d(self, connection):
         http2.HTTP2Server.on_connection_d(self, connection)
@@ -404,6 +402,8 @@ class ProxyServer(http2.HTTP2Server):
             self.trust_origin = self.get_env(
                 "TRUST_ORIGIN", self.trust_origin, cast=bool
             )
+        if self.env:
+            self.splice = self.get_env("SPLICE", self.splice, cast=bool)
         if self.dynamic:
             self.info("Using dynamic encoding (no content re-encoding) in proxy ...")
         if self.throttle:
@@ -412,6 +412,8 @@ class ProxyServer(http2.HTTP2Server):
             self.info("Not throttling connections in proxy ...")
         if self.trust_origin:
             self.info('Origin is considered "trustable" by proxy')
+        if self.splice:
+            self.info("Using zero-copy (splice) tunnels in proxy ...")
 
     def on_data_http(self, connection, parser):
         http2.HTTP2Server.on_data_http(self, connection, parser)
@@ -798,6 +800,12 @@ class ProxyServer(http2.HTTP2Server):
     def _on_raw_connect(self, client, _connection):
         connection = self.conn_map[_connection]
 
+        # links both ends of the tunnel so that crossing the high water
+        # mark of one of the write buffers pauses the reading of the other
+        # end, not possible for HTTP/2 streams (throttled by their window)
+        if self.throttle and connection.is_throttleable():
+            _connection.link(connection)
+
         # retrieves the optional response and data values that may have
         # been associated with the tunnel connection, the response is
         # sent to the front-end to acknowledge the tunnel and the data
@@ -823,8 +831,22 @@ class ProxyServer(http2.HTTP2Server):
             _connection.send(data)
             _connection.tunnel_d = None
 
+        # in case the zero-copy mode is enabled tries to splice both ends
+        # of the tunnel, only possible for plain (no SSL) connections, the
+        # data that is still pending is sent before any of the spliced data
+        if self.splice and connection.is_throttleable():
+            connection.splice(_connection)
+
     def _on_raw_data(self, client, _connection, data):
         connection = self.conn_map[_connection]
+
+        # in case the front-end connection is linked with the back-end one
+        # the watermarks take care of the throttling, otherwise (eg: HTTP/2
+        # stream) the exhaustion of the front-end is verified explicitly
+        if _connection.linked:
+            connection.send(data)
+            return
+
         should_throttle = self.throttle and _connection.is_throttleable()
         should_disable = should_throttle and connection.is_exhausted()
         if should_disable:
@@ -131,7 +131,13 @@ class SOCKSServer(netius.ServerAgent):
     """
 
     def __init__(
-        self, rules={}, throttle=True, max_pending=MAX_PENDING, *args, **kwargs
+        self,
+        rules={},
+        throttle=True,
+        max_pending=MAX_PENDING,
+        splice=False,
+        *args,
+        **kwargs
     ):
         netius.ContainerServer.__init__(
             self,
@@ -144,6 +150,7 @@ class SOCKSServer(netius.ServerAgent):
         self.throttle = throttle
         self.max_pending = max_pending
         self.min_pending = int(max_pending * MIN_RATIO)
+        self.splice = splice
         self.conn_map = {}
 
         _loop, self.raw_protocol = netius.clients.RawClient.protocol()
@@ -171,17 +178,10 @@ class SOCKSServer(netius.ServerAgent):
             connection.parse(data)
             return
 
-        # verifies that the current size of the pending buffer is greater
-        # than the maximum size for the pending buffer the read operations
-        # if that the case the read operations must be disabled
-        should_disable = self.throttle and tunnel_c.is_exhausted()
-        if should_disable:
-            connection.disable_read()
-
-        # performs the sending operation on the data but uses the throttle
-        # callback so that the connection read operations may be resumed if
-        # the buffer has reached certain (minimum) levels
-        tunnel_c.send(data, callback=self._throttle)
+        # sends the data to the tunnel connection, notice that no explicit
+        # throttling is required as both connections are linked and so the
+        # write buffer watermarks pause and resume the reading
+        tunnel_c.send(data)
 
     def on_data_socks(self, connection, parser):
         host = parser.get_host()
@@ -221,53 +221,30 @@ class SOCKSServer(netius.ServerAgent):
             min_pending=self.min_pending,
         )
 
-    def _throttle(self, _connection):
-        if not _connection.is_restored():
-            return
-
-        # tries to resolve a protocol from the possible transport
-        # parameter (parameter can be a protocol or a transport)
-        # and then uses the resolved value as the key, notice that
-        # in case the connection is in a final closing flush state
-        # (graceful closing) the connection mapping may have already
-        # been removed (requires early return)
-        _connection_key = getattr(_connection, "_protocol", _connection)
-        if not _connection_key in self.conn_map:
-            return
-        connection = self.conn_map[_connection_key]
-
-        if not connection.renable == False:
-            return
-        connection.enable_read()
-        self.reads((connection.socket,), state=False)
-
-    def _raw_throttle(self, connection):
-        if not connection.is_restored():
-            return
-
-        tunnel_c = hasattr(connection, "tunnel_c") and connection.tunnel_c
-        if not tunnel_c:
-            return
-        if not tunnel_c.renable == False:
-            return
-
-        tunnel_c.enable_read()
-        self.reads((tunnel_c.socket,), state=False)
-
     def _on_raw_connect(self, client, _connection):
         connection = self.conn_map[_connection]
+
+        # links both ends of the tunnel so that crossing the high water
+        # mark of one of the write buffers pauses the reading of the other
+        # end, bounding the memory used by the pair of connections
+        if self.throttle:
+            _connection.link(connection)
+
         version = connection.get_version()
         if version == 0x04:
             connection.send_response(status=GRANTED)
         elif version == 0x05:
             connection.send_response_extra(status=GRANTED_EXTRA)
 
+        # in case the zero-copy mode is enabled tries to splice both ends
+        # of the tunnel (plain connections only), the response is still
+        # sent before any of the spliced data (pending data goes first)
+        if self.splice:
+            connection.splice(_connection)
+
     def _on_raw_data(self, client, _connection, data):
         connection = self.conn_map[_connection]
-        should_disable = self.throttle and connection.is_exhausted()
-        if should_disable:
-            _connection.disable_read()
-        connection.send(data, callback=self._raw_throttle)
+        connection.send(data)
 
     def _on_raw_close(self, client, _connection):
         connection = self.conn_map[_connection]
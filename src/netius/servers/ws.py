@@ -54,6 +54,8 @@ class WSConnection(netius.Connection):
     :see: http://tools.ietf.org/html/rfc6455
     """
 
+    __slots__ = ("handshake", "method", "path", "version", "buffer_l", "headers")
+
     def __init__(self, *args, **kwargs):
         netius.Connection.__init__(self, *args, **kwargs)
         self.handshake = False
@@ -28,9 +28,15 @@ __copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import os
+import time
+import signal
+import socket
 import unittest
+import threading
 
 import netius
+import netius.servers
 
 
 class BaseTest(unittest.TestCase):
@@ -43,3 +49,322 @@ class BaseTest(unittest.TestCase):
 
         self.assertNotEqual(result, None)
         self.assertEqual(isinstance(result, str), True)
+
+
+class ReadBudgetTest(unittest.TestCase):
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        self.reader, self.writer = socket.socketpair()
+        self.reader.setblocking(False)
+        self.writer.sendall(b"x" * 65536)
+
+    def tearDown(self):
+        unittest.TestCase.tearDown(self)
+        self.reader.close()
+        self.writer.close()
+
+    def build(self, poll):
+        loop = netius.Base(poll=poll, read_budget=16384)
+        received = []
+        loop.on_data_base = lambda connection, data: received.append(len(data))
+        connection = netius.Connection(owner=loop, socket=self.reader)
+        connection.status = netius.OPEN
+        loop.connections_m[self.reader] = connection
+        return loop, received
+
+    def test_level(self):
+        loop, received = self.build(netius.SelectPoll)
+
+        loop.on_read(self.reader)
+
+        self.assertEqual(sum(received), 16384)
+        self.assertEqual(loop.budget_c, 1)
+        self.assertEqual(loop.requeues_c, 0)
+        self.assertEqual(len(loop._delayed), 0)
+
+    def test_edge(self):
+        loop, received = self.build(netius.EpollPoll)
+
+        loop.on_read(self.reader)
+
+        self.assertEqual(sum(received), 16384)
+        self.assertEqual(loop.budget_c, 1)
+        self.assertEqual(loop.requeues_c, 1)
+        self.assertEqual(loop.get_poll_timeout(), 0.0)
+
+        for _index in range(3):
+            loop._delays()
+            loop._lid += 1
+
+        self.assertEqual(sum(received), 65536)
+        self.assertEqual(loop.budget_c, 4)
+        self.assertEqual(loop.requeues_c, 4)
+
+    def test_iterations(self):
+        loop, received = self.build(netius.SelectPoll)
+        loop.read_budget = 0
+        loop.read_iterations = 2
+
+        loop.on_read(self.reader)
+
+        self.assertEqual(len(received), 2)
+        self.assertEqual(loop.budget_c, 1)
+
+
+class MockNotifyPool(object):
+
+    def __init__(self):
+        self.count = 0
+
+    def notify(self):
+        self.count += 1
+
+
+class DelaySafeTest(unittest.TestCase):
+
+    def test_coalesce(self):
+        loop = netius.Base()
+        values = []
+        loop.npool = MockNotifyPool()
+
+        def produce():
+            for index in range(100):
+                loop.delay_s(lambda index=index: values.append(index))
+
+        thread = threading.Thread(target=produce)
+        thread.start()
+        thread.join()
+
+        self.assertEqual(loop.npool.count, 1)
+        self.assertEqual(len(loop._delayed_n), 100)
+        self.assertEqual(loop.get_poll_timeout(), 0.0)
+
+        loop._delays()
+
+        self.assertEqual(sorted(values), list(range(100)))
+        self.assertEqual(len(loop._delayed_n), 0)
+
+        loop.delay_s(lambda: values.append(100))
+        loop.delay_s(lambda: values.append(101), wakeup=False)
+
+        self.assertEqual(loop.npool.count, 2)
+
+        loop._delays()
+
+        self.assertEqual(sorted(values[-2:]), [100, 101])
+
+    def test_threads(self):
+        loop = netius.Base()
+        values = []
+
+        def produce():
+            for _index in range(10000):
+                loop.delay_s(lambda: values.append(1), wakeup=False)
+
+        threads = [threading.Thread(target=produce) for _index in range(4)]
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            loop.delay_m()
+        loop.delay_m()
+        loop._delays()
+
+        self.assertEqual(len(values), 40000)
+
+    def test_no_pool(self):
+        loop = netius.Base()
+        values = []
+
+        loop.delay_s(lambda: values.append(1))
+        self.assertEqual(loop._delayed_w, False)
+
+        loop.npool = MockNotifyPool()
+        loop.delay_s(lambda: values.append(2))
+        self.assertEqual(loop._delayed_w, True)
+        self.assertEqual(loop.npool.count, 1)
+
+    def test_blocking(self):
+        if not hasattr(signal, "SIGUSR1"):
+            self.skipTest("No SIGUSR1 support available")
+        if not netius.legacy.PYTHON_35:
+            self.skipTest("No poll retry on signal (PEP 475) available")
+
+        loop = netius.Base()
+        values = []
+
+        # the first submission is done from a signal handler (main thread)
+        # while the loop is blocked in the poll operation, and the second
+        # one from a different thread, both must awake the loop promptly
+        def handler(signum=None, frame=None):
+            loop.delay_s(lambda: values.append("signal"))
+
+        def produce():
+            time.sleep(0.2)
+            os.kill(os.getpid(), signal.SIGUSR1)
+            while not values:
+                time.sleep(0.01)
+            time.sleep(0.2)
+            loop.delay_s(loop.stop)
+
+        previous = signal.signal(signal.SIGUSR1, handler)
+        try:
+            thread = threading.Thread(target=produce)
+            thread.start()
+            start = time.time()
+            loop.delay(loop.stop, timeout=10.0)
+            loop.start()
+            thread.join()
+        finally:
+            signal.signal(signal.SIGUSR1, previous)
+
+        self.assertEqual(values, ["signal"])
+        self.assertEqual(time.time() - start < 5.0, True)
+
+
+class ReadViewTest(unittest.TestCase):
+
+    def test_safe(self):
+        base = netius.Base(read_into=True)
+        self.assertEqual(base.read_view_safe, False)
+        self.assertEqual(base.get_read_view(), None)
+
+        server = netius.servers.HTTPServer(read_into=False)
+        self.assertEqual(server.read_view_safe, True)
+        self.assertEqual(server.get_read_view(), None)
+
+        server = netius.servers.HTTPServer(read_into=True)
+        view = server.get_read_view()
+        if netius.legacy.PYTHON_3:
+            self.assertEqual(type(view), memoryview)
+            self.assertEqual(server.get_read_view() is view, True)
+        else:
+            self.assertEqual(view, None)
+
+    def test_servers(self):
+        self.assertEqual(netius.servers.HTTP2Server.read_view_safe, True)
+        self.assertEqual(netius.servers.ProxyServer.read_view_safe, True)
+        self.assertEqual(netius.servers.SMTPServer.read_view_safe, False)
+        self.assertEqual(netius.servers.POPServer.read_view_safe, False)
+        self.assertEqual(netius.servers.FTPServer.read_view_safe, False)
+
+
+class SupervisorTest(unittest.TestCase):
+
+    def fork(self, sleep=0.0):
+        if not hasattr(os, "fork"):
+            self.skipTest("No fork support available")
+        pid = os.fork()
+        if pid == 0:
+            time.sleep(sleep)
+            os._exit(1)
+        return pid
+
+    def register(self, loop, pid, index=0, generation=0):
+        loop._childs.append(pid)
+        loop._child_m[pid] = dict(
+            index=index,
+            generation=generation,
+            started=time.time(),
+            ready=False,
+            retiring=False,
+        )
+
+    def reap(self, loop, pid, timeout=10.0):
+        # runs the reap operation until the child process has exited and
+        # has been reaped, this avoids relying on os.waitid() that is not
+        # available under every platform (eg: Python 2 and macOS)
+        deadline = time.time() + timeout
+        while pid in loop._child_m and time.time() < deadline:
+            loop._reap()
+            time.sleep(0.01)
+
+    def test_reap(self):
+        loop = netius.Base()
+        loop._running = True
+
+        for backoff in (0.5, 1.0, 2.0):
+            pid = self.fork()
+            self.register(loop, pid)
+
+            self.reap(loop, pid)
+
+            self.assertEqual(loop._childs, [])
+            self.assertEqual(loop._child_m, {})
+            self.assertEqual(loop._backoff_m[0], backoff)
+
+        self.assertEqual(len(loop._delayed), 3)
+
+    def test_reap_retiring(self):
+        loop = netius.Base()
+        loop._running = True
+
+        pid = self.fork()
+        self.register(loop, pid)
+        loop._child_m[pid]["retiring"] = True
+
+        self.reap(loop, pid)
+
+        self.assertEqual(loop._child_m, {})
+        self.assertEqual(loop._backoff_m, {})
+        self.assertEqual(len(loop._delayed), 0)
+
+    def test_ready(self):
+        loop = netius.Base()
+        loop.children = 2
+        loop._generation = 1
+
+        pid = self.fork(sleep=10.0)
+        self.register(loop, pid, generation=0)
+        self.register(loop, -1, index=0, generation=1)
+        self.register(loop, -2, index=1, generation=1)
+
+        loop._ready(-1)
+        self.assertEqual(loop._child_m[pid]["retiring"], False)
+
+        loop._ready(-2)
+        self.assertEqual(loop._child_m[pid]["retiring"], True)
+
+        _pid, status = os.waitpid(pid, 0)
+        self.assertEqual(os.WIFSIGNALED(status), True)
+        self.assertEqual(os.WTERMSIG(status), signal.SIGUSR2)
+
+    def test_drain(self):
+        loop = netius.Base()
+        loop._running = True
+        loop.connections.append(None)
+
+        loop.drain(timeout=0.0)
+        self.assertEqual(loop._running, False)
+
+    def test_drain_signal(self):
+        if not hasattr(signal, "SIGUSR2"):
+            self.skipTest("No SIGUSR2 support available")
+        if not netius.legacy.PYTHON_35:
+            self.skipTest("No poll retry on signal (PEP 475) available")
+
+        loop = netius.Base()
+        drains = []
+        loop.bind("drain", lambda loop: drains.append(loop))
+
+        # sends the drain signal while the loop is blocked in the poll
+        # operation (no other delayed call is due), the loop must awake
+        # and stop promptly as there are no connections to be drained
+        def produce():
+            time.sleep(0.2)
+            os.kill(os.getpid(), signal.SIGUSR2)
+
+        previous = signal.getsignal(signal.SIGUSR2)
+        try:
+            loop.bind_drain()
+            thread = threading.Thread(target=produce)
+            thread.start()
+            start = time.time()
+            loop.delay(loop.stop, timeout=10.0)
+            loop.start()
+            thread.join()
+        finally:
+            signal.signal(signal.SIGUSR2, previous)
+
+        self.assertEqual(drains, [loop])
+        self.assertEqual(time.time() - start < 5.0, True)
@@ -0,0 +1,497 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import socket
+import tempfile
+import threading
+import unittest
+
+import netius
+
+
+class MockSocket(object):
+
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.chunks = []
+        self.calls = []
+
+    @property
+    def data(self):
+        return b"".join(self.chunks)
+
+    @data.setter
+    def data(self, value):
+        self.chunks = [value]
+
+    def send(self, data):
+        data = data[: self.limit] if self.limit else data
+        self.calls.append(("send", 1))
+        self.chunks.append(netius.legacy.bytes(data))
+        return len(data)
+
+    def sendmsg(self, buffers):
+        data = b"".join([netius.legacy.bytes(buffer) for buffer in buffers])
+        data = data[: self.limit] if self.limit else data
+        self.calls.append(("sendmsg", len(buffers)))
+        self.chunks.append(data)
+        return len(data)
+
+    def recv_into(self, buffer):
+        data = self.data[: len(buffer)]
+        self.data = self.data[len(data) :]
+        buffer[: len(data)] = data
+        return len(data)
+
+
+class MockOwner(object):
+
+    def __init__(self):
+        self.connections = []
+        self.connections_m = {}
+        self.calls = []
+
+    def sub_read(self, socket):
+        self.calls.append("sub_read")
+
+    def unsub_read(self, socket):
+        self.calls.append("unsub_read")
+
+    def unsub_write(self, socket):
+        self.calls.append("unsub_write")
+
+    def unsub_all(self, socket):
+        self.calls.append("unsub_all")
+
+    def reads(self, reads, state=True):
+        self.calls.append("reads")
+
+    def del_connection(self, connection):
+        self.calls.append("del_connection")
+
+
+class PendingBufferTest(unittest.TestCase):
+
+    def test_consume(self):
+        buffer = netius.PendingBuffer()
+        callback = lambda connection: None
+
+        buffer.push(b"hello")
+        buffer.push(b"world", callback=callback)
+        buffer.push(b"first", back=False)
+
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.peek(), (b"first", None, None))
+
+        self.assertEqual(buffer.consume(3), [])
+        data, _address, _callback = buffer.peek()
+        self.assertEqual(type(data), memoryview)
+        self.assertEqual(netius.legacy.bytes(data), b"st")
+
+        self.assertEqual(buffer.consume(4), [None])
+        self.assertEqual(len(buffer), 2)
+        self.assertEqual(
+            [netius.legacy.bytes(view) for view in buffer.views(8)], [b"llo", b"world"]
+        )
+
+        self.assertEqual(buffer.consume(8), [None, callback])
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(bool(buffer), False)
+
+    def test_views(self):
+        buffer = netius.PendingBuffer()
+
+        buffer.push(b"hello")
+        buffer.push(b"world")
+        buffer.push(None)
+        buffer.push(b"extra")
+
+        self.assertEqual(buffer.views(8), [b"hello", b"world"])
+        self.assertEqual(buffer.views(1), [b"hello"])
+
+        buffer.consume(10)
+
+        self.assertEqual(buffer.views(8), [])
+        self.assertEqual(buffer.pop(), (None, None, None))
+        self.assertEqual(buffer.views(8), [b"extra"])
+
+    def test_read(self):
+        buffer = netius.PendingBuffer()
+
+        buffer.push(b"hello world")
+        buffer.push(b"extra")
+
+        self.assertEqual(buffer.read(5), b"hello")
+        self.assertEqual(buffer.read(1), b" ")
+        self.assertEqual(buffer.read(1024), b"world")
+        self.assertEqual(buffer.read(1024), b"extra")
+        self.assertEqual(buffer.read(1024), b"")
+
+    def test_lazy(self):
+        buffer = netius.PendingBuffer()
+
+        self.assertEqual(buffer._entries, ())
+        self.assertEqual(buffer.views(8), [])
+        self.assertEqual(buffer.consume(0), [])
+
+        buffer.push(b"hello")
+        self.assertEqual(len(buffer), 1)
+        self.assertNotEqual(buffer._entries, ())
+
+        buffer.consume(5)
+        self.assertEqual(buffer._entries, ())
+
+        buffer.push(b"hello")
+        buffer.clear()
+        self.assertEqual(buffer._entries, ())
+        self.assertEqual(bool(buffer), False)
+
+
+class FileRegionTest(unittest.TestCase):
+
+    def test_buffer(self):
+        buffer = netius.PendingBuffer()
+        region = netius.FileRegion(0, 10, 100)
+
+        buffer.push(b"head")
+        buffer.push(region)
+        buffer.push(b"tail")
+
+        self.assertEqual(buffer.views(10), [b"head"])
+        self.assertEqual(buffer.consume(4), [None])
+        self.assertEqual(buffer.views(10), [])
+        self.assertEqual(buffer.peek()[0], region)
+
+        buffer.consume(40)
+        data = buffer.peek()[0]
+
+        self.assertEqual(type(data), netius.FileRegion)
+        self.assertEqual(data.offset, 50)
+        self.assertEqual(len(data), 60)
+
+        buffer.consume(60)
+
+        self.assertEqual(buffer.peek()[0], b"tail")
+
+    def test_send(self):
+        if not netius.conn.is_sendfile:
+            self.skipTest("Skipping test: sendfile unavailable")
+
+        file = tempfile.TemporaryFile()
+        first, second = socket.socketpair()
+        try:
+            file.write(b"0123456789")
+            file.flush()
+
+            connection = netius.Connection(socket=first)
+            sent = []
+
+            self.assertEqual(connection.can_sendfile(), True)
+
+            connection.pend((b"head-", None, None))
+            connection.pend((netius.FileRegion(file, 2, 6), None, sent.append))
+            connection.pend((b"-tail", None, None))
+
+            self.assertEqual(connection.pending_s, 16)
+
+            connection._send()
+
+            self.assertEqual(second.recv(1024), b"head-234567-tail")
+            self.assertEqual(sent, [connection])
+            self.assertEqual(connection.pending_s, 0)
+
+            connection.ssl = True
+
+            self.assertEqual(connection.can_sendfile(), False)
+        finally:
+            file.close()
+            first.close()
+            second.close()
+
+
+class BaseConnectionTest(unittest.TestCase):
+
+    def test_send_vector(self):
+        socket = MockSocket()
+        connection = netius.Connection(socket=socket)
+        sent = []
+
+        for index in range(5):
+            data = ("part-%d" % index).encode("utf-8")
+            callback = lambda connection, index=index: sent.append(index)
+            connection.pend((data, None, callback))
+
+        self.assertEqual(connection.pending_s, 30)
+
+        connection._send()
+
+        self.assertEqual(socket.data, b"part-0part-1part-2part-3part-4")
+        self.assertEqual(socket.calls, [("sendmsg", 5)])
+        self.assertEqual(sent, [0, 1, 2, 3, 4])
+        self.assertEqual(connection.pending_s, 0)
+        self.assertEqual(len(connection.pending), 0)
+
+    def test_send_vector_partial(self):
+        socket = MockSocket(limit=8)
+        connection = netius.Connection(socket=socket)
+        sent = []
+
+        for index in range(3):
+            data = ("part-%d" % index).encode("utf-8")
+            callback = lambda connection, index=index: sent.append(index)
+            connection.pend((data, None, callback))
+
+        connection._send()
+
+        self.assertEqual(socket.data, b"part-0part-1part-2")
+        self.assertEqual(socket.calls, [("sendmsg", 3), ("sendmsg", 2), ("send", 1)])
+        self.assertEqual(sent, [0, 1, 2])
+        self.assertEqual(connection.pending_s, 0)
+        self.assertEqual(len(connection.pending), 0)
+
+    def test_send_vector_close(self):
+        socket = MockSocket()
+        connection = netius.Connection(socket=socket)
+
+        connection.pend((b"hello", None, None))
+        connection.pend((b"world", None, None))
+        connection.pend((None, None, None))
+
+        connection._send()
+
+        self.assertEqual(socket.data, b"helloworld")
+        self.assertEqual(socket.calls, [("sendmsg", 2)])
+        self.assertEqual(connection.pending_s, 0)
+
+    def test_send_partial(self):
+        socket = MockSocket(limit=4)
+        connection = netius.Connection(socket=socket)
+        connection.vectored = False
+        sent = []
+
+        data = b"hello world"
+        connection.pend((data, None, lambda connection: sent.append(True)))
+
+        connection._send()
+
+        self.assertEqual(socket.data, b"hello world")
+        self.assertEqual(socket.calls, [("send", 1), ("send", 1), ("send", 1)])
+        self.assertEqual(sent, [True])
+        self.assertEqual(connection.pending_s, 0)
+        self.assertEqual(len(connection.pending), 0)
+
+    def test_recv_restored(self):
+        connection = netius.Connection()
+
+        connection.restore(b"hello world")
+        connection.restore(b"extra")
+
+        self.assertEqual(connection.restored_s, 16)
+        self.assertEqual(connection._recv_restored(5), b"hello")
+        self.assertEqual(connection.restored_s, 11)
+        self.assertEqual(len(connection.restored), 2)
+        self.assertEqual(connection._recv_restored(1024), b" world")
+        self.assertEqual(connection._recv_restored(1024), b"extra")
+        self.assertEqual(connection.restored_s, 0)
+        self.assertEqual(len(connection.restored), 0)
+
+    def test_send_plain(self):
+        socket = MockSocket()
+        connection = netius.Connection(socket=socket)
+        connection.vectored = False
+
+        connection.pend((b"hello", None, None))
+        connection.pend((b"world", None, None))
+
+        connection._send()
+
+        self.assertEqual(socket.data, b"helloworld")
+        self.assertEqual(socket.calls, [("send", 1), ("send", 1)])
+        self.assertEqual(connection.pending_s, 0)
+
+    def test_recv_into(self):
+        socket = MockSocket()
+        socket.data = b"hello world"
+        connection = netius.Connection(socket=socket)
+        connection.status = netius.OPEN
+        buffer = memoryview(bytearray(8))
+
+        connection.restore(b"extra")
+
+        data = connection.recv_into(buffer)
+        self.assertEqual(type(data), memoryview)
+        self.assertEqual(netius.legacy.bytes(data), b"extra")
+        self.assertEqual(connection.restored_s, 0)
+
+        data = connection.recv_into(buffer)
+        self.assertEqual(netius.legacy.bytes(data), b"hello wo")
+
+        data = connection.recv_into(buffer)
+        self.assertEqual(netius.legacy.bytes(data), b"rld")
+
+        data = connection.recv_into(buffer)
+        self.assertEqual(netius.legacy.bytes(data), b"")
+
+    def test_send_view(self):
+        owner = netius.Base()
+        owner.tid = threading.current_thread().ident
+        socket = MockSocket(limit=4)
+        connection = netius.Connection(owner=owner, socket=socket)
+        connection.status = netius.OPEN
+        connection.wready = True
+        buffer = bytearray(b"hello world")
+
+        connection.send(memoryview(buffer))
+        buffer[:] = b"XXXXXXXXXXX"
+
+        self.assertEqual(socket.data, b"hell")
+        self.assertEqual(connection.pending_s, 7)
+        self.assertEqual(netius.legacy.bytes(connection.pending.peek()[0]), b"o world")
+
+        connection.wready = False
+        connection.send(memoryview(b"extra"))
+
+        self.assertEqual(socket.data, b"hell")
+        self.assertEqual(connection.pending_s, 12)
+
+    def test_send_view_unowned(self):
+        socket = MockSocket()
+        connection = netius.Connection(socket=socket)
+        connection.status = netius.OPEN
+        connection.wready = True
+
+        data = connection._send_view(memoryview(b"hello"))
+
+        self.assertEqual(data, b"hello")
+        self.assertEqual(socket.data, b"")
+
+    def test_slots(self):
+        connection = netius.Connection()
+
+        self.assertEqual(hasattr(connection, "__slots__"), True)
+        self.assertEqual(connection.__dict__, {})
+        self.assertEqual(connection.ssl_host, None)
+        self.assertEqual(connection.ssl_handshake, False)
+        self.assertEqual(connection.starters, ())
+
+        connection.ssl_host = "localhost"
+        connection.custom = 1
+
+        self.assertEqual(connection.ssl_host, "localhost")
+        self.assertEqual(connection.__dict__, dict(ssl_host="localhost", custom=1))
+        self.assertEqual(netius.Connection.ssl_host, None)
+
+        starter = lambda connection: None
+        connection.add_starter(starter)
+        self.assertEqual(list(connection.starters), [starter])
+        connection.remove_starter(starter)
+        self.assertEqual(len(connection.starters), 0)
+
+    def test_watermarks(self):
+        owner = MockOwner()
+        connection = netius.Connection(socket=MockSocket())
+        peer = netius.Connection(owner=owner, socket=MockSocket())
+        peer.status = netius.OPEN
+        events = []
+
+        connection.set_watermarks(10)
+        connection.link(peer)
+        connection.bind("high_water", lambda connection: events.append("high"))
+        connection.bind("low_water", lambda connection: events.append("low"))
+
+        self.assertEqual(connection.max_pending, 10)
+        self.assertEqual(connection.min_pending, 2)
+        self.assertEqual(connection.linked, (peer,))
+        self.assertEqual(peer.linked, (connection,))
+
+        connection.pend((b"hello", None, None))
+
+        self.assertEqual(connection.wpaused, False)
+        self.assertEqual(peer.renable, True)
+
+        connection.pend((b"world!", None, None))
+
+        self.assertEqual(connection.wpaused, True)
+        self.assertEqual(peer.renable, False)
+        self.assertEqual(owner.calls, ["unsub_read"])
+        self.assertEqual(events, ["high"])
+
+        connection._send()
+
+        self.assertEqual(connection.pending_s, 0)
+        self.assertEqual(connection.wpaused, False)
+        self.assertEqual(peer.renable, True)
+        self.assertEqual(owner.calls, ["unsub_read", "sub_read", "reads"])
+        self.assertEqual(events, ["high", "low"])
+
+        self.assertRaises(netius.RuntimeError, lambda: connection.set_watermarks(1, 2))
+
+    def test_watermarks_disabled(self):
+        owner = MockOwner()
+        connection = netius.Connection(socket=MockSocket())
+        peer = netius.Connection(owner=owner, socket=MockSocket())
+        peer.status = netius.OPEN
+
+        connection.link(peer)
+        connection.pend((b"hello world", None, None))
+
+        self.assertEqual(connection.wpaused, False)
+        self.assertEqual(peer.renable, True)
+        self.assertEqual(owner.calls, [])
+
+    def test_unlink(self):
+        owner = MockOwner()
+        connection = netius.Connection(owner=owner, socket=MockSocket())
+        peer = netius.Connection(owner=owner, socket=MockSocket())
+        connection.status = netius.OPEN
+        peer.status = netius.OPEN
+
+        connection.set_watermarks(4, 0)
+        connection.link(peer)
+        connection.pend((b"hello", None, None))
+
+        self.assertEqual(peer.renable, False)
+
+        connection.unlink(peer)
+
+        self.assertEqual(connection.linked, ())
+        self.assertEqual(peer.linked, ())
+        self.assertEqual(peer.renable, True)
+
+        connection.link(peer)
+
+        self.assertEqual(peer.renable, False)
+
+        connection.close()
+
+        self.assertEqual(connection.wpaused, False)
+        self.assertEqual(connection.linked, ())
+        self.assertEqual(peer.linked, ())
+        self.assertEqual(peer.renable, True)
@@ -119,6 +119,15 @@ class ContainerTest(unittest.TestCase):
 
         client.cleanup()
 
+    def test_poll_timeout_agent(self):
+        client = netius.clients.HTTPClient()
+        self.container.add_base(client)
+
+        self.assertEqual(client.get_poll_timeout(), -1)
+        self.assertEqual(self.container.get_poll_timeout(), self.container.poll_timeout)
+
+        client.cleanup()
+
     def test_call_all_agent(self):
         client = netius.clients.HTTPClient()
         self.container.add_base(client)
@@ -0,0 +1,123 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+
+import time
+import unittest
+
+import netius
+
+
+class IdleBucketsTest(unittest.TestCase):
+
+    def test_sweep(self):
+        buckets = netius.IdleBuckets(resolution=1.0)
+        current = buckets.tick * 1.0
+        connection = netius.Connection()
+        other = netius.Connection()
+
+        buckets.add(connection, 2.0)
+        buckets.add(other, 10.0)
+
+        self.assertEqual(buckets.count, 2)
+        self.assertEqual(buckets.sweep(current + 1.0), [])
+        self.assertEqual(buckets.sweep(current + 2.0), [])
+        self.assertEqual(buckets.sweep(current + 3.0), [connection])
+        self.assertEqual(connection.idle_b, None)
+        self.assertEqual(buckets.count, 1)
+        self.assertEqual(buckets.sweep(current + 11.0), [other])
+        self.assertEqual(buckets.count, 0)
+
+    def test_touch(self):
+        buckets = netius.IdleBuckets(resolution=1.0)
+        current = buckets.tick * 1.0
+        connection = netius.Connection()
+
+        buckets.add(connection, 2.0)
+        buckets.sweep(current + 2.0)
+        buckets.touch(connection)
+
+        self.assertEqual(buckets.sweep(current + 3.0), [])
+        self.assertEqual(connection.idle_b, buckets.tick + 2)
+        self.assertEqual(buckets.sweep(current + 4.0), [])
+        self.assertEqual(buckets.sweep(current + 5.0), [connection])
+
+    def test_remove(self):
+        buckets = netius.IdleBuckets(resolution=1.0)
+        current = buckets.tick * 1.0
+        connection = netius.Connection()
+
+        buckets.add(connection, 1.0)
+        buckets.add(connection, 1.0)
+        self.assertEqual(buckets.count, 1)
+
+        buckets.remove(connection)
+        buckets.remove(connection)
+        self.assertEqual(buckets.count, 0)
+        self.assertEqual(connection.idle_b, None)
+        self.assertEqual(buckets.sweep(current + 10.0), [])
+
+    def test_gap(self):
+        buckets = netius.IdleBuckets(resolution=0.5)
+        current = buckets.tick * 0.5
+        connections = [netius.Connection() for _index in range(4)]
+
+        for index, connection in enumerate(connections):
+            buckets.add(connection, float(index + 1))
+
+        expired = buckets.sweep(current + 86400.0)
+        self.assertEqual(len(expired), 4)
+        self.assertEqual(buckets.count, 0)
+        self.assertEqual(buckets.info_dict()["buckets"], 0)
+
+
+class IdleServerTest(unittest.TestCase):
+
+    def test_sweep(self):
+        server = netius.StreamServer(idle_timeout=0.01, idle_resolution=0.01)
+        buckets = server.ensure_idle()
+        connection = netius.Connection(owner=server)
+        connection.status = netius.OPEN
+        closed = []
+        server.on_idle = lambda connection: closed.append(connection)
+
+        self.assertEqual(server.ensure_idle(), buckets)
+
+        buckets.add(connection, server.idle_timeout)
+        server._sweep_idle()
+        self.assertEqual(closed, [])
+
+        time.sleep(0.05)
+        server._sweep_idle()
+        self.assertEqual(closed, [connection])
+        self.assertEqual(buckets.count, 0)
+
+        server.cleanup()
+        self.assertEqual(server._idle, None)
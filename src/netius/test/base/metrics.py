@@ -0,0 +1,222 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import os
+import time
+import functools
+import unittest
+
+import netius
+
+
+class SharedMetricsTest(unittest.TestCase):
+
+    def test_write(self):
+        metrics = netius.SharedMetrics(2)
+
+        self.assertEqual(metrics.read(0), None)
+        self.assertEqual(metrics.read(1), None)
+
+        metrics.write(1, 100, requests=10, bytes_in=20, bytes_out=30, connections=2)
+        values = metrics.read(1)
+
+        self.assertEqual(metrics.read(0), None)
+        self.assertEqual(values["slot"], 1)
+        self.assertEqual(values["pid"], 100)
+        self.assertEqual(values["requests"], 10)
+        self.assertEqual(values["bytes_in"], 20)
+        self.assertEqual(values["bytes_out"], 30)
+        self.assertEqual(values["connections"], 2)
+        self.assertEqual(values["lag"], 0.0)
+
+        metrics.close()
+
+    def test_release(self):
+        metrics = netius.SharedMetrics(1)
+
+        metrics.write(0, 100, requests=10, connections=2, lag=0.5)
+        metrics.release(0)
+        values = metrics.read(0)
+
+        self.assertEqual(values["requests"], 10)
+        self.assertEqual(values["connections"], 0)
+        self.assertEqual(values["lag"], 0.0)
+
+        metrics.close()
+
+    def test_aggregate(self):
+        metrics = netius.SharedMetrics(4)
+
+        metrics.write(0, 100, requests=10, bytes_in=1, connections=2, lag=0.1)
+        metrics.write(2, 101, requests=5, bytes_out=3, connections=1, lag=0.3)
+        aggregate = metrics.aggregate()
+
+        self.assertEqual(aggregate["requests"], 15)
+        self.assertEqual(aggregate["bytes_in"], 1)
+        self.assertEqual(aggregate["bytes_out"], 3)
+        self.assertEqual(aggregate["connections"], 3)
+        self.assertEqual(aggregate["lag"], 0.3)
+        self.assertEqual(len(aggregate["workers"]), 2)
+
+        metrics.close()
+
+    def test_fork(self):
+        if not hasattr(os, "fork"):
+            self.skipTest("No fork support available")
+
+        metrics = netius.SharedMetrics(2)
+
+        pid = os.fork()
+        if pid == 0:
+            metrics.write(1, os.getpid(), requests=42)
+            os._exit(0)
+        os.waitpid(pid, 0)
+
+        values = metrics.read(1)
+        self.assertEqual(values["pid"], pid)
+        self.assertEqual(values["requests"], 42)
+
+        metrics.close()
+
+
+class MetricsBaseTest(unittest.TestCase):
+
+    def test_flush(self):
+        loop = netius.Base(metrics_interval=0.01)
+        loop.children = 2
+        loop._metrics = netius.SharedMetrics(4)
+        loop._metrics.write(3, 100, requests=10, bytes_in=20, bytes_out=30)
+        loop._child_index = 1
+        loop._generation = 1
+
+        loop.bind_metrics()
+        loop.requests_c = 5
+        loop.bytes_in_c = 6
+
+        self.assertEqual(loop._metrics_slot, 3)
+        self.assertEqual(len(loop._delayed), 1)
+
+        time.sleep(0.02)
+        loop._delays()
+        values = loop._metrics.read(3)
+
+        self.assertEqual(values["pid"], os.getpid())
+        self.assertEqual(values["requests"], 15)
+        self.assertEqual(values["bytes_in"], 26)
+        self.assertEqual(values["bytes_out"], 30)
+        self.assertEqual(values["lag"] >= 0.0, True)
+        self.assertEqual(len(loop._delayed), 1)
+
+        cluster = loop.info_dict()["cluster"]
+        self.assertEqual(cluster["requests"], 15)
+
+        loop._metrics.close()
+
+    def test_cluster(self):
+        loop = netius.Base()
+        loop.requests_c = 3
+
+        cluster = loop.cluster_dict()
+        self.assertEqual(cluster["requests"], 3)
+        self.assertEqual(cluster["workers"], [])
+
+
+class HistogramTest(unittest.TestCase):
+
+    def test_add(self):
+        histogram = netius.Histogram()
+
+        for value in (0.00002, 0.001, 0.001, 0.5, 20.0):
+            histogram.add(value)
+
+        self.assertEqual(histogram.count, 5)
+        self.assertEqual(histogram.max, 20.0)
+        self.assertEqual(histogram.percentile(50.0), 0.00128)
+        self.assertEqual(histogram.percentile(99.0), 20.0)
+
+        info = histogram.to_dict()
+        self.assertEqual(info["count"], 5)
+        self.assertEqual(info["buckets"]["0.00128"], 2)
+        self.assertEqual(info["buckets"]["+inf"], 1)
+
+        histogram.reset()
+        self.assertEqual(histogram.count, 0)
+        self.assertEqual(histogram.percentile(50.0), 0.0)
+
+
+class InstrumentBaseTest(unittest.TestCase):
+
+    def test_loop(self):
+        loop = netius.Base(instrument=True, poll_timeout=0.01)
+        loop.delay(loop.stop, timeout=0.05)
+        loop.start()
+
+        info = loop.info_dict()["instrument"]
+        self.assertEqual(info["enabled"], True)
+        self.assertEqual(info["iteration"]["count"] > 0, True)
+        self.assertEqual(info["poll"]["count"], info["iteration"]["count"])
+        self.assertEqual(info["callback"]["count"] > 0, True)
+
+    def test_slow(self):
+        loop = netius.Base(instrument=True, slow_callback=0.01)
+        loop.delay(lambda: time.sleep(0.02), immediately=True)
+        loop.delay(lambda: None, immediately=True)
+
+        loop._delays()
+
+        self.assertEqual(loop.slow_c, 1)
+        self.assertEqual(loop._histograms["callback"].count, 2)
+
+        loop.reset_instrument()
+        self.assertEqual(loop.slow_c, 0)
+        self.assertEqual(loop._histograms["callback"].count, 0)
+
+    def test_disabled(self):
+        loop = netius.Base()
+        loop.delay(lambda: None, immediately=True)
+
+        loop._delays()
+
+        self.assertEqual(loop._histograms["callback"].count, 0)
+        self.assertEqual("instrument" in loop.info_dict(), False)
+
+    def test_callable_name(self):
+        callable = lambda: None
+        partial = functools.partial(callable)
+
+        self.assertEqual(
+            netius.callable_name(self.test_callable_name).startswith(
+                "InstrumentBaseTest.test_callable_name (metrics.py:"
+            ),
+            True,
+        )
+        self.assertEqual("<lambda>" in netius.callable_name(callable), True)
+        self.assertEqual("metrics.py:" in netius.callable_name(callable), True)
+        self.assertEqual(netius.callable_name(partial), netius.callable_name(callable))
@@ -0,0 +1,89 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+
+import unittest
+
+import netius
+
+
+class ObservableTest(unittest.TestCase):
+
+    def test_trigger(self):
+        observable = netius.Observable()
+        values = []
+
+        observable.trigger("event", 0)
+        self.assertEqual(observable.has_listeners("event"), False)
+
+        observable.bind("event", lambda value: values.append(value))
+        self.assertEqual(observable.has_listeners("event"), True)
+
+        observable.trigger("event", 1)
+        self.assertEqual(values, [1])
+
+        observable.bind("event", lambda value: values.append(value * 10))
+        observable.trigger("event", 2)
+        self.assertEqual(values, [1, 2, 20])
+
+    def test_oneshot(self):
+        observable = netius.Observable()
+        values = []
+
+        observable.bind("event", lambda: values.append(1), oneshot=True)
+        observable.trigger("event")
+        observable.trigger("event")
+
+        self.assertEqual(values, [1])
+        self.assertEqual(observable.has_listeners("event"), False)
+
+    def test_unbind(self):
+        observable = netius.Observable()
+        values = []
+        method = lambda: values.append(1)
+
+        observable.bind("event", method)
+        observable.bind("event", method)
+        observable.unbind("event", method)
+        observable.trigger("event")
+        self.assertEqual(values, [1])
+
+        observable.unbind("event", method)
+        observable.trigger("event")
+        self.assertEqual(values, [1])
+        self.assertEqual(observable.has_listeners("event"), False)
+
+        observable.bind("event", method)
+        observable.bind("other", method)
+        observable.unbind_all()
+        observable.trigger("event")
+        observable.trigger("other")
+        self.assertEqual(values, [1])
+        self.assertEqual(observable.has_listeners("other"), False)
@@ -0,0 +1,88 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+
+import socket
+import unittest
+
+import netius
+
+
+class EpollPollTest(unittest.TestCase):
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        if not netius.EpollPoll.test():
+            self.skipTest("Skipping test: epoll unavailable")
+        self.poll = netius.EpollPoll()
+        self.poll.open(timeout=0.0)
+        self.service = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.service.setblocking(0)
+        self.service.bind(("127.0.0.1", 0))
+        self.service.listen(8)
+
+    def tearDown(self):
+        unittest.TestCase.tearDown(self)
+        self.poll.close()
+        self.service.close()
+
+    def test_sub_service(self):
+        self.poll.sub_service(self.service)
+
+        client = socket.create_connection(self.service.getsockname())
+        try:
+            reads, _writes, _errors = self.poll.poll(timeout=1.0)
+            self.assertEqual(reads, [self.service])
+            reads, _writes, _errors = self.poll.poll(timeout=0.0)
+            self.assertEqual(reads, [])
+        finally:
+            client.close()
+
+    def test_sub_service_exclusive(self):
+        self.poll.sub_service(self.service, exclusive=True)
+
+        client = socket.create_connection(self.service.getsockname())
+        try:
+            reads, writes, _errors = self.poll.poll(timeout=1.0)
+            self.assertEqual(reads, [self.service])
+            self.assertEqual(writes, [])
+            reads, _writes, _errors = self.poll.poll(timeout=0.0)
+            self.assertEqual(reads, [self.service])
+
+            socket_c, _address = self.service.accept()
+            socket_c.close()
+
+            reads, _writes, _errors = self.poll.poll(timeout=0.0)
+            self.assertEqual(reads, [])
+        finally:
+            client.close()
+
+        self.poll.unsub_all(self.service)
+        self.assertEqual(self.poll.is_sub_read(self.service), False)
@@ -0,0 +1,148 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import os
+import time
+import signal
+import shutil
+import tempfile
+import threading
+import unittest
+
+import netius
+
+
+def busy(duration):
+    target = time.time() + duration
+    while time.time() < target:
+        pass
+
+
+class SamplingProfilerTest(unittest.TestCase):
+
+    def test_sample(self):
+        tid = threading.current_thread().ident
+        profiler = netius.SamplingProfiler(tid, interval=0.001)
+
+        profiler.start()
+        self.assertEqual(profiler.running, True)
+        busy(0.1)
+        profiler.stop()
+
+        self.assertEqual(profiler.running, False)
+        self.assertEqual(profiler.samples > 0, True)
+
+        collapsed = profiler.collapsed()
+        lines = collapsed.split("\n")
+        stack, count = lines[0].rsplit(" ", 1)
+        self.assertEqual(int(count) > 0, True)
+        self.assertEqual("busy (profiler.py:" in collapsed, True)
+        self.assertEqual(stack.split(";")[-1].startswith("busy "), True)
+
+        info = profiler.to_dict()
+        self.assertEqual(info["running"], False)
+        self.assertEqual(info["samples"], profiler.samples)
+        self.assertEqual(info["duration"] > 0.0, True)
+
+    def test_missing(self):
+        profiler = netius.SamplingProfiler(-1)
+        profiler.sample()
+
+        self.assertEqual(profiler.samples, 0)
+        self.assertEqual(profiler.collapsed(), "")
+
+
+class ProfileBaseTest(unittest.TestCase):
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        unittest.TestCase.tearDown(self)
+        shutil.rmtree(self.path)
+
+    def test_start_stop(self):
+        loop = netius.Base(profile_interval=0.001)
+
+        self.assertEqual(loop.profile_dict()["running"], False)
+        self.assertEqual(loop.start_profile(), True)
+        self.assertEqual(loop.start_profile(), False)
+        busy(0.05)
+        collapsed = loop.stop_profile()
+
+        self.assertEqual(loop.profile_dict()["running"], False)
+        self.assertEqual("busy (profiler.py:" in collapsed, True)
+
+    def test_signal_name(self):
+        if not hasattr(signal, "SIGUSR2"):
+            self.skipTest("No SIGUSR2 signal available")
+
+        loop = netius.Base()
+        self.assertEqual(loop._profile_signum(), None)
+
+        for value in ("usr2", "SIGUSR2", str(int(signal.SIGUSR2)), signal.SIGUSR2):
+            loop.profile_signal = value
+            self.assertEqual(loop._profile_signum(), signal.SIGUSR2)
+
+        loop.profile_signal = "SIGINVALID"
+        self.assertEqual(loop._profile_signum(), None)
+
+    def test_signal(self):
+        if not hasattr(signal, "SIGPROF"):
+            self.skipTest("No SIGPROF signal available")
+
+        loop = netius.Base(
+            profile_interval=0.001, profile_path=self.path, profile_signal="SIGPROF"
+        )
+        handler = lambda signum, frame: None
+        previous = signal.signal(signal.SIGPROF, handler)
+        loop.bind_profile()
+
+        try:
+            os.kill(os.getpid(), signal.SIGPROF)
+            self.assertEqual(loop.profile_dict()["running"], True)
+            busy(0.05)
+            os.kill(os.getpid(), signal.SIGPROF)
+            self.assertEqual(loop.profile_dict()["running"], False)
+            self.assertEqual(os.listdir(self.path), [])
+        finally:
+            loop.unbind_profile()
+            self.assertEqual(signal.getsignal(signal.SIGPROF), handler)
+            signal.signal(signal.SIGPROF, previous)
+
+        loop._delays()
+
+        names = os.listdir(self.path)
+        self.assertEqual(len(names), 1)
+        self.assertEqual(names[0].endswith(".collapsed"), True)
+
+        with open(os.path.join(self.path, names[0])) as file:
+            self.assertEqual("busy (profiler.py:" in file.read(), True)
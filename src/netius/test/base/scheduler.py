@@ -0,0 +1,263 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import time
+import unittest
+
+import netius
+
+
+def build(target, did, callable=None, lid=0):
+    callable_t = (target, did, callable or (lambda: None), lid, [True])
+    return netius.legacy.orderable(callable_t)
+
+
+class HeapSchedulerTest(unittest.TestCase):
+
+    scheduler_c = netius.HeapScheduler
+
+    def test_order(self):
+        scheduler = self.scheduler_c()
+        current = time.time()
+
+        scheduler.push(build(current - 1.0, 0))
+        scheduler.push(build(0, 1))
+        scheduler.push(build(-1, 2))
+        scheduler.push(build(current + 100.0, 3))
+        scheduler.push(build(current - 2.0, 4))
+
+        self.assertEqual(len(scheduler), 5)
+        self.assertEqual(scheduler.pop(current)[1], 2)
+        self.assertEqual(scheduler.pop(current)[1], 1)
+        self.assertEqual(scheduler.pop(current)[1], 4)
+        self.assertEqual(scheduler.pop(current)[1], 0)
+        self.assertEqual(scheduler.pop(current), None)
+        self.assertEqual(len(scheduler), 1)
+        self.assertEqual(scheduler.pop(current + 101.0)[1], 3)
+        self.assertEqual(len(scheduler), 0)
+        self.assertEqual(bool(scheduler), False)
+
+    def test_contains(self):
+        scheduler = self.scheduler_c()
+        callable = lambda: None
+
+        scheduler.push(build(-1, 0, callable=callable))
+
+        self.assertEqual(scheduler.contains(-1, callable), True)
+        self.assertEqual(scheduler.contains(0, callable), False)
+
+        scheduler.pop(time.time())
+
+        self.assertEqual(scheduler.contains(-1, callable), False)
+
+    def test_cancel(self):
+        scheduler = self.scheduler_c()
+        current = time.time()
+
+        callable_t = build(current - 1.0, 0)
+        scheduler.push(callable_t)
+        scheduler.cancel(callable_t)
+
+        self.assertEqual(callable_t[4][0], False)
+
+    def test_deadline(self):
+        scheduler = self.scheduler_c()
+        resolution = getattr(scheduler, "resolution", 0.0)
+        current = time.time()
+
+        self.assertEqual(scheduler.deadline(), None)
+
+        scheduler.push(build(current + 10.0, 0))
+        deadline = scheduler.deadline()
+        self.assertEqual(deadline <= current + 10.0 + resolution, True)
+        self.assertEqual(deadline > current, True)
+
+        scheduler.push(build(current + 1.0, 1))
+        deadline = scheduler.deadline()
+        self.assertEqual(deadline <= current + 1.0 + resolution, True)
+        self.assertEqual(deadline > current, True)
+
+        scheduler.push(build(0, 2))
+        self.assertEqual(scheduler.deadline(), 0)
+
+        scheduler.push(build(-1, 3))
+        self.assertEqual(scheduler.deadline(), -1)
+
+    def test_clear(self):
+        scheduler = self.scheduler_c()
+        current = time.time()
+
+        scheduler.push(build(-1, 0))
+        scheduler.push(build(current + 10.0, 1))
+        scheduler.clear()
+
+        self.assertEqual(len(scheduler), 0)
+        self.assertEqual(scheduler.items(), [])
+        self.assertEqual(scheduler.pop(current + 20.0), None)
+
+
+class WheelSchedulerTest(HeapSchedulerTest):
+
+    scheduler_c = netius.WheelScheduler
+
+    def test_cancel(self):
+        scheduler = self.scheduler_c()
+        current = time.time()
+
+        callable_t = build(current + 1.0, 0)
+        scheduler.push(callable_t)
+        scheduler.push(build(-1, 1))
+
+        self.assertEqual(len(scheduler), 2)
+
+        scheduler.cancel(callable_t)
+
+        self.assertEqual(callable_t[4][0], False)
+        self.assertEqual(len(scheduler), 1)
+        self.assertEqual(scheduler.pop(current + 2.0)[1], 1)
+        self.assertEqual(scheduler.pop(current + 2.0), None)
+
+    def test_cascade(self):
+        scheduler = self.scheduler_c()
+        current = time.time()
+        timeouts = (0.05, 1.0, 30.0, 600.0, 7200.0, 86400.0 * 3)
+
+        for index, timeout in enumerate(timeouts):
+            scheduler.push(build(current + timeout, index))
+
+        self.assertEqual(len(scheduler), len(timeouts))
+
+        for index, timeout in enumerate(timeouts):
+            self.assertEqual(scheduler.pop(current + timeout - 0.5), None)
+            callable_t = scheduler.pop(current + timeout + 0.5)
+            self.assertEqual(callable_t[1], index)
+            self.assertEqual(callable_t[0] <= current + timeout + 0.5, True)
+
+        self.assertEqual(len(scheduler), 0)
+
+    def test_items(self):
+        scheduler = self.scheduler_c()
+        current = time.time()
+
+        scheduler.push(build(-1, 0))
+        scheduler.push(build(0, 1))
+        scheduler.push(build(current + 5.0, 2))
+        scheduler.push(build(current + 5000.0, 3))
+
+        items = scheduler.items()
+        self.assertEqual(sorted(item[1] for item in items), [0, 1, 2, 3])
+
+
+class SchedulerBaseTest(unittest.TestCase):
+
+    def test_delay(self):
+        for name in ("heap", "wheel"):
+            loop = netius.Base(scheduler=name)
+            values = []
+
+            self.assertEqual(loop.get_scheduler_name(), name)
+
+            loop.delay(lambda: values.append(1), immediately=True)
+            loop.delay(lambda: values.append(2))
+            callable_t = loop.delay(lambda: values.append(3), immediately=True)
+            loop.undelay(callable_t)
+            loop.delay(lambda: values.append(4), timeout=0.01)
+
+            loop._delays()
+            self.assertEqual(values, [1])
+
+            time.sleep(0.05)
+            loop._lid += 1
+            loop._delays()
+            self.assertEqual(values, [1, 2, 4])
+            self.assertEqual(bool(loop._delayed), False)
+
+    def test_poll_timeout(self):
+        for name in ("heap", "wheel"):
+            loop = netius.Base(scheduler=name, poll_timeout=0.25)
+            current = time.time()
+
+            self.assertEqual(loop.get_poll_timeout(current=current), 0.25)
+
+            loop.delay(lambda: None, timeout=0.1)
+            timeout = loop.get_poll_timeout(current=current)
+            self.assertEqual(timeout > 0.0, True)
+            self.assertEqual(timeout <= 0.1 + 0.01, True)
+
+            loop.delay(lambda: None, timeout=60.0)
+            timeout = loop.get_poll_timeout(current=current)
+            self.assertEqual(timeout <= 0.1 + 0.01, True)
+
+            loop.delay(lambda: None)
+            self.assertEqual(loop.get_poll_timeout(current=current), 0.0)
+
+            loop._delayed.clear()
+            loop.delay(lambda: None, timeout=60.0)
+            self.assertEqual(loop.get_poll_timeout(current=current), 0.25)
+
+            loop.poll_timeout = -1
+            timeout = loop.get_poll_timeout(current=current)
+            self.assertEqual(timeout > 0.25, True)
+            self.assertEqual(timeout <= 61.0, True)
+
+            loop.delay_s(lambda: None, wakeup=False)
+            self.assertEqual(loop.get_poll_timeout(current=current), 0.0)
+
+    def test_poll_timeout_notify(self):
+        for name in ("heap", "wheel"):
+            loop = netius.Base(scheduler=name, poll_timeout=0.25)
+            loop.poll.open()
+            loop.nensure()
+            try:
+                current = time.time()
+
+                self.assertEqual(loop.get_poll_timeout(current=current), -1)
+
+                loop.delay(lambda: None, timeout=60.0)
+                timeout = loop.get_poll_timeout(current=current)
+                self.assertEqual(timeout > 0.25, True)
+                self.assertEqual(timeout <= 61.0, True)
+
+                loop.delay(lambda: None)
+                self.assertEqual(loop.get_poll_timeout(current=current), 0.0)
+            finally:
+                loop.nstop()
+                loop.poll.close()
+
+    def test_build_scheduler(self):
+        loop = netius.Base(scheduler="heap")
+        loop.delay(lambda: None, timeout=10.0)
+        loop.delay(lambda: None, immediately=True)
+
+        loop.scheduler_name = "wheel"
+        loop._delayed = loop.build_scheduler()
+
+        self.assertEqual(loop.get_scheduler_name(), "wheel")
+        self.assertEqual(len(loop._delayed), 2)
@@ -0,0 +1,190 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+
+import os
+import time
+import socket
+import unittest
+import threading
+
+import netius
+import netius.common
+
+
+class ServerTest(unittest.TestCase):
+
+    def test_socket_tcp(self):
+        if not hasattr(socket, "SO_REUSEPORT"):
+            self.skipTest("Skipping test: no support for SO_REUSEPORT")
+
+        server = netius.StreamServer()
+
+        _socket = server.socket_tcp()
+        try:
+            value = _socket.getsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT)
+            self.assertEqual(value, 0)
+        finally:
+            _socket.close()
+
+        first = server.socket_tcp(reuse_port=True)
+        second = server.socket_tcp(reuse_port=True)
+        try:
+            value = first.getsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT)
+            self.assertNotEqual(value, 0)
+            first.bind(("127.0.0.1", 0))
+            first.listen(1)
+            second.bind(first.getsockname())
+            second.listen(1)
+            self.assertEqual(second.getsockname(), first.getsockname())
+        finally:
+            first.close()
+            second.close()
+
+    def test_set_affinity(self):
+        if not hasattr(os, "sched_setaffinity"):
+            self.skipTest("Skipping test: no support for CPU affinity")
+
+        server = netius.StreamServer()
+        cpus = os.sched_getaffinity(0)
+        try:
+            result = server.set_affinity(len(cpus) + 1)
+            self.assertEqual(result, True)
+            self.assertEqual(len(os.sched_getaffinity(0)), 1)
+            self.assertEqual(os.sched_getaffinity(0) < cpus, len(cpus) > 1)
+        finally:
+            os.sched_setaffinity(0, cpus)
+
+
+class EchoServer(netius.StreamServer):
+
+    def on_data(self, connection, data):
+        netius.StreamServer.on_data(self, connection, data)
+        connection.send(data)
+
+
+class LoopsTest(unittest.TestCase):
+
+    def test_build_loop(self):
+        server = netius.StreamServer(loops=2)
+        server.bind("start", lambda server: None)
+        loop = server.build_loop(1)
+
+        self.assertEqual(loop.name, "StreamServer-1")
+        self.assertEqual(loop.loops, 0)
+        self.assertEqual(loop.socket, None)
+        self.assertNotEqual(loop.poll, server.poll)
+        self.assertNotEqual(id(loop.connections), id(server.connections))
+        self.assertNotEqual(id(loop._delayed), id(server._delayed))
+        self.assertNotEqual(id(loop.events["start"]), id(server.events["start"]))
+        self.assertEqual(len(loop.events["start"]), 1)
+
+        loop.destroy()
+        self.assertEqual(len(server.events["start"]), 1)
+
+    def test_build_loop_state(self):
+        server = netius.StreamServer(loops=2)
+        loop = server.build_loop(0)
+
+        self.assertNotEqual(loop._uuid, server._uuid)
+        self.assertNotEqual(id(loop._dispatch), id(server._dispatch))
+        self.assertNotEqual(id(loop._histograms), id(server._histograms))
+        self.assertNotEqual(id(loop._profile_handlers), id(server._profile_handlers))
+        self.assertNotEqual(id(loop._loops), id(server._loops))
+        self.assertEqual(loop._compat._loop_ref(), loop)
+        self.assertEqual(loop._main, False)
+        self.assertEqual(loop._loaded, False)
+
+    def test_select_loop(self):
+        server = netius.StreamServer(loops=2)
+        server._loops = [server.build_loop(0), server.build_loop(1)]
+
+        self.assertEqual(server.select_loop(), server._loops[0])
+        self.assertEqual(server.select_loop(), server._loops[1])
+        self.assertEqual(server.select_loop(), server._loops[0])
+
+        server.loops_policy = "least"
+        server._loops[0].connections.append(None)
+        self.assertEqual(server.select_loop(), server._loops[1])
+
+    def test_set_local(self):
+        server = netius.StreamServer()
+        results = []
+
+        def run():
+            netius.Base.set_local(server)
+            try:
+                results.append(netius.Base.get_main())
+            finally:
+                netius.Base.unset_local()
+            results.append(netius.Base.get_main())
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+
+        self.assertEqual(results[0], server)
+        self.assertNotEqual(results[1], server)
+        self.assertNotEqual(netius.Base.get_main(), server)
+
+    def test_serve(self):
+        server = EchoServer(loops=2, level="ERROR")
+        thread = threading.Thread(
+            target=server.serve, kwargs=dict(host="127.0.0.1", port=0)
+        )
+        thread.start()
+        try:
+            for _index in range(100):
+                if len(server._loops) == 2 and server.port:
+                    break
+                time.sleep(0.05)
+
+            sockets = [
+                socket.create_connection(("127.0.0.1", server.port))
+                for _index in range(4)
+            ]
+            for index, _socket in enumerate(sockets):
+                _socket.settimeout(5.0)
+                _socket.sendall(netius.legacy.bytes("hello %d" % index))
+                data = _socket.recv(1024)
+                self.assertEqual(data, netius.legacy.bytes("hello %d" % index))
+
+            self.assertEqual(len(server.connections), 0)
+            self.assertEqual([len(loop.connections) for loop in server._loops], [2, 2])
+            self.assertNotEqual(server._loops[0].tid, server._loops[1].tid)
+
+            for _socket in sockets:
+                _socket.close()
+        finally:
+            server.delay_s(server.stop)
+            thread.join(10.0)
+
+        self.assertEqual(thread.is_alive(), False)
+        self.assertEqual(server._loops, [])
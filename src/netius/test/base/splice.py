@@ -0,0 +1,167 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import socket
+import threading
+import unittest
+
+import netius
+
+
+class MockOwner(object):
+
+    def __init__(self):
+        self.tid = threading.current_thread().ident
+        self.connections = []
+        self.connections_m = {}
+        self.writes_s = set()
+        self.bytes_in_c = 0
+        self.bytes_out_c = 0
+
+    def sub_read(self, socket):
+        pass
+
+    def unsub_read(self, socket):
+        pass
+
+    def sub_write(self, socket):
+        self.writes_s.add(socket)
+
+    def unsub_write(self, socket):
+        self.writes_s.discard(socket)
+
+    def is_sub_write(self, socket):
+        return socket in self.writes_s
+
+    def unsub_all(self, socket):
+        self.writes_s.discard(socket)
+
+    def reads(self, reads, state=True):
+        pass
+
+    def writes(self, writes, state=True):
+        pass
+
+    def is_read_exhausted(self, count, size):
+        return False
+
+    def requeue_read(self, socket, force=False):
+        pass
+
+    def del_connection(self, connection):
+        pass
+
+
+class SpliceTest(unittest.TestCase):
+
+    def setUp(self):
+        if not netius.splice.is_supported():
+            self.skipTest("Skipping test: splice unavailable")
+
+        self.owner = MockOwner()
+        self.first_r, first_s = socket.socketpair()
+        second_s, self.second_r = socket.socketpair()
+
+        self.first = netius.Connection(owner=self.owner, socket=first_s)
+        self.second = netius.Connection(owner=self.owner, socket=second_s)
+
+        for connection in (self.first, self.second):
+            connection.socket.setblocking(False)
+            connection.status = netius.OPEN
+
+    def tearDown(self):
+        for _socket in (self.first_r, self.second_r):
+            _socket.close()
+        for connection in (self.first, self.second):
+            connection.close()
+
+    def test_tunnel(self):
+        tunnel = self.first.splice(self.second)
+
+        self.assertNotEqual(tunnel, None)
+        self.assertEqual(self.first.spliced, tunnel)
+        self.assertEqual(self.second.spliced, tunnel)
+
+        self.first_r.sendall(b"hello world")
+        tunnel.read(self.first)
+
+        self.assertEqual(self.second_r.recv(1024), b"hello world")
+        self.assertEqual(tunnel.forward.pending, 0)
+        self.assertEqual(self.owner.bytes_in_c, 11)
+        self.assertEqual(self.owner.bytes_out_c, 11)
+
+        self.second_r.sendall(b"response")
+        tunnel.read(self.second)
+
+        self.assertEqual(self.first_r.recv(1024), b"response")
+        self.assertEqual(tunnel.backward.pending, 0)
+
+    def test_order(self):
+        tunnel = self.first.splice(self.second)
+        self.second.wready = False
+        self.second.send(b"pending ")
+
+        self.first_r.sendall(b"spliced")
+        tunnel.read(self.first)
+
+        self.assertEqual(tunnel.forward.pending, 7)
+        self.assertEqual(tunnel.forward.paused, True)
+        self.assertEqual(self.first.renable, False)
+
+        self.second._send()
+
+        self.assertEqual(tunnel.forward.pending, 0)
+        self.assertEqual(tunnel.forward.paused, False)
+        self.assertEqual(self.first.renable, True)
+        self.assertEqual(self.second_r.recv(1024), b"pending spliced")
+
+    def test_eof(self):
+        tunnel = self.first.splice(self.second)
+
+        self.first_r.sendall(b"last")
+        self.first_r.shutdown(socket.SHUT_WR)
+        tunnel.read(self.first)
+
+        self.assertEqual(self.second_r.recv(1024), b"last")
+        self.assertEqual(self.first.status, netius.CLOSED)
+        self.assertEqual(self.first.spliced, None)
+        self.assertEqual(self.second.spliced, None)
+
+    def test_spliceable(self):
+        self.first.ssl = True
+
+        self.assertEqual(netius.Splice.is_spliceable(self.first, self.second), False)
+        self.assertEqual(self.first.splice(self.second), None)
+        self.assertEqual(self.first.spliced, None)
+
+        self.first.ssl = False
+        self.second.restored_s = 1
+
+        self.assertEqual(self.first.splice(self.second), None)
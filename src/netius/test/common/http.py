@@ -317,6 +317,19 @@ class HTTPParserTest(unittest.TestCase):
         self.assertEqual(parser.chunk_s, 0)
         self.assertEqual(parser.chunk_e, 0)
 
+    def test_idle(self):
+        parser = netius.common.HTTPParser(self, type=netius.common.REQUEST, store=True)
+        self.assertEqual(parser.is_idle(), True)
+
+        parser.parse(SIMPLE_REQUEST[:3])
+        self.assertEqual(parser.is_idle(), False)
+
+        parser.parse(SIMPLE_REQUEST[3:])
+        self.assertEqual(parser.is_idle(), True)
+
+        parser.parse(SIMPLE_REQUEST[:20])
+        self.assertEqual(parser.is_idle(), False)
+
     def test_no_length_response(self):
         parser = netius.common.HTTPParser(self, type=netius.common.RESPONSE, store=True)
         try:
@@ -336,3 +349,25 @@ class HTTPParserTest(unittest.TestCase):
             self.assertEqual(parser.state, netius.common.http.FINISH_STATE)
         finally:
             parser.clear()
+
+    def test_view(self):
+        for request in (SIMPLE_REQUEST, CHUNKED_REQUEST):
+            parser = netius.common.HTTPParser(
+                self, type=netius.common.REQUEST, store=True
+            )
+            try:
+                buffer = memoryview(bytearray(7))
+                for index in range(0, len(request), 7):
+                    data = request[index : index + 7]
+                    buffer[: len(data)] = data
+                    parser.parse(buffer[: len(data)])
+                    buffer[:] = b"XXXXXXX"
+                message = parser.get_message()
+                headers = parser.get_headers()
+                self.assertEqual(parser.state, netius.common.http.FINISH_STATE)
+                self.assertEqual(parser.method, "get")
+                self.assertEqual(parser.path_s, "http://localhost")
+                self.assertEqual(message, b"Hello World")
+                self.assertEqual(headers["Server"], "Test Service/1.0.0")
+            finally:
+                parser.clear()
@@ -343,6 +343,34 @@ class HTTP2ParserTest(unittest.TestCase):
         finally:
             parser.clear(force=True)
 
+    def test_parse_view(self):
+        parser = netius.common.HTTP2Parser(self, store=True)
+        try:
+            events = []
+            parser.bind(
+                "on_settings", lambda settings, ack: events.append(("settings", ack))
+            )
+            parser.bind(
+                "on_ping",
+                lambda data, ack: events.append(
+                    ("ping", netius.legacy.bytes(data), ack)
+                ),
+            )
+            frames = SETTINGS_ACK_FRAME + PING_FRAME
+            buffer = memoryview(bytearray(5))
+            for index in range(0, len(frames), 5):
+                data = frames[index : index + 5]
+                buffer[: len(data)] = data
+                parser.parse(buffer[: len(data)])
+                buffer[:] = b"XXXXX"
+            self.assertEqual(parser.state, netius.common.http2.FINISH_STATE)
+            self.assertEqual(parser.type, netius.common.PING)
+            self.assertEqual(len(events), 2)
+            self.assertEqual(events[0], ("settings", 0x01))
+            self.assertEqual(events[1][1], PING_FRAME[9:])
+        finally:
+            parser.clear(force=True)
+
     def test_parse_ping(self):
         parser = netius.common.HTTP2Parser(self, store=True)
         try:
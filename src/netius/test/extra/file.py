@@ -0,0 +1,480 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import os
+import json
+import gzip
+import shutil
+import tempfile
+import unittest
+import threading
+
+import netius.extra
+
+
+class MetaCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        self.base_path = tempfile.mkdtemp()
+        self.path = os.path.join(self.base_path, "hello.txt")
+        with open(self.path, "wb") as file:
+            file.write(b"hello world")
+
+    def tearDown(self):
+        unittest.TestCase.tearDown(self)
+        shutil.rmtree(self.base_path)
+
+    def test_get(self):
+        cache = netius.extra.file.MetaCache(size=4, ttl=1.0)
+
+        meta = cache.get(self.path, current=100.0)
+        self.assertEqual(meta.exists, True)
+        self.assertEqual(meta.is_dir, False)
+        self.assertEqual(meta.size, 11)
+        self.assertEqual(meta.type, "text/plain")
+        self.assertEqual(meta.etag, "netius-%.2f" % os.path.getmtime(self.path))
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(cache.misses, 1)
+
+        self.assertEqual(cache.get(self.path, current=100.5), meta)
+        self.assertEqual(cache.hits, 1)
+
+        meta = cache.get(self.base_path, current=100.0)
+        self.assertEqual(meta.exists, True)
+        self.assertEqual(meta.is_dir, True)
+
+        meta = cache.get(os.path.join(self.base_path, "missing"), current=100.0)
+        self.assertEqual(meta.exists, False)
+        self.assertEqual(len(cache), 3)
+
+    def test_revalidate(self):
+        cache = netius.extra.file.MetaCache(size=4, ttl=1.0)
+
+        meta = cache.get(self.path, current=100.0)
+        self.assertEqual(cache.get(self.path, current=102.0), meta)
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(meta.checked, 102.0)
+
+        with open(self.path, "wb") as file:
+            file.write(b"hello world, again")
+        os.utime(self.path, (0, meta.mtime + 10.0))
+
+        self.assertEqual(cache.get(self.path, current=102.5), meta)
+        _meta = cache.get(self.path, current=104.0)
+        self.assertNotEqual(_meta, meta)
+        self.assertEqual(_meta.size, 18)
+        self.assertEqual(meta.evicted, True)
+
+    def test_evict(self):
+        cache = netius.extra.file.MetaCache(size=2, ttl=1.0)
+        paths = [os.path.join(self.base_path, "%d.txt" % index) for index in range(3)]
+
+        first = cache.get(paths[0], current=100.0)
+        cache.get(paths[1], current=100.0)
+        cache.get(paths[0], current=100.0)
+        cache.get(paths[2], current=100.0)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get(paths[0], current=100.0), first)
+        self.assertEqual(cache.hits, 2)
+        self.assertEqual(cache.misses, 3)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(first.evicted, True)
+
+    def test_disabled(self):
+        cache = netius.extra.file.MetaCache(size=0, ttl=1.0)
+
+        meta = cache.get(self.path, current=100.0)
+        self.assertEqual(meta.exists, True)
+        self.assertNotEqual(cache.get(self.path, current=100.0), meta)
+        self.assertEqual(len(cache), 0)
+
+    def test_shared(self):
+        if not hasattr(os, "pread"):
+            self.skipTest("Skipping test: pread unavailable")
+
+        cache = netius.extra.file.MetaCache(size=4, ttl=1.0, fds=True)
+        meta = cache.get(self.path, current=100.0)
+        self.assertNotEqual(meta.fd, None)
+
+        first = meta.open()
+        second = meta.open()
+        first.seek(6)
+        self.assertEqual(first.read(), b"world")
+        self.assertEqual(second.read(5), b"hello")
+        self.assertEqual(second.tell(), 5)
+        self.assertEqual(meta.refs, 2)
+
+        cache.clear()
+        self.assertNotEqual(meta.fd, None)
+        first.close()
+        first.close()
+        self.assertNotEqual(meta.fd, None)
+        second.close()
+        self.assertEqual(meta.fd, None)
+        self.assertEqual(meta.refs, 0)
+
+
+class ObjectCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        self.base_path = tempfile.mkdtemp()
+        self.meta_cache = netius.extra.file.MetaCache(size=16, ttl=0.0)
+
+    def tearDown(self):
+        unittest.TestCase.tearDown(self)
+        self.meta_cache.clear()
+        shutil.rmtree(self.base_path)
+
+    def test_get(self):
+        cache = netius.extra.file.ObjectCache(budget=1024, max_size=512)
+        meta = self._file("hello.txt", b"hello world")
+
+        entry = cache.get(meta)
+        self.assertEqual(entry.data, b"hello world")
+        self.assertEqual(cache.size, 11)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.get(self._meta("hello.txt")), entry)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.info_dict()["ratio"], 0.5)
+
+        self._file("hello.txt", b"hello world, again", mtime=meta.mtime + 10.0)
+        _entry = cache.get(self._meta("hello.txt"))
+        self.assertNotEqual(_entry, entry)
+        self.assertEqual(_entry.data, b"hello world, again")
+        self.assertEqual(cache.size, 18)
+        self.assertEqual(len(cache), 1)
+
+    def test_empty(self):
+        cache = netius.extra.file.ObjectCache(budget=1024, max_size=512)
+        entry = cache.get(self._file("empty.txt", b""))
+
+        self.assertEqual(entry.data, b"")
+        self.assertEqual(cache.get(self._meta("empty.txt")), entry)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+
+    def test_cacheable(self):
+        cache = netius.extra.file.ObjectCache(budget=1024, max_size=8)
+        self.assertEqual(cache.is_cacheable(self._file("small", b"small")), True)
+        self.assertEqual(cache.is_cacheable(self._file("large", b"x" * 9)), False)
+        self.assertEqual(cache.is_cacheable(self._meta("missing")), False)
+        self.assertEqual(cache.is_cacheable(self._meta("")), False)
+
+        cache = netius.extra.file.ObjectCache(budget=0)
+        self.assertEqual(cache.is_cacheable(self._meta("small")), False)
+
+        self.assertRaises(
+            netius.DataError,
+            lambda: netius.extra.file.ObjectCache(policy="invalid"),
+        )
+
+    def test_gzip(self):
+        cache = netius.extra.file.ObjectCache(budget=4096, max_size=4096)
+        data = b"hello world " * 100
+        meta = self._file("hello.txt", data)
+
+        entry = cache.get(meta, sibling=self._meta("hello.txt.gz"))
+        data_gz = cache.gzip(entry)
+        self.assertEqual(
+            gzip.GzipFile(fileobj=netius.legacy.BytesIO(data_gz)).read(), data
+        )
+        self.assertEqual(cache.size, len(data) + len(data_gz))
+        self.assertEqual(cache.gzip(entry), data_gz)
+
+        self._file("hello.txt.gz", b"precompressed", mtime=meta.mtime + 10.0)
+        entry = cache.get(self._meta("hello.txt"), sibling=self._meta("hello.txt.gz"))
+        self.assertEqual(cache.gzip(entry), b"precompressed")
+        self.assertEqual(cache.size, len(data) + 13)
+
+        meta = self._file("random.bin", os.urandom(256))
+        entry = cache.get(meta, sibling=self._meta("random.bin.gz"))
+        self.assertEqual(cache.gzip(entry), b"")
+
+    def test_lru(self):
+        cache = netius.extra.file.ObjectCache(budget=20, max_size=10, policy="lru")
+        first = cache.get(self._file("first", b"x" * 8))
+        cache.get(self._file("second", b"x" * 8))
+        cache.get(self._meta("first"))
+        cache.get(self._file("third", b"x" * 8))
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.size, 16)
+        self.assertEqual(cache.get(self._meta("first")), first)
+        self.assertEqual(cache.misses, 3)
+
+    def test_lfu(self):
+        cache = netius.extra.file.ObjectCache(budget=20, max_size=10, policy="lfu")
+        first = cache.get(self._file("first", b"x" * 8))
+        second = cache.get(self._file("second", b"x" * 8))
+        cache.get(self._meta("first"))
+        cache.get(self._meta("second"))
+        cache.get(self._meta("second"))
+        cache.get(self._file("third", b"x" * 8))
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get(self._meta("second")), second)
+        self.assertNotEqual(cache.get(self._meta("first")), first)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+
+    def test_threads(self):
+        cache = netius.extra.file.ObjectCache(budget=40, max_size=10)
+        metas = [self._file("file-%d" % index, b"x" * 8) for index in range(8)]
+
+        def run(offset):
+            for index in range(500):
+                cache.get(metas[(index + offset) % len(metas)])
+
+        threads = [threading.Thread(target=run, args=(index,)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(cache.hits + cache.misses, 2000)
+        self.assertEqual(
+            cache.size, sum(len(entry) for entry in cache._entries.values())
+        )
+        self.assertEqual(cache.size <= cache.budget, True)
+
+    def test_unlocked(self):
+        cache = netius.extra.file.ObjectCache(budget=1024, max_size=512)
+        first = cache.get(self._file("first", b"first"))
+        second = self._file("second", b"second")
+        results = []
+
+        # while the body of the second file is being read (miss) a hit
+        # for the first file is made from another thread, that must not
+        # be blocked by the read (taking place outside of the lock)
+        def open(meta):
+            if meta.path == second.path:
+                thread = threading.Thread(
+                    target=lambda: results.append(cache.get(self._meta("first")))
+                )
+                thread.start()
+                thread.join(5.0)
+            return _open(meta)
+
+        _open = netius.extra.file.FileMeta.open
+        netius.extra.file.FileMeta.open = open
+        try:
+            entry = cache.get(second)
+        finally:
+            netius.extra.file.FileMeta.open = _open
+
+        self.assertEqual(results, [first])
+        self.assertEqual(entry.data, b"second")
+        self.assertEqual(cache.size, 11)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 2)
+
+    def _file(self, name, data, mtime=None):
+        path = os.path.join(self.base_path, name)
+        with open(path, "wb") as file:
+            file.write(data)
+        if not mtime == None:
+            os.utime(path, (mtime, mtime))
+        return self._meta(name)
+
+    def _meta(self, name):
+        return self.meta_cache.get(os.path.join(self.base_path, name))
+
+
+class DirListingTest(unittest.TestCase):
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        self.base_path = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.base_path, "dir"))
+        for name, size in (("b.txt", 3), ("a.css", 10), ("c.js", 1)):
+            with open(os.path.join(self.base_path, name), "wb") as file:
+                file.write(b"x" * size)
+
+    def tearDown(self):
+        unittest.TestCase.tearDown(self)
+        shutil.rmtree(self.base_path)
+
+    def test_scan(self):
+        listing = netius.extra.file.DirListing(self.base_path)
+        values = list(listing.scan(batch=2))
+
+        self.assertEqual(values, [None])
+        self.assertEqual(len(listing), 4)
+        self.assertEqual(
+            sorted((name, is_dir, size) for name, is_dir, size, _m in listing.entries),
+            [
+                ("a.css", False, 10),
+                ("b.txt", False, 3),
+                ("c.js", False, 1),
+                ("dir", True, 0),
+            ],
+        )
+
+    def test_page(self):
+        listing = netius.extra.file.DirListing.build(self.base_path)
+        sorter = netius.extra.FileServer._sorter_build
+
+        entries, page, pages = listing.page(sorter(), top=True)
+        self.assertEqual(
+            [entry[0] for entry in entries], ["..", "dir", "a.css", "b.txt", "c.js"]
+        )
+        self.assertEqual((page, pages), (1, 1))
+
+        entries, page, pages = listing.page(
+            sorter(name="size"), sort="size", reverse=True, page=2, size=3
+        )
+        self.assertEqual([entry[0] for entry in entries], ["dir"])
+        self.assertEqual((page, pages), (2, 2))
+
+        entries, page, pages = listing.page(
+            sorter(name="type"), sort="type", page=10, size=3
+        )
+        self.assertEqual([entry[0] for entry in entries], ["b.txt"])
+        self.assertEqual((page, pages), (2, 2))
+
+        self.assertEqual(len(listing.orders), 3)
+
+    def test_gen_dir_json(self):
+        listing = netius.extra.file.DirListing.build(self.base_path)
+        data = "".join(
+            netius.extra.FileServer._gen_dir(
+                "json",
+                self.base_path,
+                "/files/",
+                dict(sort=["name"], size=["2"]),
+                listing=listing,
+            )
+        )
+        result = json.loads(data)
+
+        self.assertEqual(result["path"], "/files")
+        self.assertEqual(result["page"], 1)
+        self.assertEqual(result["pages"], 2)
+        self.assertEqual(result["total"], 4)
+        self.assertEqual([item["name"] for item in result["items"]], ["a.css", "b.txt"])
+        self.assertEqual(result["items"][0]["type"], "text/css")
+        self.assertEqual(result["items"][0]["size"], 10)
+
+    def test_gen_dir_base(self):
+        data = "".join(
+            netius.extra.FileServer._gen_dir(
+                "base", self.base_path, "/", dict(page=["2"]), page_size=2
+            )
+        )
+
+        self.assertEqual("b.txt" in data, True)
+        self.assertEqual("a.css" in data, False)
+        self.assertEqual("Page 2 of 2" in data, True)
+
+
+class ListCacheTest(unittest.TestCase):
+
+    def test_get(self):
+        cache = netius.extra.file.ListCache(budget=4)
+        listing = self._listing("first", 2, 10.0)
+
+        self.assertEqual(cache.get("first", 10.0), None)
+        cache.put(listing)
+        self.assertEqual(cache.get("first", 10.0), listing)
+        self.assertEqual(cache.get("first", 11.0), None)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+        self.assertEqual(cache.info_dict()["ratio"], 1.0 / 3.0)
+
+    def test_empty(self):
+        cache = netius.extra.file.ListCache(budget=4)
+        listing = self._listing("empty", 0, 10.0)
+
+        cache.put(listing)
+        self.assertEqual(cache.get("empty", 10.0), listing)
+        self.assertEqual(cache.hits, 1)
+
+    def test_budget(self):
+        cache = netius.extra.file.ListCache(budget=4)
+        first = self._listing("first", 2, 10.0)
+        cache.put(first)
+        cache.put(self._listing("second", 2, 10.0))
+        cache.get("first", 10.0)
+        cache.put(self._listing("third", 1, 10.0))
+        cache.put(self._listing("large", 5, 10.0))
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.size, 3)
+        self.assertEqual(cache.get("first", 10.0), first)
+        self.assertEqual(cache.get("second", 10.0), None)
+        self.assertEqual(cache.get("large", 10.0), None)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+
+    def test_ttl(self):
+        cache = netius.extra.file.ListCache(budget=4, ttl=1.0)
+        listing = self._listing("first", 2, 10.0, checked=100.0)
+
+        cache.put(listing)
+        self.assertEqual(cache.get("first", 10.0, current=100.5), listing)
+        self.assertEqual(cache.get("first", 10.0, current=101.5), None)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+
+        cache = netius.extra.file.ListCache(budget=4, ttl=0.0)
+        cache.put(self._listing("first", 2, 10.0, checked=100.0))
+        self.assertEqual(cache.get("first", 10.0, current=100.0), None)
+
+    def _listing(self, path, count, mtime, checked=None):
+        listing = netius.extra.file.DirListing(path, mtime=mtime, checked=checked)
+        listing.entries = [("%d" % index, False, 0, mtime) for index in range(count)]
+        return listing
+
+
+class FileServerTest(unittest.TestCase):
+
+    def test_info_dict(self):
+        server = netius.extra.FileServer(meta_size=16, meta_ttl=2.0)
+        try:
+            info = server.info_dict()
+            self.assertEqual(info["meta_cache"]["size"], 16)
+            self.assertEqual(info["meta_cache"]["ttl"], 2.0)
+            self.assertEqual(info["meta_cache"]["count"], 0)
+            self.assertEqual(info["object_cache"]["budget"], 16777216)
+            self.assertEqual(info["object_cache"]["size"], 0)
+            self.assertEqual(info["object_cache"]["ratio"], 0.0)
+            self.assertEqual(info["list_cache"]["budget"], 262144)
+            self.assertEqual(info["list_cache"]["ttl"], 1.0)
+        finally:
+            server.cleanup()
@@ -0,0 +1,100 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import unittest
+
+import netius.extra
+
+
+class ReadAheadTest(unittest.TestCase):
+
+    def test_window(self):
+        read_a = netius.extra.filea.ReadAhead(None, 0, 100, limit=4)
+
+        self.assertEqual(read_a.window, 2)
+        self.assertEqual(read_a.next(0, size=10), (0, 10))
+        self.assertEqual(read_a.next(0, size=10), (10, 10))
+        self.assertEqual(read_a.next(0, size=10), None)
+
+        read_a.adapt(0, size=10)
+        self.assertEqual(read_a.window, 4)
+        self.assertEqual(read_a.next(0, size=10), (20, 10))
+        self.assertEqual(read_a.next(50, size=10), None)
+        self.assertEqual(read_a.next(0, size=10), (30, 10))
+        self.assertEqual(read_a.next(0, size=10), None)
+
+        read_a.adapt(0, size=10)
+        self.assertEqual(read_a.window, 4)
+        read_a.adapt(50, size=10)
+        self.assertEqual(read_a.window, 2)
+        read_a.adapt(50, size=10)
+        self.assertEqual(read_a.window, 1)
+        read_a.adapt(5, size=10)
+        self.assertEqual(read_a.window, 1)
+
+    def test_order(self):
+        read_a = netius.extra.filea.ReadAhead(None, 5, 25, limit=4)
+        read_a.window = 4
+
+        self.assertEqual(read_a.next(0, size=10), (5, 10))
+        self.assertEqual(read_a.next(0, size=10), (15, 10))
+        self.assertEqual(read_a.next(0, size=10), None)
+
+        read_a.push(15, 10, b"b" * 10)
+        self.assertEqual(read_a.pop(), None)
+        read_a.push(5, 10, b"a" * 10)
+        self.assertEqual(read_a.pop(), b"a" * 10)
+        self.assertEqual(read_a.is_done(), False)
+        self.assertEqual(read_a.pop(), b"b" * 10)
+        self.assertEqual(read_a.is_done(), True)
+        self.assertEqual(read_a.count, 0)
+
+    def test_truncated(self):
+        read_a = netius.extra.filea.ReadAhead(None, 0, 30, limit=4)
+        read_a.window = 4
+
+        read_a.next(0, size=10)
+        read_a.next(0, size=10)
+        read_a.next(0, size=10)
+
+        read_a.push(20, 10, b"")
+        read_a.push(10, 10, b"b" * 4)
+        self.assertEqual(read_a.end, 14)
+        read_a.push(0, 10, b"a" * 10)
+        self.assertEqual(read_a.pop(), b"a" * 10)
+        self.assertEqual(read_a.pop(), b"b" * 4)
+        self.assertEqual(read_a.is_done(), True)
+        self.assertEqual(read_a.pop(), None)
+
+    def test_empty(self):
+        read_a = netius.extra.filea.ReadAhead(None, 0, 0)
+
+        self.assertEqual(read_a.is_done(), True)
+        self.assertEqual(read_a.next(0), None)
@@ -0,0 +1,95 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import os
+import tempfile
+import unittest
+
+import netius.pool
+
+
+class FileThreadTest(unittest.TestCase):
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        fd, self.path = tempfile.mkstemp()
+        os.write(fd, b"hello world")
+        os.close(fd)
+
+    def tearDown(self):
+        unittest.TestCase.tearDown(self)
+        os.remove(self.path)
+
+    def test_pread(self):
+        pool = netius.pool.FilePool()
+        thread = netius.pool.FileThread(0, owner=pool)
+
+        with open(self.path, "rb") as file:
+            file.seek(2)
+            thread.execute(
+                (
+                    netius.pool.file.FILE_WORK,
+                    netius.pool.file.PREAD_ACTION,
+                    file,
+                    5,
+                    6,
+                    "first",
+                )
+            )
+            thread.execute(
+                (
+                    netius.pool.file.FILE_WORK,
+                    netius.pool.file.PREAD_ACTION,
+                    file,
+                    5,
+                    0,
+                    "second",
+                )
+            )
+            thread.execute(
+                (
+                    netius.pool.file.FILE_WORK,
+                    netius.pool.file.PREAD_ACTION,
+                    file,
+                    5,
+                    20,
+                    "third",
+                )
+            )
+            if netius.pool.file.is_pread:
+                self.assertEqual(file.tell(), 2)
+
+        self.assertEqual(
+            pool.pop_event(), (netius.pool.file.READ_ACTION, b"world", "first")
+        )
+        self.assertEqual(
+            pool.pop_event(), (netius.pool.file.READ_ACTION, b"hello", "second")
+        )
+        self.assertEqual(pool.pop_event(), (netius.pool.file.READ_ACTION, b"", "third"))
@@ -28,11 +28,30 @@ __copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import time
+import socket
 import unittest
+import threading
 
 import netius.servers
 
 
+class HelloServer(netius.servers.HTTPServer):
+
+    def on_data_http(self, connection, parser):
+        netius.servers.HTTPServer.on_data_http(self, connection, parser)
+        connection.send_response(
+            data="hello",
+            code=200,
+            code_s="OK",
+            apply=True,
+            callback=None if parser.keep_alive else self._hello_close,
+        )
+
+    def _hello_close(self, connection):
+        self.delay(connection.close)
+
+
 class HTTPServerTest(unittest.TestCase):
 
     def test__headers_upper(self):
@@ -70,3 +89,78 @@ class HTTPServerTest(unittest.TestCase):
             headers,
             {"Content-Type": "application/json;charset=utf-8", "Content-Length": "12"},
         )
+
+    def test_drain(self):
+        server = HelloServer(level="ERROR")
+        thread = threading.Thread(
+            target=server.serve, kwargs=dict(host="127.0.0.1", port=0)
+        )
+        thread.start()
+        try:
+            for _index in range(100):
+                if server.port and server.is_running():
+                    break
+                time.sleep(0.05)
+
+            # creates a connection that is kept alive waiting for a new
+            # request and another one with a request still being received
+            idle = socket.create_connection(("127.0.0.1", server.port))
+            busy = socket.create_connection(("127.0.0.1", server.port))
+            idle.settimeout(5.0)
+            busy.settimeout(5.0)
+            idle.sendall(b"GET / HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            data = b""
+            while not data.endswith(b"hello"):
+                data += idle.recv(1024)
+            self.assertEqual(b"Connection: keep-alive" in data, True)
+            busy.sendall(b"GET / HTTP/1.1\r\n")
+            for _index in range(100):
+                waiting = [connection.is_waiting() for connection in server.connections]
+                if sorted(waiting) == [False, True]:
+                    break
+                time.sleep(0.05)
+
+            # drains the server, the idle connection is closed immediately
+            # while the busy one is closed after its response is sent
+            server.delay_s(server.drain)
+            self.assertEqual(idle.recv(1024), b"")
+
+            busy.sendall(b"Host: localhost\r\n\r\n")
+            data = b""
+            while True:
+                chunk = busy.recv(1024)
+                if not chunk:
+                    break
+                data += chunk
+            self.assertEqual(b"Connection: close" in data, True)
+            self.assertEqual(data.endswith(b"hello"), True)
+
+            idle.close()
+            busy.close()
+
+            thread.join(10.0)
+            self.assertEqual(thread.is_alive(), False)
+        finally:
+            if thread.is_alive():
+                server.delay_s(server.stop)
+                thread.join(10.0)
+
+
+class HTTPConnectionTest(unittest.TestCase):
+
+    def test_gzip(self):
+        connection = netius.servers.HTTPConnection(
+            encoding=netius.servers.http.GZIP_ENCODING
+        )
+
+        self.assertEqual(connection.gzip_m, None)
+        self.assertEqual(connection._get_gzip(1, ensure=False), None)
+        self.assertEqual(connection.gzip_m, None)
+
+        gzip = connection._get_gzip(1)
+        self.assertNotEqual(gzip, None)
+        self.assertEqual(connection.gzip_m, {1: gzip})
+        self.assertEqual(connection._get_gzip(1), gzip)
+
+        connection._close_gzip()
+        self.assertEqual(connection.gzip_m, None)